@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Import Time Report for Naukri Automation
+Measures what each entry point costs to import (python -X importtime, in a
+fresh interpreter per run) and checks it against a cold-start budget
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+from tabulate import tabulate
+
+SRC_DIR = Path(__file__).parent / "src"
+ROOT_DIR = Path(__file__).parent
+
+# Modules checked by --check: import budget in milliseconds (median of the
+# runs), and heavy packages that must not be imported just by importing it.
+# The budgets leave room for slower machines; the forbidden packages catch
+# an eager import creeping back in even when the time still fits.
+BUDGETS = {
+    "naukri_main": {
+        "budget_ms": 150,
+        "forbidden": ["selenium.webdriver", "pypdf", "requests", "reportlab"],
+    },
+    "multi_account": {
+        "budget_ms": 100,
+        "forbidden": ["selenium.webdriver", "pypdf", "requests"],
+    },
+    "view_progress": {
+        "budget_ms": 150,
+        "forbidden": ["selenium", "pypdf", "requests"],
+    },
+}
+
+
+def measure(module):
+    """
+    Import module in a fresh interpreter with -X importtime
+
+    Returns:
+        List of (self_us, cumulative_us, depth, name), in import order
+    """
+    code = (f"import sys; sys.path.insert(0, {str(SRC_DIR)!r}); "
+            f"sys.path.insert(0, {str(ROOT_DIR)!r}); import {module}")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, cwd=ROOT_DIR,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr.strip()[-2000:]}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header line
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((int(fields[0]), int(fields[1]), depth, name.strip()))
+    return entries
+
+
+def subtree(entries, module):
+    """Entries imported by `import module` (leaves out interpreter startup)"""
+    # -X importtime prints a module after everything it imported, so each
+    # depth-0 line closes the group of lines since the previous one
+    group = []
+    for entry in entries:
+        group.append(entry)
+        if entry[2] == 0:
+            if entry[3] == module:
+                return group
+            group = []
+    return []
+
+
+def total_ms(entries, module):
+    """Cumulative import time of module itself"""
+    for self_us, cumulative_us, depth, name in entries:
+        if name == module and depth == 0:
+            return cumulative_us / 1000
+    return 0.0
+
+
+def imported(entries, package):
+    """True if package or any of its submodules was imported"""
+    return any(name == package or name.startswith(package + ".")
+               for _, _, _, name in entries)
+
+
+def report(module, runs, top):
+    """Print the slowest imports of module (median over runs)"""
+    samples = [measure(module) for _ in range(runs)]
+    totals = [total_ms(entries, module) for entries in samples]
+    median = statistics.median(totals)
+    entries = subtree(samples[totals.index(min(totals, key=lambda t: abs(t - median)))], module)
+
+    print(f"\n📦 import {module}: {median:.1f} ms "
+          f"(median of {runs}, min {min(totals):.1f} ms, max {max(totals):.1f} ms)")
+
+    slowest = sorted(entries, key=lambda e: e[1], reverse=True)[:top]
+    rows = [[name, depth, f"{cumulative_us / 1000:.1f}", f"{self_us / 1000:.1f}"]
+            for self_us, cumulative_us, depth, name in slowest]
+    print(tabulate(rows, headers=["Module", "Depth", "Cumulative ms", "Self ms"], tablefmt="simple"))
+    return median, entries
+
+
+def check(runs, top):
+    """Measure every module in BUDGETS; return the list of violations"""
+    failures = []
+    for module, limits in BUDGETS.items():
+        median, entries = report(module, runs, top)
+        if median > limits["budget_ms"]:
+            failures.append(f"import {module} took {median:.1f} ms "
+                            f"(budget {limits['budget_ms']} ms)")
+        for package in limits["forbidden"]:
+            if imported(entries, package):
+                failures.append(f"import {module} imports {package}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import time report and cold-start budget check")
+    parser.add_argument("modules", nargs="*", help="Modules to report (default: every module in the budget)")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per module (default 5)")
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list (default 15)")
+    parser.add_argument("--check", action="store_true",
+                        help="Fail (exit 1) if a module is over budget or imports a forbidden package")
+    args = parser.parse_args()
+
+    if args.check:
+        failures = check(args.runs, args.top)
+        print()
+        if failures:
+            for failure in failures:
+                print(f"❌ {failure}")
+            sys.exit(1)
+        print("✅ All modules within their import budget")
+        return
+
+    for module in args.modules or list(BUDGETS):
+        report(module, args.runs, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+Warm Browser Pool
+Keeps a launched Chrome (and optionally a pre-launched spare) alive between
+scheduler runs, with health checks and age/run/memory based recycling
+"""
+
+import logging
+import threading
+import time
+
+from selenium.common.exceptions import WebDriverException
+
+from config_loader import changed_in, get_config
+
+logger = logging.getLogger(__name__)
+
+
+class PooledBrowser:
+    """A driver plus the bookkeeping needed to decide when to recycle it"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.launched_at = time.monotonic()
+        self.runs = 0
+
+    def age_hours(self):
+        return (time.monotonic() - self.launched_at) / 3600
+
+
+class BrowserPool:
+    """Hands out a ready Chrome instead of launching one per run"""
+
+    def __init__(self, factory, config=None):
+        """
+        Args:
+            factory: Callable returning a new, not yet navigated driver
+        """
+        self.factory = factory
+        self._read_limits(config or get_config())
+
+        self._lock = threading.Lock()
+        self._active = None
+        self._spare = None
+        self._in_use = {}
+        self._warming = None
+
+    def _read_limits(self, config):
+        self.keep_spare = config.get('Browser', 'SPARE_BROWSER', False, var_type=bool)
+        self.max_runs = config.get('Browser', 'MAX_RUNS_PER_BROWSER', 20, var_type=int)
+        self.max_age_hours = config.get('Browser', 'MAX_BROWSER_AGE_HOURS', 12, var_type=float)
+        self.max_heap_mb = config.get('Browser', 'MAX_JS_HEAP_MB', 512, var_type=float)
+
+    def apply_config(self, config, changed):
+        """Config subscriber: new limits, and fresh browsers for new options"""
+        headless = changed_in(changed, 'Settings', ['HEADLESS'])
+        if not (headless or changed_in(changed, 'Browser')):
+            return
+        self._read_limits(config)
+        if headless:
+            # Idle browsers were launched with the old options
+            self.discard_idle()
+        with self._lock:
+            busy = bool(self._in_use)
+        # Mid-run the empty active slot is the browser in use; release() re-warms
+        if not busy:
+            self.warm_up_async()
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def _launch(self):
+        started = time.monotonic()
+        browser = PooledBrowser(self.factory())
+        logger.info(f"Launched pooled Chrome in {time.monotonic() - started:.1f} seconds")
+        return browser
+
+    def _quit(self, browser):
+        try:
+            browser.driver.quit()
+        except Exception as e:
+            logger.warning(f"Error quitting pooled Chrome: {e}")
+
+    def _warm_up(self):
+        """Launch whatever is missing (active browser, then the spare)"""
+        try:
+            while True:
+                with self._lock:
+                    if self._active is None:
+                        slot = '_active'
+                    elif self.keep_spare and self._spare is None:
+                        slot = '_spare'
+                    else:
+                        return
+                browser = self._launch()
+                with self._lock:
+                    if getattr(self, slot) is None:
+                        setattr(self, slot, browser)
+                        continue
+                self._quit(browser)
+                return
+        except Exception as e:
+            logger.error(f"Could not pre-launch Chrome: {e}")
+
+    def warm_up_async(self):
+        """Pre-launch browsers in the background while the scheduler sleeps"""
+        if self._warming is not None and self._warming.is_alive():
+            return
+        self._warming = threading.Thread(target=self._warm_up, name="browser-warmup", daemon=True)
+        self._warming.start()
+
+    # ------------------------------------------------------------------
+    # Health
+    # ------------------------------------------------------------------
+
+    def _js_heap_mb(self, driver):
+        try:
+            driver.execute_cdp_cmd('Performance.enable', {})
+            metrics = driver.execute_cdp_cmd('Performance.getMetrics', {}).get('metrics', [])
+        except WebDriverException:
+            return None
+        for metric in metrics:
+            if metric.get('name') == 'JSHeapUsedSize':
+                return metric['value'] / (1024 * 1024)
+        return None
+
+    def is_healthy(self, browser):
+        """Check the browser still answers commands"""
+        try:
+            return bool(browser.driver.window_handles) and \
+                browser.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def needs_recycle(self, browser):
+        """Return the reason the browser should be replaced, or None"""
+        if not self.is_healthy(browser):
+            return "unresponsive"
+        if browser.runs >= self.max_runs:
+            return f"served {browser.runs} runs"
+        if browser.age_hours() >= self.max_age_hours:
+            return f"running for {browser.age_hours():.1f} hours"
+        heap_mb = self._js_heap_mb(browser.driver)
+        if heap_mb is not None and heap_mb >= self.max_heap_mb:
+            return f"JS heap at {heap_mb:.0f} MB"
+        return None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def acquire(self):
+        """Return a healthy driver, launching one only if nothing is warm"""
+        if self._warming is not None:
+            self._warming.join()
+
+        with self._lock:
+            candidates = [b for b in (self._active, self._spare) if b is not None]
+            self._active = self._spare = None
+
+        browser = None
+        for candidate in candidates:
+            if browser is None and self.is_healthy(candidate):
+                browser = candidate
+            elif browser is not None and self.is_healthy(candidate):
+                with self._lock:
+                    self._spare = candidate
+            else:
+                logger.info("Discarding unresponsive pooled Chrome")
+                self._quit(candidate)
+
+        if browser is None:
+            browser = self._launch()
+        else:
+            logger.info(f"Reusing warm Chrome (run {browser.runs + 1} on this browser)")
+
+        with self._lock:
+            self._in_use[id(browser.driver)] = browser
+        return browser.driver
+
+    def release(self, driver):
+        """Return a driver after a run; recycle it if needed and re-warm"""
+        with self._lock:
+            browser = self._in_use.pop(id(driver), None)
+        if browser is None:
+            return
+
+        browser.runs += 1
+        reason = self.needs_recycle(browser)
+        if reason:
+            logger.info(f"Recycling pooled Chrome: {reason}")
+            self._quit(browser)
+        else:
+            try:
+                # Drop the page so it stops using memory while the scheduler sleeps
+                driver.get("about:blank")
+            except Exception:
+                pass
+            with self._lock:
+                if self._active is None:
+                    self._active = browser
+                    browser = None
+                elif self.keep_spare and self._spare is None:
+                    self._spare = browser
+                    browser = None
+            if browser is not None:
+                # Both slots were filled while the run was going
+                self._quit(browser)
+        self.warm_up_async()
+
+    def discard_idle(self):
+        """Quit the warm browsers not currently in use"""
+        if self._warming is not None:
+            self._warming.join()
+        with self._lock:
+            browsers = [b for b in (self._active, self._spare) if b is not None]
+            self._active = self._spare = None
+        for browser in browsers:
+            self._quit(browser)
+        if browsers:
+            logger.info(f"Discarded {len(browsers)} idle pooled Chrome(s)")
+
+    def close(self):
+        """Quit every browser owned by the pool"""
+        if self._warming is not None:
+            self._warming.join()
+        with self._lock:
+            browsers = [b for b in (self._active, self._spare) if b is not None]
+            browsers.extend(self._in_use.values())
+            self._active = self._spare = None
+            self._in_use = {}
+        for browser in browsers:
+            self._quit(browser)
@@ -5,11 +5,15 @@ Loads secrets from .secrets/secrets.json and configuration from config/config.in
 """
 
 import json
+import logging
 import os
 import sys
-from configparser import ConfigParser
+import threading
+from configparser import ConfigParser, Error as ConfigParserError
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
 
 class SecretsManager:
     """Manages secrets loading from JSON file"""
@@ -59,8 +63,60 @@ class SecretsManager:
         return self.secrets
 
 
+_MISSING = object()
+
+
+class ConfigSnapshot:
+    """One parsed config.ini plus the typed values read from it so far"""
+
+    def __init__(self, parser, stamp):
+        self.parser = parser
+        # (mtime_ns, size) of the file this was parsed from
+        self.stamp = stamp
+        # {(section, key, var_type): value or _MISSING}
+        self.values = {}
+
+    def convert(self, section, key, var_type):
+        """Typed value straight from the parser (raises if missing or invalid)"""
+        if var_type == bool:
+            return self.parser.getboolean(section, key)
+        elif var_type == int:
+            return self.parser.getint(section, key)
+        elif var_type == float:
+            return self.parser.getfloat(section, key)
+        else:
+            return self.parser.get(section, key)
+
+    def lookup(self, section, key, var_type):
+        """Typed value, parsed once per snapshot; _MISSING if unavailable"""
+        cache_key = (section, key, var_type)
+        value = self.values.get(cache_key, None)
+        if value is None and cache_key not in self.values:
+            try:
+                value = self.convert(section, key, var_type)
+            except Exception:
+                value = _MISSING
+            self.values[cache_key] = value
+        return value
+
+    def raw_items(self):
+        """{(section, key): raw string} for every key in the file"""
+        return {
+            (section, key): value
+            for section in self.parser.sections()
+            for key, value in self.parser.items(section, raw=True)
+        }
+
+
 class ConfigManager:
-    """Manages configuration loading from INI file"""
+    """
+    Manages configuration loading from INI file
+
+    Values are served from a typed snapshot. reload_if_changed() (called by
+    the scheduler on each tick) re-reads the file when its mtime or size
+    changes, validates it and swaps the snapshot in one assignment, then
+    tells subscribers which keys changed.
+    """
     
     def __init__(self, config_path=None):
         if config_path is None:
@@ -69,38 +125,146 @@ class ConfigManager:
             config_path = project_root / "config" / "config.ini"
         
         self.config_path = Path(config_path)
-        self.config = ConfigParser()
-        self._load_config()
+        self._subscribers = []
+        self._reload_lock = threading.Lock()
+        self._rejected_stamp = None
+        self._snapshot = self._load_config()
+    
+    @property
+    def config(self):
+        """The ConfigParser of the current snapshot"""
+        return self._snapshot.parser
+    
+    def _stamp(self):
+        stat = self.config_path.stat()
+        return (stat.st_mtime_ns, stat.st_size)
     
     def _load_config(self):
         """Load configuration from INI file"""
         if not self.config_path.exists():
             raise FileNotFoundError(f"Config file not found at {self.config_path}")
         
-        self.config.read(self.config_path)
+        stamp = self._stamp()
+        parser = ConfigParser()
+        parser.read(self.config_path)
+        return ConfigSnapshot(parser, stamp)
     
     def get(self, section, key, default=None, var_type=str):
         """
         Get a configuration value
         var_type can be: str, int, float, bool
         """
-        try:
-            if var_type == bool:
-                return self.config.getboolean(section, key)
-            elif var_type == int:
-                return self.config.getint(section, key)
-            elif var_type == float:
-                return self.config.getfloat(section, key)
-            else:
-                return self.config.get(section, key)
-        except:
-            if default is not None:
-                return default
-            raise KeyError(f"Config key not found: {section}.{key}")
+        value = self._snapshot.lookup(section, key, var_type)
+        if value is not _MISSING:
+            return value
+        if default is not None:
+            return default
+        raise KeyError(f"Config key not found: {section}.{key}")
     
     def get_all(self, section):
         """Get all keys in a section as dictionary"""
         return dict(self.config.items(section))
+    
+    # ------------------------------------------------------------------
+    # Hot reload
+    # ------------------------------------------------------------------
+    
+    def subscribe(self, callback):
+        """
+        Call callback(config, changed) after each reload that changed keys
+
+        changed is a set of (section, key) pairs (added, removed or edited).
+        """
+        self._subscribers.append(callback)
+        return callback
+    
+    def unsubscribe(self, callback):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+    
+    @staticmethod
+    def _validate(old, new):
+        """
+        Sanity checks before a new file replaces the running config
+
+        Every section must still be there (a half-written file loses its
+        tail) and every value read so far must still parse as the same type
+        (e.g. "1,5" for a float). A removed key is allowed; readers fall back
+        to their default. Returns a list of problems.
+        """
+        problems = [
+            f"section [{section}] is missing"
+            for section in old.parser.sections() if not new.parser.has_section(section)
+        ]
+        for (section, key, var_type), value in list(old.values.items()):
+            if value is _MISSING or not new.parser.has_option(section, key):
+                continue
+            try:
+                new.convert(section, key, var_type)
+            except Exception as e:
+                problems.append(f"{section}.{key}: {e}")
+        return problems
+    
+    def reload_if_changed(self):
+        """
+        Swap in a new snapshot if config.ini changed on disk
+
+        Costs one stat() when nothing changed. An invalid file is logged once
+        and ignored (the current snapshot stays) until it changes again.
+
+        Returns:
+            Set of (section, key) pairs that changed (empty if none)
+        """
+        try:
+            stamp = self._stamp()
+        except OSError:
+            return set()
+        if stamp == self._snapshot.stamp or stamp == self._rejected_stamp:
+            return set()
+        
+        with self._reload_lock:
+            old = self._snapshot
+            if stamp == old.stamp:
+                return set()
+            try:
+                new = self._load_config()
+            except (OSError, ConfigParserError) as e:
+                problems = [str(e)]
+            else:
+                problems = self._validate(old, new)
+            if problems:
+                self._rejected_stamp = stamp
+                logger.error(f"Ignoring changes to {self.config_path.name}: " + "; ".join(problems))
+                return set()
+            
+            old_items = old.raw_items()
+            new_items = new.raw_items()
+            changed = {
+                item for item in old_items.keys() | new_items.keys()
+                if old_items.get(item) != new_items.get(item)
+            }
+            self._snapshot = new
+            self._rejected_stamp = None
+        
+        if changed:
+            logger.info(f"Reloaded {self.config_path.name}: "
+                        + ", ".join(f"{s}.{k}" for s, k in sorted(changed)))
+            for callback in list(self._subscribers):
+                try:
+                    callback(self, changed)
+                except Exception as e:
+                    logger.error(f"Config subscriber {getattr(callback, '__name__', callback)} failed: {e}")
+        return changed
+
+
+def changed_in(changed, section, keys=None):
+    """True if any of keys (or any key at all) in section is in changed"""
+    section = section.lower()
+    keys = {key.lower() for key in keys} if keys else None
+    return any(
+        s.lower() == section and (keys is None or k.lower() in keys)
+        for s, k in changed
+    )
 
 
 # Convenience functions
@@ -150,6 +314,6 @@ if __name__ == "__main__":
         config = get_config()
         print(f"✓ Login URL: {config.get('URLs', 'NAUKRI_LOGIN_URL')}")
         print(f"✓ Headless Mode: {config.get('Settings', 'HEADLESS', var_type=bool)}")
-        print(f"✓ Schedule Interval: {config.get('Scheduling', 'SCHEDULE_INTERVAL_HOURS', var_type=int)} hours")
+        print(f"✓ Schedule Interval: {config.get('Scheduling', 'SCHEDULE_INTERVAL_HOURS', var_type=float)} hours")
     except Exception as e:
         print(f"✗ Error loading config: {e}")
@@ -0,0 +1,138 @@
+"""
+DOM Snapshots
+The form controls of a page (inputs, textareas, buttons) captured with a
+single script call and appended to a gzipped per-run artifact, for working
+out why a locator stopped matching without flooding the main log
+"""
+
+import gzip
+import json
+import logging
+import time
+from datetime import datetime
+from pathlib import Path
+
+from config_loader import get_config
+from structured_log import current_account, current_run_id
+
+logger = logging.getLogger(__name__)
+
+# One round trip for the whole page. Values are left out on purpose: the
+# login form holds the password.
+_SNAPSHOT_JS = """
+function attrs(el, names) {
+    var out = {};
+    for (var i = 0; i < names.length; i++) {
+        var value = el.getAttribute(names[i]);
+        if (value) { out[names[i]] = value.slice(0, 120); }
+    }
+    out.visible = !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+    return out;
+}
+function collect(tag, names, limit, withText) {
+    var nodes = document.getElementsByTagName(tag);
+    var items = [];
+    for (var i = 0; i < nodes.length && items.length < limit; i++) {
+        var item = attrs(nodes[i], names);
+        if (withText) { item.text = (nodes[i].innerText || '').trim().slice(0, 60); }
+        items.push(item);
+    }
+    return {count: nodes.length, items: items};
+}
+var limit = arguments[0];
+return JSON.stringify({
+    url: location.href,
+    title: document.title,
+    inputs: collect('input', ['id', 'name', 'type', 'placeholder', 'class'], limit, false),
+    textareas: collect('textarea', ['id', 'name', 'placeholder', 'class'], limit, false),
+    buttons: collect('button', ['id', 'type', 'class'], limit, true)
+});
+"""
+
+
+class SnapshotSettings:
+    """When and where snapshots are taken, from the [Trace] config section"""
+
+    def __init__(self, config=None):
+        self.load(config or get_config())
+
+    def load(self, config, changed=None):
+        """Read the snapshot keys; also subscribed to config reloads"""
+        self.on_failure = config.get('Trace', 'SNAPSHOT_ON_FAILURE', True, var_type=bool)
+        self.directory = Path(__file__).parent.parent / config.get(
+            'Trace', 'SNAPSHOT_DIR', 'logs/snapshots')
+        self.max_elements = config.get('Trace', 'SNAPSHOT_MAX_ELEMENTS', 200, var_type=int)
+        self.keep = config.get('Trace', 'KEEP_SNAPSHOTS', 50, var_type=int)
+
+
+_settings = None
+
+
+def get_snapshot_settings():
+    """Get or create the snapshot settings"""
+    global _settings
+    if _settings is None:
+        config = get_config()
+        _settings = SnapshotSettings(config)
+        config.subscribe(_settings.load)
+    return _settings
+
+
+def snapshot_wanted(failure=False):
+    """True if a snapshot should be taken: DEBUG logging, or a failure"""
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        return True
+    return failure and get_snapshot_settings().on_failure
+
+
+def _artifact_path(settings):
+    name = f"run-{current_run_id() or datetime.now().strftime('%Y%m%d-%H%M%S')}"
+    account = current_account()
+    if account:
+        name += f"-{account}"
+    # Account names are usernames or e-mail addresses
+    name = "".join(c if c.isalnum() or c in '-_.' else '_' for c in name)
+    return settings.directory / f"{name}.jsonl.gz"
+
+
+def _prune(settings):
+    artifacts = sorted(settings.directory.glob('run-*.jsonl.gz'), key=lambda p: p.stat().st_mtime)
+    for path in artifacts[:-settings.keep] if settings.keep > 0 else []:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def capture_snapshot(driver, page_name=""):
+    """
+    Snapshot the page's form controls into this run's artifact
+
+    Each snapshot is appended as its own gzip member, so the file is read
+    back with plain gzip (e.g. zcat) as one JSON object per line.
+
+    Returns:
+        The artifact path
+    """
+    settings = get_snapshot_settings()
+    started = time.perf_counter()
+    snapshot = json.loads(driver.execute_script(_SNAPSHOT_JS, settings.max_elements))
+    snapshot = {
+        "time": datetime.now().isoformat(timespec='milliseconds'),
+        "page": page_name,
+        "run_id": current_run_id(),
+        **snapshot,
+    }
+
+    settings.directory.mkdir(parents=True, exist_ok=True)
+    path = _artifact_path(settings)
+    is_new = not path.exists()
+    with gzip.open(path, 'ab') as f:
+        f.write((json.dumps(snapshot, ensure_ascii=False) + "\n").encode('utf-8'))
+    if is_new:
+        _prune(settings)
+
+    logger.info(f"DOM snapshot of {page_name or snapshot['url']}: "
+                f"{snapshot['inputs']['count']} inputs, {snapshot['textareas']['count']} textareas, "
+                f"{snapshot['buttons']['count']} buttons in {time.perf_counter() - started:.2f}s -> {path}")
+    return path
@@ -0,0 +1,66 @@
+"""
+File Lock
+Cross-process lock around the read-modify-write of shared state files, so
+parallel account workers (separate processes) don't lose each other's writes
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# flock is per open file, so threads of one process also need a lock
+_thread_locks = {}
+_thread_locks_guard = threading.Lock()
+
+
+def _thread_lock(path):
+    with _thread_locks_guard:
+        return _thread_locks.setdefault(path, threading.Lock())
+
+
+def _acquire(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        return
+    f.seek(0)
+    while True:
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            # LK_LOCK gives up after about 10 seconds; keep waiting
+            time.sleep(0.1)
+
+
+def _release(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def locked(path):
+    """
+    Hold an exclusive lock for path across threads and processes
+
+    The lock is taken on a "<path>.lock" sidecar, since the state files are
+    replaced atomically (a lock on the file itself would go with the old one).
+    """
+    lock_path = Path(f"{path}.lock")
+    with _thread_lock(str(lock_path)):
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(lock_path, 'a+b') as f:
+            _acquire(f)
+            try:
+                yield
+            finally:
+                _release(f)
@@ -0,0 +1,127 @@
+"""
+HTTP Resume Upload
+Uploads the resume as a direct multipart request through a pooled
+requests.Session that borrows the logged-in browser's cookies
+"""
+
+import logging
+import os
+import re
+
+import requests
+from requests.adapters import HTTPAdapter
+from selenium.common.exceptions import WebDriverException
+
+from config_loader import get_config
+
+logger = logging.getLogger(__name__)
+
+
+class HttpUploader:
+    """Multipart resume upload with the browser session's cookies"""
+
+    def __init__(self, config=None):
+        self.load(config or get_config())
+
+        # One keep-alive connection pool for every upload in this process
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=4)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def load(self, config, changed=None):
+        """Read [Upload]; also subscribed to config reloads"""
+        self.enabled = config.get('Upload', 'HTTP_UPLOAD', False, var_type=bool)
+        self.upload_url = config.get('Upload', 'UPLOAD_URL', '').strip()
+        self.file_field = config.get('Upload', 'FILE_FIELD', 'file')
+        self.form_fields = self._parse_fields(config.get('Upload', 'FORM_FIELDS', ''))
+        # No default: any 200 page (an error or login page too) would match
+        pattern = config.get('Upload', 'SUCCESS_PATTERN', '').strip()
+        self.success_pattern = re.compile(pattern) if pattern else None
+        self.timeout = config.get('Upload', 'TIMEOUT', 30, var_type=float)
+
+    @staticmethod
+    def _parse_fields(raw):
+        """Parse 'key=value, key=value' into a dict"""
+        fields = {}
+        for pair in raw.split(','):
+            if '=' in pair:
+                key, value = pair.split('=', 1)
+                fields[key.strip()] = value.strip()
+        return fields
+
+    def _adopt_browser_session(self, driver):
+        """Copy cookies and identifying headers from the Selenium session"""
+        self.session.cookies.clear()
+        try:
+            # CDP also returns cookies of other naukri.com subdomains
+            cookies = driver.execute_cdp_cmd('Network.getAllCookies', {}).get('cookies', [])
+        except WebDriverException:
+            cookies = driver.get_cookies()
+        for cookie in cookies:
+            self.session.cookies.set(
+                cookie['name'], cookie['value'],
+                domain=cookie.get('domain'), path=cookie.get('path', '/')
+            )
+        user_agent, page_url = driver.execute_script(
+            "return [navigator.userAgent, location.href];"
+        )
+        self.session.headers.update({
+            'User-Agent': user_agent,
+            'Referer': page_url,
+        })
+
+    def upload(self, driver, resume_path):
+        """
+        Upload resume_path directly
+
+        Returns True only when the response looks like a successful upload;
+        any mismatch returns False so the caller can fall back to the UI.
+        """
+        if not self.enabled:
+            return False
+        if not self.upload_url:
+            logger.warning("HTTP upload enabled but no UPLOAD_URL configured, using the UI")
+            return False
+        if self.success_pattern is None:
+            logger.warning("HTTP upload enabled but no SUCCESS_PATTERN configured, using the UI")
+            return False
+
+        try:
+            self._adopt_browser_session(driver)
+            with open(resume_path, 'rb') as f:
+                files = {
+                    self.file_field: (os.path.basename(resume_path), f, 'application/pdf')
+                }
+                response = self.session.post(
+                    self.upload_url, data=self.form_fields, files=files, timeout=self.timeout
+                )
+        except (OSError, WebDriverException, requests.exceptions.RequestException) as e:
+            logger.warning(f"HTTP upload failed, falling back to the UI: {e}")
+            return False
+
+        if not response.ok:
+            logger.warning(f"HTTP upload returned {response.status_code}, falling back to the UI")
+            return False
+        if 'nLogin' in response.url:
+            logger.warning("HTTP upload was redirected to login, falling back to the UI")
+            return False
+        if not self.success_pattern.search(response.text):
+            logger.warning("HTTP upload response did not match SUCCESS_PATTERN, falling back to the UI")
+            return False
+
+        logger.info(f"Resume uploaded over HTTP ({response.elapsed.total_seconds():.1f} seconds)")
+        return True
+
+
+_uploader = None
+
+
+def get_http_uploader():
+    """Get or create the HTTP uploader"""
+    global _uploader
+    if _uploader is None:
+        config = get_config()
+        _uploader = HttpUploader(config)
+        config.subscribe(_uploader.load)
+    return _uploader
@@ -0,0 +1,190 @@
+"""
+Job Scheduler Core
+Priority queue of due times on the monotonic clock that dispatches due jobs
+to a bounded pool of worker threads
+"""
+
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Upper bound for one wait, so Ctrl+C is noticed promptly on every platform.
+# Waits still end exactly at the next due time when that comes sooner.
+MAX_WAIT_SECONDS = 1.0
+
+# Used when a job's own delay cannot be computed
+RETRY_DELAY_SECONDS = 60
+
+
+class Job:
+    """
+    A repeating unit of work, e.g. one (account, task) pair
+
+    The delay until the next run is taken from, in order of preference:
+    a delay callable, a random (min, max) jitter window, or a fixed interval.
+    """
+
+    def __init__(self, name, action, interval=None, window=None, delay=None,
+                 account=None, task=None):
+        if delay is None and window is None and interval is None:
+            raise ValueError(f"Job {name} needs an interval, window or delay")
+        self.name = name
+        self.action = action
+        self.interval = interval
+        self.window = window
+        self.delay = delay
+        self.account = account
+        self.task = task
+        self.cancelled = False
+        self.due = None
+        self.runs = 0
+
+    def next_delay(self):
+        """Seconds from now until the next run"""
+        if self.delay is not None:
+            return self.delay()
+        if self.window is not None:
+            return random.uniform(*self.window)
+        return self.interval
+
+    def __repr__(self):
+        return f"Job({self.name!r})"
+
+
+class JobScheduler:
+    """Runs jobs when they fall due; a job is rescheduled after it finishes"""
+
+    def __init__(self, max_workers=1, clock=time.monotonic, on_tick=None):
+        """
+        Args:
+            on_tick: Optional callable run on the dispatcher thread at least
+                every MAX_WAIT_SECONDS (e.g. a cheap config reload check)
+        """
+        self.clock = clock
+        self.on_tick = on_tick
+        self.max_workers = max_workers
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._active = set()
+        self._executor = None
+        self.running = False
+
+    def __len__(self):
+        with self._cond:
+            return len(self._heap)
+
+    def add(self, job, delay=0.0):
+        """Queue job to run delay seconds from now"""
+        with self._cond:
+            job.cancelled = False
+            job.due = self.clock() + delay
+            heapq.heappush(self._heap, (job.due, next(self._seq), job))
+            self._cond.notify()
+        return job
+
+    def cancel(self, job):
+        """Stop a job from running again (removed lazily from the queue)"""
+        with self._cond:
+            job.cancelled = True
+            self._cond.notify()
+
+    def seconds_until_next(self):
+        """Seconds until the earliest queued job is due, or None if empty"""
+        with self._cond:
+            self._discard_cancelled()
+            if not self._heap:
+                return None
+            return max(0.0, self._heap[0][0] - self.clock())
+
+    def _discard_cancelled(self):
+        while self._heap and self._heap[0][2].cancelled:
+            heapq.heappop(self._heap)
+
+    def _pop_due(self):
+        """Wait (at most one tick) for jobs to fall due; return the due jobs"""
+        with self._cond:
+            if not self.running:
+                return []
+            self._discard_cancelled()
+            now = self.clock()
+            if not (self._heap and self._heap[0][0] <= now):
+                timeout = MAX_WAIT_SECONDS
+                if self._heap:
+                    timeout = min(timeout, self._heap[0][0] - now)
+                self._cond.wait(timeout)
+                now = self.clock()
+            due = []
+            while self.running and self._heap and self._heap[0][0] <= now:
+                _, _, job = heapq.heappop(self._heap)
+                if not job.cancelled:
+                    due.append(job)
+            return due
+
+    def _tick(self):
+        if self.on_tick is None:
+            return
+        try:
+            self.on_tick()
+        except Exception as e:
+            logger.error(f"Scheduler tick hook failed: {e}")
+
+    def _dispatch(self, job):
+        with self._cond:
+            if job in self._active:
+                # Still running; it is rescheduled when that run finishes
+                logger.warning(f"{job.name} is still running, skipping this slot")
+                return
+            self._active.add(job)
+        future = self._executor.submit(job.action)
+        future.add_done_callback(lambda f, job=job: self._finished(job, f))
+
+    def _finished(self, job, future):
+        error = future.exception()
+        if error is not None:
+            logger.error(f"{job.name} failed: {error}", exc_info=error)
+        with self._cond:
+            job.runs += 1
+            self._active.discard(job)
+            if self.running and not job.cancelled:
+                self._reschedule(job)
+
+    def _reschedule(self, job):
+        try:
+            delay = job.next_delay()
+        except Exception as e:
+            logger.error(f"Could not compute next delay for {job.name}: {e}")
+            delay = RETRY_DELAY_SECONDS
+        job.due = self.clock() + delay
+        heapq.heappush(self._heap, (job.due, next(self._seq), job))
+        self._cond.notify()
+
+    def run(self):
+        """Dispatch jobs until stop() is called"""
+        self.running = True
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="job-worker"
+        )
+        try:
+            while self.running:
+                self._tick()
+                for job in self._pop_due():
+                    self._dispatch(job)
+        finally:
+            self.running = False
+            with self._cond:
+                self._cond.notify_all()
+
+    def stop(self, wait=True):
+        """Stop dispatching; optionally wait for running jobs to finish"""
+        with self._cond:
+            self.running = False
+            self._cond.notify_all()
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,291 @@
+"""
+Locator Probing
+Checks a whole list of fallback XPaths in a single execute_script round trip
+and keeps a persistent, self-ordering record of which candidates win
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+from selenium.common.exceptions import JavascriptException, WebDriverException
+
+from config_loader import get_config
+from file_lock import locked
+from page_waits import wait_for
+
+logger = logging.getLogger(__name__)
+
+
+# Evaluates every candidate in the page and returns [index, element] pairs in
+# candidate order. Runs inside the browser, so missing candidates cost nothing
+# and the driver's implicit wait never applies.
+_PROBE_JS = """
+var xpaths = arguments[0], findAll = arguments[1], visibleOnly = arguments[2];
+var found = [];
+for (var i = 0; i < xpaths.length; i++) {
+    var result;
+    try {
+        result = document.evaluate(xpaths[i], document, null,
+            XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    } catch (e) {
+        continue;
+    }
+    for (var j = 0; j < result.snapshotLength; j++) {
+        var node = result.snapshotItem(j);
+        if (node.nodeType !== 1) continue;
+        if (visibleOnly && !(node.offsetWidth || node.offsetHeight ||
+                             node.getClientRects().length)) continue;
+        found.push([i, node]);
+        break;
+    }
+    if (found.length && !findAll) break;
+}
+return found;
+"""
+
+
+def _run_probe(driver, xpaths, find_all, visible_only):
+    if not xpaths:
+        return []
+    try:
+        matches = driver.execute_script(_PROBE_JS, list(xpaths), find_all, visible_only)
+    except (JavascriptException, WebDriverException):
+        return []
+    return [(xpaths[index], element) for index, element in matches or []]
+
+
+def probe_all(driver, xpaths, visible_only=False):
+    """
+    Return (xpath, element) for every candidate that matches, in list order
+
+    Each candidate contributes its first matching element, so callers can
+    fall through to the next candidate when interacting with one fails.
+    """
+    return _run_probe(driver, xpaths, True, visible_only)
+
+
+def probe(driver, xpaths, visible_only=False):
+    """Return (xpath, element) for the first matching candidate, or (None, None)"""
+    matches = _run_probe(driver, xpaths, False, visible_only)
+    return matches[0] if matches else (None, None)
+
+
+def any_xpath(xpaths, visible_only=False):
+    """Wait condition: first matching candidate as (xpath, element)"""
+    def _condition(driver):
+        xpath, element = probe(driver, xpaths, visible_only)
+        return (xpath, element) if element is not None else False
+    return _condition
+
+
+class LocatorRegistry:
+    """
+    Persistent record of which fallback candidates actually work
+
+    Candidates are scored with a decaying hit rate: every use of a list pulls
+    the scores of untouched candidates back towards a neutral prior, so old
+    misses are forgiven and the order recovers when the Naukri DOM changes.
+    The most recent winner of each list is always tried first.
+    """
+
+    PRIOR = 0.5
+
+    def __init__(self, cache_path=None, decay=None):
+        config = get_config()
+        if cache_path is None:
+            cache_path = Path(__file__).parent.parent / config.get(
+                'Locators', 'CACHE_FILE', 'logs/locators.json')
+        if decay is None:
+            decay = config.get('Locators', 'DECAY', 0.8, var_type=float)
+
+        self.cache_path = Path(cache_path)
+        self.decay = decay
+        self._lock = threading.Lock()
+        self.data = self._load()
+
+    def _load(self):
+        """Load the registry from disk, starting fresh if it is unreadable"""
+        try:
+            with open(self.cache_path, 'r') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                return data
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def save(self):
+        """Write the registry atomically so a crash never leaves half a file"""
+        with self._lock:
+            payload = json.dumps(self.data, indent=2, sort_keys=True)
+        self._write(payload)
+
+    def _write(self, payload):
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(f'{self.cache_path.suffix}.{os.getpid()}.tmp')
+            with open(tmp_path, 'w') as f:
+                f.write(payload)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.warning(f"Could not save locator cache: {e}")
+
+    def _entry(self, name, xpaths):
+        entry = self.data.setdefault(name, {"winner": None, "candidates": {}})
+        stats = entry["candidates"]
+        # Forget candidates that were removed from the code
+        for stale in [xpath for xpath in stats if xpath not in xpaths]:
+            del stats[stale]
+        if entry["winner"] not in xpaths:
+            entry["winner"] = None
+        return entry
+
+    def _stats(self, entry, xpath):
+        return entry["candidates"].setdefault(xpath, {
+            "hits": 0, "misses": 0, "score": self.PRIOR, "latency_ms": None
+        })
+
+    def ranked(self, name, xpaths):
+        """Return the candidates best-first; ties keep the order in the code"""
+        with self._lock:
+            entry = self._entry(name, xpaths)
+            winner = entry["winner"]
+            scores = {
+                xpath: entry["candidates"].get(xpath, {}).get("score", self.PRIOR)
+                for xpath in xpaths
+            }
+        order = {xpath: index for index, xpath in enumerate(xpaths)}
+        return sorted(
+            xpaths,
+            key=lambda xpath: (xpath != winner, -scores[xpath], order[xpath])
+        )
+
+    def record(self, name, xpaths, winner=None, misses=(), latency=None):
+        """Record the outcome of one search over a candidate list"""
+        # Re-read under the file lock so other account workers' scores survive
+        with locked(self.cache_path):
+            data = self._load()
+            with self._lock:
+                self.data = data or self.data
+                self._record(name, xpaths, winner, misses, latency)
+                payload = json.dumps(self.data, indent=2, sort_keys=True)
+            self._write(payload)
+
+    def _record(self, name, xpaths, winner, misses, latency):
+        entry = self._entry(name, xpaths)
+        touched = set(misses) | ({winner} if winner else set())
+
+        for xpath in xpaths:
+            stats = self._stats(entry, xpath)
+            if xpath in touched:
+                continue
+            stats["score"] = self.PRIOR + (stats["score"] - self.PRIOR) * self.decay
+
+        for xpath in misses:
+            stats = self._stats(entry, xpath)
+            stats["misses"] += 1
+            stats["score"] *= self.decay
+            if entry["winner"] == xpath:
+                entry["winner"] = None
+
+        if winner:
+            stats = self._stats(entry, winner)
+            stats["hits"] += 1
+            stats["score"] = stats["score"] * self.decay + (1 - self.decay)
+            if latency is not None:
+                latency_ms = round(latency * 1000, 1)
+                previous = stats["latency_ms"]
+                stats["latency_ms"] = latency_ms if previous is None else round(
+                    previous * self.decay + latency_ms * (1 - self.decay), 1)
+            entry["winner"] = winner
+
+
+_registry = None
+
+
+def get_locator_registry():
+    """Get or create the locator registry"""
+    global _registry
+    if _registry is None:
+        _registry = LocatorRegistry()
+    return _registry
+
+
+class LocatorSearch:
+    """
+    Iterate the matching candidates of a fallback list, best-first
+
+    The first probe stops at the first match in ranked order, so the cached
+    winner usually costs a single XPath evaluation. It is polled until a
+    candidate appears or the timeout (element_timeout by default, clamped to
+    deadline) runs out; pass timeout=0 for optional elements such as popups.
+    If the caller cannot use that element, the remaining candidates are
+    probed in one more round trip. Call found() once an element has been
+    used successfully.
+
+        search = LocatorSearch(driver, 'logout.button', logout_xpaths, deadline=deadline)
+        for xpath, el in search:
+            ...
+            search.found(xpath)
+            break
+    """
+
+    def __init__(self, driver, name, xpaths, visible_only=False, registry=None,
+                 timeout=None, deadline=None):
+        self.driver = driver
+        self.name = name
+        self.xpaths = list(xpaths)
+        self.visible_only = visible_only
+        self.timeout = timeout
+        self.deadline = deadline
+        self.registry = registry or get_locator_registry()
+        self._misses = []
+        self._started = None
+        self._done = False
+
+    def __iter__(self):
+        self._started = time.monotonic()
+        ranked = self.registry.ranked(self.name, self.xpaths)
+
+        found = wait_for(self.driver, any_xpath(ranked, self.visible_only),
+                         timeout=self.timeout, deadline=self.deadline)
+        if not found:
+            self._misses.extend(ranked)
+            self._finish()
+            return
+
+        xpath, element = found
+        # Everything ranked ahead of the first match was evaluated and absent
+        position = ranked.index(xpath)
+        self._misses.extend(ranked[:position])
+        yield xpath, element
+        if self._done:
+            return
+        self._misses.append(xpath)
+
+        rest = ranked[position + 1:]
+        matches = dict(probe_all(self.driver, rest, self.visible_only))
+        for candidate in rest:
+            if candidate not in matches:
+                self._misses.append(candidate)
+                continue
+            yield candidate, matches[candidate]
+            if self._done:
+                return
+            self._misses.append(candidate)
+        self._finish()
+
+    def found(self, xpath):
+        """Mark xpath as the candidate that worked"""
+        self._finish(winner=xpath)
+
+    def _finish(self, winner=None):
+        if self._done:
+            return
+        self._done = True
+        latency = time.monotonic() - self._started if winner and self._started else None
+        self.registry.record(self.name, self.xpaths, winner, self._misses, latency)
@@ -0,0 +1,204 @@
+"""
+Logging Setup
+One logging pipeline for the whole app: callers only enqueue records, and a
+background listener thread writes them to a size-rotated log file (rotated
+files are gzipped, records are JSON lines indexed by run id) and the console
+"""
+
+import atexit
+import gzip
+import json
+import logging
+import os
+import queue
+import shutil
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+
+from config_loader import get_config
+from structured_log import RUN_END, ContextFilter, JsonFormatter, NotRunEvent, read_index
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+_listeners = []
+_handlers = []
+_configured_pid = None
+_worker_queue = None
+
+
+class GzipRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler whose rotated files are gzip-compressed"""
+
+    def __init__(self, filename, compress=True, **kwargs):
+        super().__init__(filename, **kwargs)
+        if compress:
+            self.namer = lambda name: f"{name}.gz"
+            self.rotator = self._gzip_rotator
+
+    @staticmethod
+    def _gzip_rotator(source, dest):
+        with open(source, 'rb') as src, gzip.open(dest, 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(source)
+
+
+class IndexedLogHandler(GzipRotatingFileHandler):
+    """
+    Rotating log file that records where each run's lines are
+
+    The index is append-only JSON lines: {"run", "seg", "start"} when a run
+    first writes to a log segment and {"run", "seg", "end"} when it ends or
+    the segment rotates. A segment number grows by one per rotation, which
+    is how a range is matched to the current file or a rotated .N(.gz) file.
+    """
+
+    def __init__(self, filename, **kwargs):
+        super().__init__(filename, **kwargs)
+        self.index_path = Path(f"{self.baseFilename}.idx")
+        self.segment = read_index(self.index_path)[1]
+        self._open_runs = {}
+
+    def _append_index(self, entry):
+        with open(self.index_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + "\n")
+
+    def _close_run(self, run_id):
+        end = self._open_runs.pop(run_id, None)
+        if end is not None:
+            self._append_index({"run": run_id, "seg": self.segment, "end": end})
+
+    def emit(self, record):
+        run_id = getattr(record, 'run_id', None)
+        if getattr(record, 'run_event', None) == RUN_END:
+            self._close_run(run_id)
+            return
+        try:
+            if self.shouldRollover(record):
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            start = self.stream.tell()
+            logging.FileHandler.emit(self, record)
+            if run_id is not None:
+                if run_id not in self._open_runs:
+                    self._append_index({"run": run_id, "seg": self.segment, "start": start})
+                self._open_runs[run_id] = self.stream.tell()
+        except Exception:
+            self.handleError(record)
+
+    def doRollover(self):
+        for run_id in list(self._open_runs):
+            self._close_run(run_id)
+        super().doRollover()
+        self.segment += 1
+        self._prune_index()
+
+    def _prune_index(self):
+        """Drop ranges in segments that rotation has deleted"""
+        oldest = self.segment - self.backupCount
+        entries, _ = read_index(self.index_path)
+        tmp_path = self.index_path.with_suffix(f'.idx.{os.getpid()}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({"segment": self.segment}) + "\n")
+            for entry in entries:
+                if entry["seg"] >= oldest:
+                    f.write(json.dumps(entry) + "\n")
+        os.replace(tmp_path, self.index_path)
+
+
+def _build_handlers(config):
+    log_file = Path(__file__).parent.parent / config.get('Logging', 'LOG_FILE', 'logs/naukri.log')
+    log_file.parent.mkdir(parents=True, exist_ok=True)
+    formatter = logging.Formatter(LOG_FORMAT)
+
+    file_handler = IndexedLogHandler(
+        str(log_file),
+        compress=config.get('Logging', 'COMPRESS_ROTATED', True, var_type=bool),
+        maxBytes=config.get('Logging', 'MAX_LOG_SIZE', 10 * 1024 * 1024, var_type=int),
+        backupCount=config.get('Logging', 'BACKUP_COUNT', 5, var_type=int),
+        encoding='utf-8',
+    )
+    if config.get('Logging', 'FORMAT', 'json').strip().lower() == 'json':
+        file_handler.setFormatter(JsonFormatter())
+    else:
+        file_handler.setFormatter(formatter)
+    handlers = [file_handler]
+
+    if config.get('Logging', 'CONSOLE', True, var_type=bool):
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        console_handler.addFilter(NotRunEvent())
+        handlers.append(console_handler)
+    return handlers
+
+
+def _install(root, record_queue):
+    """Make record_queue the root logger's only destination"""
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    handler = QueueHandler(record_queue)
+    # Filters run in the thread that logged, where the run context is visible
+    handler.addFilter(ContextFilter())
+    root.addHandler(handler)
+
+
+def setup_logging(config=None):
+    """
+    Configure the root logger once per process
+
+    Safe to call from every entry point; later calls are no-ops. Modules
+    keep using logging.getLogger(__name__) as before.
+    """
+    global _configured_pid
+    if _configured_pid == os.getpid():
+        return logging.getLogger()
+
+    config = config or get_config()
+    root = logging.getLogger()
+    root.setLevel(config.get('Logging', 'LOG_LEVEL', 'INFO').strip().upper())
+
+    _handlers[:] = _build_handlers(config)
+    record_queue = queue.SimpleQueue()
+    listener = QueueListener(record_queue, *_handlers, respect_handler_level=True)
+    listener.start()
+    _listeners[:] = [listener]
+    _install(root, record_queue)
+
+    _configured_pid = os.getpid()
+    atexit.register(stop_logging)
+    return root
+
+
+def worker_log_queue():
+    """
+    Queue for worker processes to send their records to this process
+
+    Pass it to init_worker_logging in the worker; the records are written by
+    this process's handlers, so only one process ever rotates the log file.
+    """
+    global _worker_queue
+    setup_logging()
+    if _worker_queue is None:
+        import multiprocessing
+        _worker_queue = multiprocessing.Queue()
+        listener = QueueListener(_worker_queue, *_handlers, respect_handler_level=True)
+        listener.start()
+        _listeners.append(listener)
+    return _worker_queue
+
+
+def init_worker_logging(record_queue, level=logging.INFO):
+    """Process-pool initializer: forward every record to the parent"""
+    global _configured_pid
+    # Listener threads inherited through fork are not running here
+    _listeners.clear()
+    root = logging.getLogger()
+    root.setLevel(level)
+    _install(root, record_queue)
+    _configured_pid = os.getpid()
+
+
+def stop_logging():
+    """Flush queued records and stop the writer threads"""
+    while _listeners:
+        _listeners.pop().stop()
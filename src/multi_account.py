@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Multi-Account Runner
+Runs the Naukri automation for several accounts concurrently, one process
+(and one isolated Chrome) per account, in a bounded process pool
+"""
+
+import logging
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config_loader import get_config, get_secrets
+from log_setup import init_worker_logging, worker_log_queue
+from structured_log import run_context
+from run_trace import run_trace
+from webdriver_profiler import profile_commands
+
+
+def _default_modified_resume(account_name, modified_resume):
+    """Give each account its own output file so workers never share one"""
+    path = Path(modified_resume)
+    suffix = re.sub(r'[^A-Za-z0-9]+', '_', account_name).strip('_')
+    return str(path.with_name(f"{path.stem}_{suffix}{path.suffix}"))
+
+
+def load_accounts(secrets=None):
+    """
+    Read the account list from secrets
+
+    Uses the "accounts" list when present, otherwise the single "naukri"
+    account. Missing resume paths fall back to the top-level "paths".
+    """
+    secrets = secrets or get_secrets()
+    original_resume = secrets.get('paths.original_resume')
+    modified_resume = secrets.get('paths.modified_resume')
+
+    entries = secrets.get_all().get('accounts')
+    if not entries:
+        entries = [secrets.get('naukri')]
+
+    accounts = []
+    for entry in entries:
+        name = entry['username']
+        accounts.append({
+            'username': name,
+            'password': entry['password'],
+            'mobile': entry['mobile'],
+            'original_resume': entry.get('original_resume', original_resume),
+            'modified_resume': entry.get('modified_resume') or (
+                modified_resume if len(entries) == 1
+                else _default_modified_resume(name, modified_resume)
+            ),
+        })
+    return accounts
+
+
+def run_account(account, tasks=None, run_id=None, tracing=False):
+    """Worker entry point: run one session (the given tasks) for one account"""
+    start_time = time.time()
+    result = {
+        'account': account['username'],
+        'success': False,
+        'duration_seconds': 0.0,
+        'error': None,
+    }
+    try:
+        import naukri_main
+        naukri_main.configure_account(account)
+        run_id = run_id or f"{account['username']}-{int(start_time)}"
+        with run_context(run_id, account=account['username'], started=start_time), \
+                run_trace(tracing) as trace, \
+                profile_commands(run_id, account['username']) as profile:
+            try:
+                logged_in, result['tasks'] = naukri_main.main(tasks=tasks)
+                result['success'] = bool(logged_in)
+            finally:
+                # Spans and command counts travel back to the scheduler with the result
+                if trace is not None:
+                    result['trace'] = trace.to_dict()
+                if profile is not None:
+                    result['webdriver'] = profile.totals()
+        if not result['success']:
+            result['error'] = "Login failed"
+    except Exception as e:
+        result['error'] = str(e)
+    result['duration_seconds'] = time.time() - start_time
+    return result
+
+
+def run_accounts(accounts, max_parallel=None, tasks=None, run_id=None, tracing=False):
+    """
+    Run every account, at most max_parallel at a time
+
+    tasks optionally maps a username to the task names due for it, and
+    run_id tags the workers' log records (see structured_log). With tracing,
+    each result carries the worker's step spans (see run_trace).
+    Returns one result dict per account, in the order given.
+    """
+    tasks = tasks or {}
+    if max_parallel is None:
+        max_parallel = get_config().get('Accounts', 'MAX_PARALLEL', 2, var_type=int)
+    max_parallel = max(1, min(max_parallel, len(accounts)))
+
+    results = {}
+    # Workers send their log records to this process, the only log writer
+    with ProcessPoolExecutor(
+        max_workers=max_parallel,
+        initializer=init_worker_logging,
+        initargs=(worker_log_queue(), logging.getLogger().level),
+    ) as pool:
+        futures = {
+            pool.submit(run_account, account, tasks.get(account['username']), run_id, tracing):
+                account['username']
+            for account in accounts
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                # The worker process itself died (e.g. killed or out of memory)
+                results[name] = {
+                    'account': name,
+                    'success': False,
+                    'duration_seconds': 0.0,
+                    'error': f"Worker crashed: {e}",
+                }
+    return [results[account['username']] for account in accounts]
+
+
+def main():
+    """Run all configured accounts once and print the results"""
+    accounts = load_accounts()
+    print(f"Running {len(accounts)} account(s)...")
+    results = run_accounts(accounts)
+
+    for result in results:
+        status = "✓ SUCCESS" if result['success'] else "✗ FAILED"
+        error = f" - {result['error']}" if result['error'] else ""
+        print(f"{status}  {result['account']} ({result['duration_seconds']:.1f}s){error}")
+
+    return all(result['success'] for result in results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
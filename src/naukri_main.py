@@ -5,63 +5,94 @@ Naukri Daily Update Automation - Main Script
 Uses configuration management and secrets from config/
 """
 
-import io
+import contextvars
 import logging
 import os
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from random import choice, randint
 from string import ascii_uppercase, digits
-from pathlib import Path
 
-from pypdf import PdfReader, PdfWriter
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-from selenium import webdriver
 from selenium.common.exceptions import NoSuchElementException
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
 
 # Import configuration and secrets
 from config_loader import get_secrets, get_config
-
-# Load secrets and config
-secrets = get_secrets()
-config = get_config()
-
-# Get credentials from secrets
-username = secrets.get('naukri.username')
-password = secrets.get('naukri.password')
-mob = secrets.get('naukri.mobile')
-originalResumePath = secrets.get('paths.original_resume')
-modifiedResumePath = secrets.get('paths.modified_resume')
-
-# Get settings from config
-updatePDF = config.get('Settings', 'UPDATE_PDF', var_type=bool)
-headless = config.get('Settings', 'HEADLESS', var_type=bool)
-upload_resume = config.get('Settings', 'UPLOAD_RESUME', var_type=bool)
-update_profile = config.get('Settings', 'UPDATE_PROFILE', var_type=bool)
-
-# Get URLs from config
-NAUKRI_LOGIN_URL = config.get('URLs', 'NAUKRI_LOGIN_URL')
-NAUKRI_PROFILE_URL = config.get('URLs', 'NAUKRI_PROFILE_URL')
-
-# Setup logging
-log_file = Path(__file__).parent.parent / config.get('Logging', 'LOG_FILE')
-log_file.parent.mkdir(parents=True, exist_ok=True)
-
-logging.basicConfig(
-    level=logging.INFO,
-    filename=str(log_file),
-    format="%(asctime)s : %(message)s"
+from locators import LocatorSearch, any_xpath
+from log_setup import setup_logging
+from structured_log import log_step, run_context
+from run_trace import traced
+from dom_snapshot import capture_snapshot, snapshot_wanted
+from webdriver_profiler import instrument, profile_commands
+from page_waits import (
+    Deadline,
+    any_of,
+    element_present,
+    element_visible,
+    url_changed,
+    url_contains,
+    wait_for,
+    wait_page_ready,
+    wait_settled,
 )
+from pdf_incremental import IncrementalUpdateError, append_incremental_update
+from resume_pool import get_resume_pool
+from session_store import get_session_store
+from task_schedule import TASK_UPDATE_PROFILE, TASK_UPLOAD_RESUME
+
+# Heavy dependencies (selenium.webdriver, pypdf, requests) are imported by
+# the functions that use them, so importing this module stays cheap for the
+# scheduler and tools (see import_time_report.py)
+
+
+class RunSettings:
+    """
+    Credentials, resume paths and [Settings]/[URLs] for a session
+
+    Built on first use by get_run_settings() rather than at import time.
+    """
+
+    def __init__(self, secrets, config):
+        # Get credentials from secrets
+        self.username = secrets.get('naukri.username')
+        self.password = secrets.get('naukri.password')
+        self.mobile = secrets.get('naukri.mobile')
+        self.original_resume = secrets.get('paths.original_resume')
+        self.modified_resume = secrets.get('paths.modified_resume')
+        self.load(config)
+
+    def load(self, config, changed=None):
+        """Read [Settings] and [URLs]
+
+        Also subscribed to config reloads, so a long-running scheduler picks
+        up edits to config.ini before its next run.
+        """
+        # Get settings from config
+        self.update_pdf = config.get('Settings', 'UPDATE_PDF', var_type=bool)
+        self.headless = config.get('Settings', 'HEADLESS', var_type=bool)
+        self.upload_resume = config.get('Settings', 'UPLOAD_RESUME', var_type=bool)
+        self.update_profile = config.get('Settings', 'UPDATE_PROFILE', var_type=bool)
+        self.pdf_update_mode = config.get('Settings', 'PDF_UPDATE_MODE', 'rewrite').strip().lower()
+
+        # Get URLs from config
+        self.login_url = config.get('URLs', 'NAUKRI_LOGIN_URL')
+        self.profile_url = config.get('URLs', 'NAUKRI_PROFILE_URL')
+        self.home_url = config.get('URLs', 'NAUKRI_HOME_URL', 'https://www.naukri.com/mnjuser/homepage')
+
+
+_settings = None
+
+
+def get_run_settings():
+    """Get or create the settings for this process's sessions"""
+    global _settings
+    if _settings is None:
+        config = get_config()
+        _settings = RunSettings(get_secrets(), config)
+        config.subscribe(_settings.load)
+    return _settings
 
-# Environment variables
-os.environ["WDM_LOCAL"] = "1"
-os.environ["WDM_LOG_LEVEL"] = "0"
 
 # Profile headline variations
 PROFILE_HEADLINES = [
@@ -78,9 +109,22 @@ PROFILE_HEADLINES = [
 ]
 
 
+def configure_account(account):
+    """Switch the session credentials to another account
+
+    Used by the multi-account runner, which gives every account its own
+    process, so the settings are never shared between accounts.
+    """
+    settings = get_run_settings()
+    settings.username = account['username']
+    settings.password = account['password']
+    settings.mobile = account['mobile']
+    settings.original_resume = account.get('original_resume', settings.original_resume)
+    settings.modified_resume = account.get('modified_resume', settings.modified_resume)
+
+
 def log_msg(message):
-    """Print to console and store to Log"""
-    print(message)
+    """Log at INFO; log_setup sends it to the console and the log file"""
     logging.info(message)
 
 
@@ -89,12 +133,13 @@ def catch(error):
     _, _, exc_tb = sys.exc_info()
     lineNo = str(exc_tb.tb_lineno)
     msg = "%s : %s at Line %s." % (type(error), error, lineNo)
-    print(msg)
     logging.error(msg)
 
 
 def getObj(locatorType):
     """This map defines how elements are identified"""
+    from selenium.webdriver.common.by import By
+
     map = {
         "ID": By.ID,
         "NAME": By.NAME,
@@ -111,11 +156,8 @@ def GetElement(driver, elementTag, locator="ID"):
     """Wait max 15 secs for element and then select when it is available"""
     try:
         def _get_element(_tag, _locator):
-            _by = getObj(_locator)
-            if is_element_present(driver, _by, _tag):
-                return WebDriverWait(driver, 15).until(
-                    lambda d: driver.find_element(_by, _tag)
-                )
+            # Explicit wait: the driver's implicit wait is 0
+            return wait_for(driver, element_present(getObj(_locator), _tag), timeout=15)
 
         element = _get_element(elementTag, locator.upper())
         if element:
@@ -137,25 +179,15 @@ def is_element_present(driver, how, what):
     return True
 
 
-def WaitTillElementPresent(driver, elementTag, locator="ID", timeout=30):
+def WaitTillElementPresent(driver, elementTag, locator="ID", timeout=30, deadline=None):
     """Wait till element present. Default 30 seconds"""
-    result = False
-    driver.implicitly_wait(0)
     locator = locator.upper()
-
-    for _ in range(timeout):
-        time.sleep(0.99)
-        try:
-            if is_element_present(driver, getObj(locator), elementTag):
-                result = True
-                break
-        except Exception as e:
-            log_msg("Exception when WaitTillElementPresent : %s" % e)
-            pass
+    result = bool(wait_for(
+        driver, element_present(getObj(locator), elementTag), timeout, deadline
+    ))
 
     if not result:
         log_msg("Element not found with %s : %s" % (locator, elementTag))
-    driver.implicitly_wait(3)
     return result
 
 
@@ -166,6 +198,7 @@ def ci(xpath_part: str) -> str:
     return f"translate({xpath_part},'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz')"
 
 
+@traced()
 def tearDown(driver):
     try:
         driver.close()
@@ -187,81 +220,47 @@ def get_random_headline():
     return choice(PROFILE_HEADLINES)
 
 
-def debug_page_elements(driver, page_name=""):
-    """Debug function to log all available input fields and their attributes"""
+def debug_page_elements(driver, page_name="", failure=False):
+    """Snapshot the page's form controls (inputs, textareas, buttons)
+
+    Only runs with DEBUG logging, or when failure is set and [Trace]
+    SNAPSHOT_ON_FAILURE is on. The snapshot is one script call written to
+    the run's gzipped artifact (see dom_snapshot), not to the main log.
+    """
+    if not snapshot_wanted(failure):
+        return None
     try:
-        log_msg(f"\n===== DEBUG: Page Elements on {page_name} =====")
-        
-        # Get all input fields
-        inputs = driver.find_elements(By.TAG_NAME, "input")
-        log_msg(f"Found {len(inputs)} input fields:")
-        for idx, inp in enumerate(inputs):
-            try:
-                inp_id = inp.get_attribute("id") or "N/A"
-                inp_name = inp.get_attribute("name") or "N/A"
-                inp_type = inp.get_attribute("type") or "N/A"
-                inp_placeholder = inp.get_attribute("placeholder") or "N/A"
-                inp_value = inp.get_attribute("value") or "N/A"
-                inp_class = inp.get_attribute("class") or "N/A"
-                log_msg(f"  [{idx}] ID: {inp_id} | Name: {inp_name} | Type: {inp_type} | Placeholder: {inp_placeholder} | Class: {inp_class}")
-            except:
-                pass
-        
-        # Get all textarea fields
-        textareas = driver.find_elements(By.TAG_NAME, "textarea")
-        log_msg(f"Found {len(textareas)} textarea fields:")
-        for idx, ta in enumerate(textareas):
-            try:
-                ta_id = ta.get_attribute("id") or "N/A"
-                ta_name = ta.get_attribute("name") or "N/A"
-                ta_placeholder = ta.get_attribute("placeholder") or "N/A"
-                ta_class = ta.get_attribute("class") or "N/A"
-                log_msg(f"  [{idx}] ID: {ta_id} | Name: {ta_name} | Placeholder: {ta_placeholder} | Class: {ta_class}")
-            except:
-                pass
-        
-        # Get all buttons
-        buttons = driver.find_elements(By.TAG_NAME, "button")
-        log_msg(f"Found {len(buttons)} button fields:")
-        for idx, btn in enumerate(buttons[:20]):
-            try:
-                btn_id = btn.get_attribute("id") or "N/A"
-                btn_text = btn.text or "N/A"
-                btn_type = btn.get_attribute("type") or "N/A"
-                btn_class = btn.get_attribute("class") or "N/A"
-                log_msg(f"  [{idx}] ID: {btn_id} | Text: {btn_text[:30]} | Type: {btn_type} | Class: {btn_class[:50]}")
-            except:
-                pass
-        
-        log_msg(f"===== END DEBUG =====\n")
+        return capture_snapshot(driver, page_name)
     except Exception as e:
         log_msg(f"Error in debug_page_elements: {e}")
+    return None
 
 
 def randomText():
     return "".join(choice(ascii_uppercase + digits) for _ in range(randint(1, 5)))
 
 
+@traced()
 def Logout(driver):
     """Logout from Naukri session"""
+    deadline = Deadline('logout')
     try:
         drawer_xpaths = [
             f"//*[contains({ci('@class')}, 'drawer__icon')]",
             f"//div[contains({ci('@class')}, 'drawer')]"
         ]
 
-        for xpath in drawer_xpaths:
-            if is_element_present(driver, By.XPATH, xpath):
-                try:
-                    el = GetElement(driver, xpath, locator="XPATH")
-                    if el:
-                        el.click()
-                        time.sleep(1)
-                        log_msg("Drawer menu opened")
-                        break
-                except Exception as e:
-                    log_msg(f"Drawer open failed ({xpath}): {e}")
-                    continue
+        drawer_search = LocatorSearch(driver, 'logout.drawer', drawer_xpaths, deadline=deadline)
+        for xpath, el in drawer_search:
+            try:
+                el.click()
+                wait_settled(driver, deadline)
+                log_msg("Drawer menu opened")
+                drawer_search.found(xpath)
+                break
+            except Exception as e:
+                log_msg(f"Drawer open failed ({xpath}): {e}")
+                continue
 
         logout_xpaths = [
             "//a[@data-type='logoutLink']",
@@ -272,20 +271,23 @@ def Logout(driver):
             f"//*[contains({ci('.')}, 'logout')]",
         ]
 
-        for xpath in logout_xpaths:
-            if is_element_present(driver, By.XPATH, xpath):
-                try:
-                    el = GetElement(driver, xpath, locator="XPATH")
-                    if el:
-                        driver.execute_script("arguments[0].scrollIntoView(true);", el)
-                        time.sleep(0.5)
-                        el.click()
-                        time.sleep(2)
-                        log_msg("Logout Successful")
-                        return True
-                except Exception as e:
-                    log_msg(f"Logout click failed ({xpath}): {e}")
+        button_search = LocatorSearch(driver, 'logout.button', logout_xpaths, deadline=deadline)
+        for xpath, el in button_search:
+            try:
+                driver.execute_script("arguments[0].scrollIntoView(true);", el)
+                logout_url = driver.current_url
+                el.click()
+                if not wait_for(driver, url_changed(logout_url), deadline=deadline):
+                    # Loose candidates (e.g. contains(., 'logout')) match
+                    # elements that do nothing; don't rank them as winners
+                    log_msg(f"Logout click did not navigate ({xpath})")
                     continue
+                log_msg("Logout Successful")
+                button_search.found(xpath)
+                return True
+            except Exception as e:
+                log_msg(f"Logout click failed ({xpath}): {e}")
+                continue
 
         log_msg("Logout button not found")
         return False
@@ -295,8 +297,16 @@ def Logout(driver):
         return False
 
 
-def LoadNaukri(headless):
-    """Open Chrome to load Naukri.com"""
+@traced()
+def LoadNaukri(headless, url=None):
+    """Open Chrome, loading url if given (None stays on a blank page)"""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service as ChromeService
+
+    # Environment variables
+    os.environ["WDM_LOCAL"] = "1"
+    os.environ["WDM_LOG_LEVEL"] = "0"
+
     options = webdriver.ChromeOptions()
     
     # Anti-detection measures
@@ -330,27 +340,75 @@ def LoadNaukri(headless):
         driver = webdriver.Chrome(options)
     
     log_msg("Google Chrome Launched!")
+    # Round trips are counted per command, caller and step (see webdriver_profiler)
+    instrument(driver)
     
-    driver.implicitly_wait(5)
-    driver.get(NAUKRI_LOGIN_URL)
+    # Every wait is explicit (see page_waits); set once here rather than
+    # saved and restored around each wait
+    driver.implicitly_wait(0)
+    if url:
+        driver.get(url)
     return driver
 
 
-def naukriLogin(headless=False):
-    """Open Chrome browser and Login to Naukri.com"""
+@traced()
+def restoreSession(headless=False, driver=None):
+    """Reuse the saved login session if it is still valid"""
+    from selenium.webdriver.common.by import By
+
+    settings = get_run_settings()
+    store = get_session_store()
+    if not store.enabled or not store.has_session(settings.username):
+        return (False, driver)
+
+    status = False
+    deadline = Deadline('login')
+    try:
+        if driver is None:
+            driver = LoadNaukri(headless, url=None)
+        if store.restore(driver, settings.username):
+            driver.get(settings.home_url)
+            # A redirect to the login page wins even if the dashboard id is there
+            found = wait_for(driver, any_of(
+                url_contains("nLogin"),
+                element_present(By.ID, "ff-inventory"),
+            ), timeout=store.validate_timeout, deadline=deadline)
+            status = bool(found) and found[0] == 1
+            store.finish_restore(driver, status)
+
+        if status:
+            log_msg("Restored saved session, skipping login")
+        else:
+            log_msg("Saved session expired, logging in again")
+            store.clear(settings.username)
+    except Exception as e:
+        catch(e)
+    return (status, driver)
+
+
+@traced()
+def naukriLogin(headless=False, driver=None):
+    """Open Chrome browser (or reuse driver) and Login to Naukri.com"""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.common.keys import Keys
+
+    settings = get_run_settings()
     status = False
-    driver = None
     username_locator = "usernameField"
     password_locator = "passwordField"
     login_btn_locator = "//*[@type='submit' and normalize-space()='Login']"
     skip_locator = "//*[text() = 'SKIP AND CONTINUE']"
     close_locator = "//*[contains(@class, 'cross-icon') or @alt='cross-icon']"
 
+    deadline = Deadline('login')
     try:
-        driver = LoadNaukri(headless)
+        if driver is None:
+            driver = LoadNaukri(headless, settings.login_url)
+        else:
+            driver.get(settings.login_url)
         
         # Wait for page to fully load
-        time.sleep(3)
+        wait_page_ready(driver, deadline)
 
         log_msg(driver.title)
         if "naukri.com" in driver.title.lower():
@@ -359,65 +417,73 @@ def naukriLogin(headless=False):
             log_msg(f"Unexpected page title: {driver.title}")
 
         emailFieldElement = None
-        if is_element_present(driver, By.ID, username_locator):
+        if wait_for(driver, element_visible(By.ID, username_locator), deadline=deadline):
             emailFieldElement = GetElement(driver, username_locator, locator="ID")
-            time.sleep(1)
             passFieldElement = GetElement(driver, password_locator, locator="ID")
-            time.sleep(1)
             loginButton = GetElement(driver, login_btn_locator, locator="XPATH")
         else:
             log_msg("None of the elements found to login.")
-            debug_page_elements(driver, "Login Page")
+            debug_page_elements(driver, "Login Page", failure=True)
             return (status, driver)
 
         if emailFieldElement is not None:
             emailFieldElement.clear()
-            emailFieldElement.send_keys(username)
-            time.sleep(2)
+            emailFieldElement.send_keys(settings.username)
             passFieldElement.clear()
-            passFieldElement.send_keys(password)
-            time.sleep(2)
+            passFieldElement.send_keys(settings.password)
+            login_url = driver.current_url
             loginButton.send_keys(Keys.ENTER)
-            time.sleep(5)
+            wait_for(driver, url_changed(login_url), deadline=deadline)
 
+            # Stop waiting once the dashboard shows up. The dashboard stays in
+            # the DOM underneath an overlaying popup, so a visible popup is
+            # checked first and clicked away.
             log_msg("Checking Skip button")
-            if WaitTillElementPresent(driver, close_locator, "XPATH", 10):
-                try:
-                    GetElement(driver, close_locator, "XPATH").click()
-                    time.sleep(1)
-                except:
-                    pass
-            
-            if WaitTillElementPresent(driver, skip_locator, "XPATH", 5):
-                try:
-                    GetElement(driver, skip_locator, "XPATH").click()
-                    time.sleep(1)
-                except:
-                    pass
-
-            if WaitTillElementPresent(driver, "ff-inventory", locator="ID", timeout=40):
+            for popup_locator in (close_locator, skip_locator):
+                found = wait_for(driver, any_of(
+                    element_visible(By.XPATH, popup_locator),
+                    element_present(By.ID, "ff-inventory"),
+                ), deadline=deadline)
+                if found and found[0] == 0:
+                    try:
+                        found[1].click()
+                        wait_settled(driver, deadline)
+                    except:
+                        pass
+
+            if WaitTillElementPresent(driver, "ff-inventory", locator="ID", timeout=40, deadline=deadline):
                 CheckPoint = GetElement(driver, "ff-inventory", locator="ID")
                 if CheckPoint:
                     log_msg("Naukri Login Successful")
                     status = True
+                    store = get_session_store()
+                    if store.enabled:
+                        store.save(driver, settings.username)
                     return (status, driver)
                 else:
                     log_msg("Unknown Login Error")
                     return (status, driver)
             else:
                 log_msg("Unknown Login Error")
-                debug_page_elements(driver, "Post-Login Page")
+                debug_page_elements(driver, "Post-Login Page", failure=True)
                 return (status, driver)
 
     except Exception as e:
         catch(e)
         if driver:
-            debug_page_elements(driver, "Login Error Page")
+            debug_page_elements(driver, "Login Error Page", failure=True)
     return (status, driver)
 
 
+@traced()
 def UpdateProfile(driver):
-    """Update user profile with mobile number and headline"""
+    """Update user profile with mobile number and headline
+
+    Returns:
+        True if a change was made and saved
+    """
+    mob = get_run_settings().mobile
+    deadline = Deadline('profile')
     try:
         log_msg("Starting Profile Update...")
         
@@ -429,24 +495,27 @@ def UpdateProfile(driver):
         ]
         
         profile_clicked = False
-        for xpath in view_profile_xpaths:
+        view_search = LocatorSearch(driver, 'profile.view', view_profile_xpaths, deadline=deadline)
+        for xpath, profElement in view_search:
             try:
-                if is_element_present(driver, By.XPATH, xpath):
-                    log_msg(f"Found view profile link: {xpath}")
-                    profElement = GetElement(driver, xpath, locator="XPATH")
-                    if profElement:
-                        profElement.click()
-                        time.sleep(2)
-                        profile_clicked = True
-                        log_msg("Clicked view profile")
-                        break
+                log_msg(f"Found view profile link: {xpath}")
+                profile_url = driver.current_url
+                profElement.click()
+                if not wait_for(driver, url_changed(profile_url), deadline=deadline):
+                    log_msg(f"View profile click did not navigate ({xpath})")
+                    continue
+                wait_page_ready(driver, deadline)
+                profile_clicked = True
+                log_msg("Clicked view profile")
+                view_search.found(xpath)
+                break
             except Exception as e:
                 log_msg(f"Failed to click view profile {xpath}: {e}")
                 continue
         
         if not profile_clicked:
             log_msg("Could not find view profile link")
-            return
+            return False
 
         close_locators = [
             "//*[contains(@class, 'crossIcon')]",
@@ -454,21 +523,23 @@ def UpdateProfile(driver):
             "//button[contains(@class, 'close')]",
         ]
         
-        for close_loc in close_locators:
+        close_popup_search = LocatorSearch(driver, 'profile.close_popup', close_locators,
+                                           timeout=0, deadline=deadline)
+        for close_loc, closeElement in close_popup_search:
             try:
-                if is_element_present(driver, By.XPATH, close_loc):
-                    GetElement(driver, close_loc, locator="XPATH").click()
-                    time.sleep(2)
-                    log_msg("Closed popup")
-                    break
+                closeElement.click()
+                wait_settled(driver, deadline)
+                log_msg("Closed popup")
+                close_popup_search.found(close_loc)
+                break
             except:
                 pass
 
-        # DEBUG: Log all page elements
+        # DEBUG: Snapshot page elements (DEBUG log level only)
         debug_page_elements(driver, "Profile Page - Initial")
         
         driver.execute_script("window.scrollBy(0, 500);")
-        time.sleep(2)
+        wait_settled(driver, deadline)
         
         debug_page_elements(driver, "Profile Page - After Scroll")
 
@@ -482,25 +553,23 @@ def UpdateProfile(driver):
         ]
         
         headline_updated = False
-        for xpath in headline_xpaths:
+        headline_search = LocatorSearch(driver, 'profile.headline', headline_xpaths, deadline=deadline)
+        for xpath, headlineElement in headline_search:
             try:
-                if is_element_present(driver, By.XPATH, xpath):
-                    log_msg(f"Found headline field: {xpath}")
-                    headlineElement = GetElement(driver, xpath, locator="XPATH")
-                    if headlineElement:
-                        current_headline = headlineElement.get_attribute("value")
-                        if not current_headline:
-                            current_headline = headlineElement.text
-                        new_headline = get_random_headline()
-                        if current_headline != new_headline:
-                            headlineElement.clear()
-                            headlineElement.send_keys(new_headline)
-                            time.sleep(1)
-                            log_msg(f"Updated headline to: {new_headline}")
-                            headline_updated = True
-                        else:
-                            log_msg(f"Headline already current: {new_headline}")
-                        break
+                log_msg(f"Found headline field: {xpath}")
+                current_headline = headlineElement.get_attribute("value")
+                if not current_headline:
+                    current_headline = headlineElement.text
+                new_headline = get_random_headline()
+                if current_headline != new_headline:
+                    headlineElement.clear()
+                    headlineElement.send_keys(new_headline)
+                    log_msg(f"Updated headline to: {new_headline}")
+                    headline_updated = True
+                else:
+                    log_msg(f"Headline already current: {new_headline}")
+                headline_search.found(xpath)
+                break
             except Exception as e:
                 log_msg(f"Failed to update headline {xpath}: {e}")
                 continue
@@ -520,33 +589,30 @@ def UpdateProfile(driver):
         ]
         
         edit_clicked = False
-        for xpath in edit_xpaths:
+        edit_search = LocatorSearch(driver, 'profile.edit', edit_xpaths, deadline=deadline)
+        for xpath, editElement in edit_search:
             try:
-                if is_element_present(driver, By.XPATH, xpath):
-                    log_msg(f"Found edit button: {xpath}")
-                    editElement = GetElement(driver, xpath, locator="XPATH")
-                    if editElement:
-                        driver.execute_script("arguments[0].scrollIntoView(true);", editElement)
-                        time.sleep(1)
-                        try:
-                            editElement.click()
-                        except:
-                            driver.execute_script("arguments[0].click();", editElement)
-                        time.sleep(2)
-                        edit_clicked = True
-                        log_msg("Clicked edit button")
-                        break
+                log_msg(f"Found edit button: {xpath}")
+                driver.execute_script("arguments[0].scrollIntoView(true);", editElement)
+                try:
+                    editElement.click()
+                except:
+                    driver.execute_script("arguments[0].click();", editElement)
+                wait_settled(driver, deadline)
+                edit_clicked = True
+                log_msg("Clicked edit button")
+                edit_search.found(xpath)
+                break
             except Exception as e:
                 log_msg(f"Failed to click edit {xpath}: {e}")
                 continue
         
         if edit_clicked:
-            time.sleep(2)
             debug_page_elements(driver, "Profile Page - After Edit Click")
         
         if not edit_clicked:
             log_msg("Could not find edit button")
-            return
+            return False
 
         mobile_xpaths = [
             "//*[@name='mobile']",
@@ -557,18 +623,16 @@ def UpdateProfile(driver):
         ]
         
         mobile_updated = False
-        for xpath in mobile_xpaths:
+        mobile_search = LocatorSearch(driver, 'profile.mobile', mobile_xpaths, deadline=deadline)
+        for xpath, mobFieldElement in mobile_search:
             try:
-                if is_element_present(driver, By.XPATH, xpath):
-                    log_msg(f"Found mobile field: {xpath}")
-                    mobFieldElement = GetElement(driver, xpath, locator="XPATH")
-                    if mobFieldElement:
-                        mobFieldElement.clear()
-                        mobFieldElement.send_keys(mob)
-                        time.sleep(1)
-                        mobile_updated = True
-                        log_msg(f"Updated mobile number: {mob}")
-                        break
+                log_msg(f"Found mobile field: {xpath}")
+                mobFieldElement.clear()
+                mobFieldElement.send_keys(mob)
+                mobile_updated = True
+                log_msg(f"Updated mobile number: {mob}")
+                mobile_search.found(xpath)
+                break
             except Exception as e:
                 log_msg(f"Failed to update mobile {xpath}: {e}")
                 continue
@@ -584,29 +648,27 @@ def UpdateProfile(driver):
         ]
         
         save_clicked = False
-        for save_xpath in save_xpaths:
+        save_search = LocatorSearch(driver, 'profile.save', save_xpaths, deadline=deadline)
+        for save_xpath, saveElement in save_search:
             try:
-                if is_element_present(driver, By.XPATH, save_xpath):
-                    log_msg(f"Found save button: {save_xpath}")
-                    saveElement = GetElement(driver, save_xpath, locator="XPATH")
-                    if saveElement:
-                        driver.execute_script("arguments[0].scrollIntoView(true);", saveElement)
-                        time.sleep(1)
-                        try:
-                            saveElement.click()
-                        except:
-                            driver.execute_script("arguments[0].click();", saveElement)
-                        log_msg("Clicked save button")
-                        time.sleep(3)
-                        save_clicked = True
-                        break
+                log_msg(f"Found save button: {save_xpath}")
+                driver.execute_script("arguments[0].scrollIntoView(true);", saveElement)
+                try:
+                    saveElement.click()
+                except:
+                    driver.execute_script("arguments[0].click();", saveElement)
+                log_msg("Clicked save button")
+                wait_settled(driver, deadline)
+                save_clicked = True
+                save_search.found(save_xpath)
+                break
             except Exception as e:
                 log_msg(f"Failed to click save button {save_xpath}: {e}")
                 continue
         
         if not save_clicked:
             log_msg("Could not find save button")
-            return
+            return False
 
         confirm_xpaths = [
             "//*[text() = 'today' or text()='Today']",
@@ -615,24 +677,21 @@ def UpdateProfile(driver):
             "//*[@id='confirmMessage']",
         ]
         
-        for xpath in confirm_xpaths:
-            try:
-                if is_element_present(driver, By.XPATH, xpath):
-                    log_msg("Profile update confirmed")
-                    break
-            except:
-                pass
+        if wait_for(driver, any_xpath(confirm_xpaths), deadline=deadline):
+            log_msg("Profile update confirmed")
 
         log_msg("Profile Update Completed")
-        time.sleep(5)
+        return headline_updated or mobile_updated
 
     except Exception as e:
         log_msg(f"Error in UpdateProfile: {e}")
         catch(e)
+        return False
 
 
-def UpdateResume():
-    """Update resume with invisible metadata changes
+@traced()
+def writeResumeVariant(sourcePath, destPath):
+    """Write an invisibly modified copy of sourcePath to destPath
     
     Makes truly invisible modifications by:
     1. Adjusting PDF compression levels
@@ -641,48 +700,98 @@ def UpdateResume():
     
     These changes are undetectable visually but mark the PDF as "new"
     for Naukri's system, triggering a profile refresh without visible changes.
-    """
-    try:
-        with open(originalResumePath, "rb") as f:
-            existing_pdf = PdfReader(f)
-            pagecount = len(existing_pdf.pages)
-            log_msg("Found %s pages in PDF" % pagecount)
 
-            output = PdfWriter()
+    With PDF_UPDATE_MODE = incremental, a small incremental update (new
+    trailer /ID) is appended to the original bytes instead, which costs the
+    same for any resume size. Falls back to the full rewrite if that fails.
+
+    Both start from the size-optimized copy of the original when [Optimize]
+    is enabled, so less has to go over the wire on upload.
+    """
+    from pdf_optimizer import get_pdf_optimizer
+    from pypdf import PdfReader, PdfWriter
+
+    basePath = get_pdf_optimizer().optimized_base(sourcePath)
+    if get_run_settings().pdf_update_mode == "incremental":
+        if os.path.abspath(sourcePath) == os.path.abspath(destPath):
+            # Appending in place would grow the original on every run
+            log_msg("Incremental PDF update needs a separate modified_resume path, rewriting instead")
+        else:
+            try:
+                added = append_incremental_update(basePath, destPath)
+                log_msg("Saved modified PDF (incremental update, %s bytes appended): %s"
+                        % (added, destPath))
+                return
+            except (IncrementalUpdateError, OSError) as e:
+                log_msg("Incremental PDF update failed (%s), rewriting instead" % e)
+
+    with open(basePath, "rb") as f:
+        existing_pdf = PdfReader(f)
+        pagecount = len(existing_pdf.pages)
+        log_msg("Found %s pages in PDF" % pagecount)
+
+        output = PdfWriter()
+        
+        # Copy all pages and make invisible internal modifications
+        for pageNum in range(pagecount):
+            page = existing_pdf.pages[pageNum]
             
-            # Copy all pages and make invisible internal modifications
-            for pageNum in range(pagecount):
-                page = existing_pdf.pages[pageNum]
-                
-                # Make internal metadata changes that don't affect visual appearance
-                # but mark the PDF as modified
-                if page.get("/Rotate"):
-                    current_rotation = page.get("/Rotate")
-                    # Rotate and rotate back (makes internal change without visual change)
-                    page.rotate(360)
-                else:
-                    # Add and remove rotation metadata (internal structure change)
-                    page.rotate(0)
-                
-                output.add_page(page)
-
-            # Write with different compression (invisible but changes file structure)
-            with open(modifiedResumePath, "wb") as outputStream:
-                output.write(outputStream)
+            # Make internal metadata changes that don't affect visual appearance
+            # but mark the PDF as modified
+            if page.get("/Rotate"):
+                current_rotation = page.get("/Rotate")
+                # Rotate and rotate back (makes internal change without visual change)
+                page.rotate(360)
+            else:
+                # Add and remove rotation metadata (internal structure change)
+                page.rotate(0)
             
-            log_msg("Saved modified PDF (invisible changes): %s" % modifiedResumePath)
-            return os.path.abspath(modifiedResumePath)
+            output.add_page(page)
+
+        # Write with different compression (invisible but changes file structure)
+        with open(destPath, "wb") as outputStream:
+            output.write(outputStream)
+        
+        log_msg("Saved modified PDF (invisible changes): %s" % destPath)
+
+
+def getResumePool():
+    """Resume variant pool that builds variants with writeResumeVariant"""
+    return get_resume_pool(writeResumeVariant)
+
+
+@traced()
+def UpdateResume():
+    """Update resume with invisible metadata changes
+
+    Takes a pre-generated variant from the resume pool when one is ready,
+    otherwise builds one now with writeResumeVariant.
+    """
+    settings = get_run_settings()
+    try:
+        if getResumePool().take(settings.original_resume, settings.modified_resume):
+            log_msg("Using pre-generated resume variant: %s" % settings.modified_resume)
+            return os.path.abspath(settings.modified_resume)
+
+        writeResumeVariant(settings.original_resume, settings.modified_resume)
+        return os.path.abspath(settings.modified_resume)
     except Exception as e:
         catch(e)
-    return os.path.abspath(originalResumePath)
+    return os.path.abspath(settings.original_resume)
 
 
+@traced()
 def UploadResume(driver, resumePath):
-    """Upload resume to Naukri profile"""
+    """Upload resume to Naukri profile
+
+    Returns:
+        True if the file was sent and the page confirmed the update
+    """
+    deadline = Deadline('upload')
     try:
         log_msg("Starting Resume Upload...")
-        driver.get(NAUKRI_PROFILE_URL)
-        time.sleep(3)
+        driver.get(get_run_settings().profile_url)
+        wait_page_ready(driver, deadline)
 
         close_locators = [
             "//*[contains(@class, 'crossIcon')]",
@@ -691,15 +800,15 @@ def UploadResume(driver, resumePath):
             "//*[@aria-label='Close']"
         ]
         
-        for close_loc in close_locators:
+        close_popup_search = LocatorSearch(driver, 'upload.close_popup', close_locators,
+                                           timeout=0, deadline=deadline)
+        for close_loc, el in close_popup_search:
             try:
-                if is_element_present(driver, By.XPATH, close_loc):
-                    el = GetElement(driver, close_loc, locator="XPATH")
-                    if el:
-                        el.click()
-                        time.sleep(1)
-                        log_msg("Closed popup")
-                        break
+                el.click()
+                wait_settled(driver, deadline)
+                log_msg("Closed popup")
+                close_popup_search.found(close_loc)
+                break
             except:
                 pass
 
@@ -713,17 +822,16 @@ def UploadResume(driver, resumePath):
         ]
         
         file_uploaded = False
-        for xpath in file_input_xpaths:
+        file_input_search = LocatorSearch(driver, 'upload.file_input', file_input_xpaths, deadline=deadline)
+        for xpath, AttachElement in file_input_search:
             try:
-                if is_element_present(driver, By.XPATH, xpath):
-                    log_msg(f"Found file input: {xpath}")
-                    AttachElement = GetElement(driver, xpath, locator="XPATH")
-                    if AttachElement:
-                        AttachElement.send_keys(os.path.abspath(resumePath))
-                        log_msg(f"Resume sent to: {xpath}")
-                        time.sleep(2)
-                        file_uploaded = True
-                        break
+                log_msg(f"Found file input: {xpath}")
+                AttachElement.send_keys(os.path.abspath(resumePath))
+                log_msg(f"Resume sent to: {xpath}")
+                wait_settled(driver, deadline)
+                file_uploaded = True
+                file_input_search.found(xpath)
+                break
             except Exception as e:
                 log_msg(f"Failed with xpath {xpath}: {e}")
                 continue
@@ -741,22 +849,20 @@ def UploadResume(driver, resumePath):
         ]
         
         save_clicked = False
-        for save_xpath in save_button_xpaths:
+        save_search = LocatorSearch(driver, 'upload.save', save_button_xpaths, deadline=deadline)
+        for save_xpath, saveElement in save_search:
             try:
-                if is_element_present(driver, By.XPATH, save_xpath):
-                    log_msg(f"Found save button: {save_xpath}")
-                    saveElement = GetElement(driver, save_xpath, locator="XPATH")
-                    if saveElement:
-                        driver.execute_script("arguments[0].scrollIntoView(true);", saveElement)
-                        time.sleep(1)
-                        try:
-                            saveElement.click()
-                        except:
-                            driver.execute_script("arguments[0].click();", saveElement)
-                        log_msg("Clicked save button")
-                        time.sleep(3)
-                        save_clicked = True
-                        break
+                log_msg(f"Found save button: {save_xpath}")
+                driver.execute_script("arguments[0].scrollIntoView(true);", saveElement)
+                try:
+                    saveElement.click()
+                except:
+                    driver.execute_script("arguments[0].click();", saveElement)
+                log_msg("Clicked save button")
+                wait_settled(driver, deadline)
+                save_clicked = True
+                save_search.found(save_xpath)
+                break
             except Exception as e:
                 log_msg(f"Failed to click save button {save_xpath}: {e}")
                 continue
@@ -771,69 +877,145 @@ def UploadResume(driver, resumePath):
             "//*[contains(text(), 'success')]",
         ]
         
-        time.sleep(2)
         success_found = False
-        for success_xpath in success_xpaths:
+        found = wait_for(driver, any_xpath(success_xpaths, visible_only=True), deadline=deadline)
+        if found:
             try:
-                if is_element_present(driver, By.XPATH, success_xpath):
-                    CheckPoint = GetElement(driver, success_xpath, locator="XPATH")
-                    if CheckPoint:
-                        LastUpdatedDate = CheckPoint.text
-                        log_msg(f"Success message found: {LastUpdatedDate}")
-                        todaysDate1 = datetime.today().strftime("%b %d, %Y")
-                        todaysDate2 = datetime.today().strftime("%b %#d, %Y")
-                        if todaysDate1 in LastUpdatedDate or todaysDate2 in LastUpdatedDate:
-                            log_msg("Resume Document Upload Successful. Last Updated date = %s" % LastUpdatedDate)
-                        else:
-                            log_msg("Resume Document Upload completed. Last Updated date = %s" % LastUpdatedDate)
-                        success_found = True
-                        break
+                CheckPoint = found[1]
+                LastUpdatedDate = CheckPoint.text
+                log_msg(f"Success message found: {LastUpdatedDate}")
+                todaysDate1 = datetime.today().strftime("%b %d, %Y")
+                todaysDate2 = datetime.today().strftime("%b %#d, %Y")
+                if todaysDate1 in LastUpdatedDate or todaysDate2 in LastUpdatedDate:
+                    log_msg("Resume Document Upload Successful. Last Updated date = %s" % LastUpdatedDate)
+                else:
+                    log_msg("Resume Document Upload completed. Last Updated date = %s" % LastUpdatedDate)
+                success_found = True
             except:
                 pass
         
         if not success_found:
             log_msg("Resume upload process completed (verification pending)")
+        return file_uploaded and success_found
 
     except Exception as e:
         log_msg(f"Error in UploadResume: {e}")
         catch(e)
-    time.sleep(2)
+        return False
 
 
-def main():
-    """Main execution function"""
+@traced()
+def UploadResumeHTTP(driver, resumePath):
+    """Upload resume as a direct request; False means use the UI instead"""
+    from http_upload import get_http_uploader
+
+    uploader = get_http_uploader()
+    if not uploader.enabled:
+        return False
+    log_msg("Starting Resume Upload over HTTP...")
+    if uploader.upload(driver, os.path.abspath(resumePath)):
+        log_msg("Resume Document Upload Successful (HTTP)")
+        return True
+    log_msg("HTTP upload not confirmed, falling back to the profile page")
+    return False
+
+
+def prepareResume():
+    """Resume path to upload plus the seconds it took to prepare"""
+    started = time.perf_counter()
+    with log_step("prepare_resume"):
+        settings = get_run_settings()
+        resumePath = UpdateResume() if settings.update_pdf else settings.original_resume
+    return resumePath, time.perf_counter() - started
+
+
+def main(driver=None, tasks=None):
+    """Main execution function
+
+    Args:
+        driver: Optional ready Chrome (e.g. from the scheduler's browser
+            pool). The caller keeps ownership, so it is not torn down here.
+        tasks: Task names to run this session (see task_schedule). Defaults
+            to every task enabled in [Settings].
+
+    Returns:
+        (logged_in, results): results maps each task that was run to True
+        if it succeeded, so a failed task is retried next session
+    """
+    # Queued logging; a no-op when the scheduler or a worker set it up already
+    setup_logging()
+    settings = get_run_settings()
     log_msg("-----Naukri.py Script Run Begin-----")
-    driver = None
+    if tasks is None:
+        tasks = [task for task, enabled in (
+            (TASK_UPDATE_PROFILE, settings.update_profile),
+            (TASK_UPLOAD_RESUME, settings.upload_resume),
+        ) if enabled]
+    log_msg("Tasks this session: %s" % (", ".join(tasks) or "none"))
+    owns_driver = driver is None
+    status = False
+    results = {}
+    session_store = get_session_store()
+
+    # The PDF rewrite does not need the browser, so it runs on a worker
+    # thread while Chrome starts and logs in, and is joined before upload
+    prep = None
+    prepPool = None
+    if TASK_UPLOAD_RESUME in tasks and os.path.exists(settings.original_resume):
+        prepPool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="resume-prep")
+        # copy_context keeps the run id on the worker thread's log records
+        prep = prepPool.submit(contextvars.copy_context().run, prepareResume)
     try:
-        status, driver = naukriLogin(headless)
+        with log_step("login"):
+            status, driver = restoreSession(settings.headless, driver)
+            if not status:
+                status, driver = naukriLogin(settings.headless, driver)
         if status:
-            if update_profile:
-                UpdateProfile(driver)
+            if TASK_UPDATE_PROFILE in tasks:
+                with log_step(TASK_UPDATE_PROFILE):
+                    results[TASK_UPDATE_PROFILE] = bool(UpdateProfile(driver))
             
-            if upload_resume:
-                if os.path.exists(originalResumePath):
-                    if updatePDF:
-                        resumePath = UpdateResume()
-                        UploadResume(driver, resumePath)
+            if TASK_UPLOAD_RESUME in tasks:
+                with log_step(TASK_UPLOAD_RESUME):
+                    if prep is not None:
+                        waitStarted = time.perf_counter()
+                        resumePath, prepSeconds = prep.result()
+                        waited = time.perf_counter() - waitStarted
+                        log_msg("Resume prep took %.2fs, waited %.2fs for it, saved %.2fs by overlapping with login"
+                                % (prepSeconds, waited, max(0.0, prepSeconds - waited)))
+                        results[TASK_UPLOAD_RESUME] = bool(
+                            UploadResumeHTTP(driver, resumePath) or UploadResume(driver, resumePath))
                     else:
-                        UploadResume(driver, originalResumePath)
-                else:
-                    log_msg("Resume not found at %s " % originalResumePath)
+                        log_msg("Resume not found at %s " % settings.original_resume)
 
     except Exception as e:
         catch(e)
 
     finally:
-        if driver is not None:
-            try:
-                Logout(driver)
-                time.sleep(2)
-            except Exception as e:
-                log_msg("Error during logout: %s" % e)
-        tearDown(driver)
+        if prepPool is not None:
+            prepPool.shutdown(wait=True)
+        with log_step("logout"):
+            if driver is not None and session_store.enabled:
+                # Logging out would invalidate the saved session; refresh it instead
+                if status:
+                    session_store.save(driver, settings.username)
+            elif driver is not None:
+                try:
+                    Logout(driver)
+                except Exception as e:
+                    log_msg("Error during logout: %s" % e)
+            if owns_driver:
+                tearDown(driver)
 
+    failed = [task for task in tasks if not results.get(task)]
+    if status and failed:
+        log_msg("Tasks not completed: %s" % ", ".join(failed))
     log_msg("-----Naukri.py Script Run Ended-----\n")
+    return status, results
 
 
 if __name__ == "__main__":
-    main()
+    setup_logging()
+    runId = datetime.now().strftime("%Y%m%d-%H%M%S")
+    with run_context(runId, account=get_run_settings().username), profile_commands(runId):
+        main()
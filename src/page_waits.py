@@ -0,0 +1,245 @@
+"""
+Page Wait Engine
+Blocks on real page conditions (element visible, URL changed, network idle,
+DOM stable) instead of fixed sleeps, bounded by per-step deadlines
+"""
+
+import time
+
+from selenium.common.exceptions import (
+    JavascriptException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+
+from config_loader import get_config
+from run_trace import span
+
+
+# Installs a MutationObserver once per document and records the time of the
+# last DOM mutation, so dom_stable() can be answered with a single script call
+_DOM_OBSERVER_JS = """
+if (!window.__naukriDomObserver) {
+    window.__naukriLastMutation = performance.now();
+    window.__naukriDomObserver = new MutationObserver(function () {
+        window.__naukriLastMutation = performance.now();
+    });
+    window.__naukriDomObserver.observe(document, {
+        childList: true, subtree: true, attributes: true, characterData: true
+    });
+}
+return performance.now() - window.__naukriLastMutation;
+"""
+
+# Same idea for the network: a PerformanceObserver records when the last
+# resource finished. Counting getEntriesByType('resource') stops working once
+# the resource timing buffer is full (250 entries), while observers still
+# see every entry.
+_NETWORK_STATE_JS = """
+if (!window.__naukriResourceObserver) {
+    window.__naukriLastResource = performance.now();
+    window.__naukriResourceObserver = new PerformanceObserver(function (list) {
+        var entries = list.getEntries();
+        for (var i = 0; i < entries.length; i++) {
+            window.__naukriLastResource = Math.max(
+                window.__naukriLastResource, entries[i].responseEnd || entries[i].startTime);
+        }
+    });
+    window.__naukriResourceObserver.observe({type: 'resource'});
+}
+return [document.readyState, performance.now() - window.__naukriLastResource];
+"""
+
+_IGNORED_EXCEPTIONS = (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    JavascriptException,
+)
+
+
+class WaitSettings:
+    """Timeouts for the wait engine, read from the [Waits] config section"""
+
+    def __init__(self, config=None):
+        self.load(config or get_config())
+
+    def load(self, config, changed=None):
+        """Read [Waits]; also subscribed to config reloads"""
+        section = 'Waits'
+        self.poll_interval = config.get(section, 'POLL_INTERVAL', 0.2, var_type=float)
+        self.element_timeout = config.get(section, 'ELEMENT_TIMEOUT', 10, var_type=float)
+        self.page_load_timeout = config.get(section, 'PAGE_LOAD_TIMEOUT', 20, var_type=float)
+        self.settle_timeout = config.get(section, 'SETTLE_TIMEOUT', 5, var_type=float)
+        self.network_idle_ms = config.get(section, 'NETWORK_IDLE_MS', 500, var_type=int)
+        self.dom_quiet_ms = config.get(section, 'DOM_QUIET_MS', 400, var_type=int)
+        self.step_deadlines = {
+            'login': config.get(section, 'LOGIN_DEADLINE', 90, var_type=float),
+            'profile': config.get(section, 'PROFILE_DEADLINE', 90, var_type=float),
+            'upload': config.get(section, 'UPLOAD_DEADLINE', 90, var_type=float),
+            'logout': config.get(section, 'LOGOUT_DEADLINE', 30, var_type=float),
+        }
+
+
+_settings = None
+
+
+def get_wait_settings():
+    """Get or create the wait settings"""
+    global _settings
+    if _settings is None:
+        config = get_config()
+        _settings = WaitSettings(config)
+        config.subscribe(_settings.load)
+    return _settings
+
+
+class Deadline:
+    """Time budget shared by every wait inside one automation step"""
+
+    def __init__(self, step, seconds=None):
+        if seconds is None:
+            seconds = get_wait_settings().step_deadlines.get(step, 60)
+        self.step = step
+        self.seconds = seconds
+        self.started = time.monotonic()
+
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    def remaining(self):
+        return max(0.0, self.seconds - self.elapsed())
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def clamp(self, timeout):
+        """Shrink a wait timeout so it never outlives the step deadline"""
+        return min(timeout, self.remaining())
+
+
+# ---------------------------------------------------------------------------
+# Conditions - callables taking the driver, returning a truthy value when met
+# ---------------------------------------------------------------------------
+
+def document_ready():
+    """document.readyState is 'complete'"""
+    def _condition(driver):
+        return driver.execute_script("return document.readyState") == "complete"
+    return _condition
+
+
+def element_present(by, locator):
+    """First element matching the locator is attached to the DOM"""
+    def _condition(driver):
+        elements = driver.find_elements(by, locator)
+        return elements[0] if elements else False
+    return _condition
+
+
+def element_visible(by, locator):
+    """First displayed element matching the locator"""
+    def _condition(driver):
+        for element in driver.find_elements(by, locator):
+            if element.is_displayed():
+                return element
+        return False
+    return _condition
+
+
+def url_changed(old_url):
+    """Current URL differs from old_url"""
+    def _condition(driver):
+        return driver.current_url != old_url
+    return _condition
+
+
+def url_contains(fragment):
+    """Current URL contains fragment"""
+    def _condition(driver):
+        return fragment in driver.current_url
+    return _condition
+
+
+def network_idle(idle_ms=None):
+    """Document loaded and no resource finished loading for idle_ms"""
+    idle_ms = idle_ms if idle_ms is not None else get_wait_settings().network_idle_ms
+
+    def _condition(driver):
+        ready, quiet_ms = driver.execute_script(_NETWORK_STATE_JS)
+        return ready == "complete" and quiet_ms >= idle_ms
+    return _condition
+
+
+def dom_stable(quiet_ms=None):
+    """No DOM mutation for quiet_ms"""
+    quiet_ms = quiet_ms if quiet_ms is not None else get_wait_settings().dom_quiet_ms
+
+    def _condition(driver):
+        return driver.execute_script(_DOM_OBSERVER_JS) >= quiet_ms
+    return _condition
+
+
+def any_of(*conditions):
+    """First condition that is met, returned as (index, value)"""
+    def _condition(driver):
+        for index, condition in enumerate(conditions):
+            try:
+                value = condition(driver)
+            except _IGNORED_EXCEPTIONS:
+                continue
+            if value:
+                return (index, value)
+        return False
+    return _condition
+
+
+# ---------------------------------------------------------------------------
+# Waiting
+# ---------------------------------------------------------------------------
+
+def wait_for(driver, condition, timeout=None, deadline=None, poll=None):
+    """
+    Poll condition(driver) until it returns a truthy value
+
+    Returns the condition's value, or None when the timeout (clamped to the
+    step deadline) runs out first. Expects the driver's implicit wait to be
+    0 (LoadNaukri sets it once), so missing elements fail fast while polling.
+    """
+    settings = get_wait_settings()
+    if timeout is None:
+        timeout = settings.element_timeout
+    if deadline is not None:
+        timeout = deadline.clamp(timeout)
+    if poll is None:
+        poll = settings.poll_interval
+
+    # selenium.webdriver is heavy to import; only pay for it once waiting
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    # Conditions are closures, e.g. element_present.<locals>._condition
+    kind = getattr(condition, '__qualname__', 'condition').split('.')[0]
+    with span(f"wait:{kind}", timeout=round(timeout, 3)):
+        try:
+            return WebDriverWait(
+                driver, timeout, poll_frequency=poll,
+                ignored_exceptions=_IGNORED_EXCEPTIONS
+            ).until(condition)
+        except TimeoutException:
+            return None
+
+
+def wait_page_ready(driver, deadline=None):
+    """Wait for the document to load and the network to go quiet"""
+    settings = get_wait_settings()
+    if not wait_for(driver, document_ready(), settings.page_load_timeout, deadline):
+        return False
+    return bool(wait_for(driver, network_idle(), settings.settle_timeout, deadline))
+
+
+def wait_settled(driver, deadline=None, timeout=None):
+    """Wait for the DOM to stop changing after an interaction"""
+    settings = get_wait_settings()
+    if timeout is None:
+        timeout = settings.settle_timeout
+    return bool(wait_for(driver, dom_stable(), timeout, deadline))
@@ -0,0 +1,146 @@
+"""
+Incremental PDF Update
+Appends a small incremental-update section (new trailer /ID plus its
+cross-reference section) to the original PDF bytes. Nothing in the
+document is parsed or re-serialized beyond the final trailer, so the cost
+stays constant for large, image-heavy resumes while every run still
+produces a file with a new hash.
+"""
+
+import os
+import re
+import shutil
+import struct
+
+TAIL_BYTES = 2048
+CHUNK_BYTES = 4096
+
+_STARTXREF_RE = re.compile(rb'startxref\s+(\d+)\s+%%EOF', re.S)
+_REF_RE = rb'/%s\s+(\d+\s+\d+\s+R)'
+_SIZE_RE = re.compile(rb'/Size\s+(\d+)')
+_ID_RE = re.compile(rb'/ID\s*\[\s*<([0-9A-Fa-f]*)>\s*<([0-9A-Fa-f]*)>\s*\]')
+_SUBSECTION_RE = re.compile(rb'\s*(\d+)\s+(\d+)\s*?\r?\n')
+
+
+class IncrementalUpdateError(Exception):
+    """The PDF's trailer could not be located or understood"""
+
+
+def _find_ref(key, data):
+    match = re.search(_REF_RE % key, data)
+    return match.group(1).decode('ascii') if match else None
+
+
+def _read_trailer(f):
+    """
+    Locate the last cross-reference section and read its trailer keys
+
+    Returns (startxref, is_xref_stream, trailer_dict_bytes).
+    """
+    f.seek(0, os.SEEK_END)
+    size = f.tell()
+    f.seek(max(0, size - TAIL_BYTES))
+    tail = f.read()
+    matches = list(_STARTXREF_RE.finditer(tail))
+    if not matches:
+        raise IncrementalUpdateError("startxref not found")
+    startxref = int(matches[-1].group(1))
+    if startxref >= size:
+        raise IncrementalUpdateError("startxref points past the end of the file")
+
+    f.seek(startxref)
+    head = f.read(CHUNK_BYTES)
+    if head.startswith(b'xref'):
+        # Classic table: skip the fixed-width 20-byte entries of every
+        # subsection without parsing them, then read the trailer
+        position = startxref + 4
+        while True:
+            f.seek(position)
+            line = f.read(64)
+            match = _SUBSECTION_RE.match(line)
+            if not match:
+                break
+            position += match.end() + 20 * int(match.group(2))
+        f.seek(position)
+        chunk = f.read(CHUNK_BYTES)
+        start = chunk.find(b'trailer')
+        end = chunk.find(b'startxref', start)
+        if start < 0 or end < 0:
+            raise IncrementalUpdateError("trailer dictionary not found")
+        return startxref, False, chunk[start:end]
+
+    if re.match(rb'\d+\s+\d+\s+obj', head) and b'/XRef' in head:
+        end = head.find(b'stream')
+        if end < 0:
+            raise IncrementalUpdateError("cross-reference stream dictionary not found")
+        return startxref, True, head[:end]
+
+    raise IncrementalUpdateError("unrecognised cross-reference section")
+
+
+def _build_update(base_offset, startxref, is_xref_stream, trailer):
+    """Build the bytes of the incremental-update section"""
+    root = _find_ref(b'Root', trailer)
+    if root is None:
+        raise IncrementalUpdateError("trailer has no /Root")
+    size_match = _SIZE_RE.search(trailer)
+    if size_match is None:
+        raise IncrementalUpdateError("trailer has no /Size")
+    size = int(size_match.group(1))
+
+    # Keep the first (permanent) ID so encrypted files still open;
+    # only the second (changing) ID is new
+    new_id = os.urandom(16).hex().upper()
+    id_match = _ID_RE.search(trailer)
+    first_id = id_match.group(1).decode('ascii') if id_match and id_match.group(1) else new_id
+
+    entries = [f"/Root {root}"]
+    for key in (b'Info', b'Encrypt'):
+        ref = _find_ref(key, trailer)
+        if ref:
+            entries.append(f"/{key.decode()} {ref}")
+    entries.append(f"/Prev {startxref}")
+    entries.append(f"/ID [<{first_id}> <{new_id}>]")
+
+    if not is_xref_stream:
+        xref_offset = base_offset + 1
+        section = (
+            "\nxref\n0 1\n0000000000 65535 f \n"
+            f"trailer\n<< /Size {size} {' '.join(entries)} >>\n"
+            f"startxref\n{xref_offset}\n%%EOF\n"
+        )
+        return section.encode('ascii')
+
+    # A file whose last section is a cross-reference stream gets a stream
+    # too; its only entry is the stream object itself
+    obj_number = size
+    obj_offset = base_offset + 1
+    data = struct.pack('>BIH', 1, obj_offset, 0)
+    header = (
+        f"\n{obj_number} 0 obj\n"
+        f"<< /Type /XRef /Size {obj_number + 1} /Index [{obj_number} 1] /W [1 4 2] "
+        f"{' '.join(entries)} /Length {len(data)} >>\nstream\n"
+    ).encode('ascii')
+    footer = f"\nendstream\nendobj\nstartxref\n{obj_offset}\n%%EOF\n".encode('ascii')
+    return header + data + footer
+
+
+def append_incremental_update(source_path, dest_path):
+    """
+    Write dest_path as source_path plus a fresh incremental update
+
+    Raises IncrementalUpdateError when the file layout is not supported;
+    callers should then fall back to a full rewrite.
+    """
+    with open(source_path, 'rb') as f:
+        startxref, is_xref_stream, trailer = _read_trailer(f)
+        base_offset = f.seek(0, os.SEEK_END)
+
+    update = _build_update(base_offset, startxref, is_xref_stream, trailer)
+
+    tmp_path = f"{dest_path}.{os.getpid()}.tmp"
+    shutil.copyfile(source_path, tmp_path)
+    with open(tmp_path, 'ab') as f:
+        f.write(update)
+    os.replace(tmp_path, dest_path)
+    return len(update)
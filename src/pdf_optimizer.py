@@ -0,0 +1,165 @@
+"""
+PDF Upload-Size Optimizer
+Builds the smallest equivalent copy of the resume (compressed content
+streams, deduplicated objects, optionally downsampled images) once per
+source hash, so every variant is derived from a small base
+"""
+
+import hashlib
+import io
+import logging
+import os
+from pathlib import Path
+
+from pypdf import PdfReader, PdfWriter
+
+from config_loader import get_config
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is only needed for image downsampling
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+# JPEG quality is never taken below this, whatever IMAGE_QUALITY says
+MIN_IMAGE_QUALITY = 60
+
+# Optimized bases kept for older resume versions (or other accounts)
+MAX_CACHED_BASES = 8
+
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class PdfOptimizer:
+    """Lossless (and optionally lossy image) size reduction, cached on disk"""
+
+    def __init__(self, config=None, cache_dir=None):
+        config = config or get_config()
+        if cache_dir is None:
+            cache_dir = Path(__file__).parent.parent / config.get(
+                'Optimize', 'CACHE_DIR', 'logs/optimized_resume')
+
+        self.cache_dir = Path(cache_dir)
+        self.load(config)
+
+    def load(self, config, changed=None):
+        """Read [Optimize] (CACHE_DIR needs a restart); also subscribed to config reloads"""
+        self.enabled = config.get('Optimize', 'ENABLED', False, var_type=bool)
+        self.downsample_images = config.get('Optimize', 'DOWNSAMPLE_IMAGES', False, var_type=bool)
+        self.max_image_side = config.get('Optimize', 'MAX_IMAGE_SIDE', 2000, var_type=int)
+        self.image_quality = max(
+            MIN_IMAGE_QUALITY, config.get('Optimize', 'IMAGE_QUALITY', 85, var_type=int)
+        )
+
+    def _downsample(self, writer):
+        """Re-encode oversized images as JPEG at image_quality"""
+        if Image is None:
+            logger.warning("Pillow is not installed, skipping image downsampling")
+            return
+        for page in writer.pages:
+            for image in page.images:
+                picture = image.image
+                if picture is None or picture.mode not in ('RGB', 'L'):
+                    continue  # keep transparency and unusual colour spaces intact
+                if max(picture.size) > self.max_image_side:
+                    picture = picture.copy()
+                    picture.thumbnail((self.max_image_side, self.max_image_side))
+                image.replace(picture, quality=self.image_quality)
+
+    def _build(self, source_path, downsample):
+        """Optimized bytes of source_path"""
+        writer = PdfWriter(clone_from=PdfReader(source_path))
+        for page in writer.pages:
+            page.compress_content_streams()
+        if downsample:
+            self._downsample(writer)
+        writer.compress_identical_objects(remove_identicals=True, remove_orphans=True)
+
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        return buffer.getvalue()
+
+    def optimize(self, source_path, dest_path):
+        """
+        Write an optimized copy of source_path to dest_path
+
+        Returns the number of bytes saved; the copy is only written when it
+        is actually smaller than the source.
+        """
+        data = self._build(source_path, downsample=False)
+        if self.downsample_images:
+            # Re-encoding can grow already well-compressed images
+            lossy = self._build(source_path, downsample=True)
+            if len(lossy) < len(data):
+                data = lossy
+        saved = os.path.getsize(source_path) - len(data)
+        if saved <= 0:
+            return 0
+
+        tmp_path = f"{dest_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, dest_path)
+        return saved
+
+    def _evict(self):
+        """Drop the least recently built bases beyond MAX_CACHED_BASES"""
+        entries = [p for p in self.cache_dir.iterdir() if p.suffix in ('.pdf', '.skip')]
+        entries.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+        for stale in entries[MAX_CACHED_BASES - 1:]:
+            stale.unlink(missing_ok=True)
+
+    def optimized_base(self, source_path):
+        """
+        Path of the cached optimized copy of source_path
+
+        Falls back to source_path when optimization is off, fails, or does
+        not make the file smaller.
+        """
+        if not self.enabled:
+            return source_path
+        try:
+            key = _file_hash(source_path)
+            base_path = self.cache_dir / f"{key}.pdf"
+            skip_marker = self.cache_dir / f"{key}.skip"
+            if base_path.exists():
+                return str(base_path)
+            if skip_marker.exists():
+                return source_path
+
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._evict()
+            original_size = os.path.getsize(source_path)
+            saved = self.optimize(source_path, str(base_path))
+            if saved <= 0:
+                skip_marker.touch()
+                logger.info("Resume PDF is already compact, uploading it as is")
+                return source_path
+            logger.info(
+                f"Optimized resume PDF: {original_size} -> {original_size - saved} bytes "
+                f"({saved} bytes, {saved * 100 / original_size:.1f}% saved)"
+            )
+            return str(base_path)
+        except Exception as e:
+            logger.warning(f"Could not optimize resume PDF, using the original: {e}")
+            return source_path
+
+
+_optimizer = None
+
+
+def get_pdf_optimizer():
+    """Get or create the PDF optimizer"""
+    global _optimizer
+    if _optimizer is None:
+        config = get_config()
+        _optimizer = PdfOptimizer(config)
+        config.subscribe(_optimizer.load)
+    return _optimizer
@@ -0,0 +1,173 @@
+"""
+Resume Variant Pool
+Pre-generates modified resume PDFs in the background, keyed by the SHA-256
+of the original, so a logged-in session only has to take a ready file
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from config_loader import get_config
+
+logger = logging.getLogger(__name__)
+
+
+class ResumeVariantPool:
+    """
+    On-disk pool of ready-made resume variants
+
+    Layout: <CACHE_DIR>/<sha256 of original>/<variant>.pdf. A directory whose
+    hash no longer matches any known original is dropped, so editing the
+    resume invalidates its variants automatically.
+    """
+
+    def __init__(self, builder, config=None, cache_dir=None):
+        """
+        Args:
+            builder: Callable(source_path, dest_path) writing one variant
+        """
+        config = config or get_config()
+        if cache_dir is None:
+            cache_dir = Path(__file__).parent.parent / config.get(
+                'ResumePool', 'CACHE_DIR', 'logs/resume_variants')
+
+        self.builder = builder
+        self.enabled = config.get('ResumePool', 'ENABLED', False, var_type=bool)
+        self.cache_dir = Path(cache_dir)
+        self.pool_size = config.get('ResumePool', 'POOL_SIZE', 3, var_type=int)
+        self.max_bytes = config.get('ResumePool', 'MAX_BYTES', 50 * 1024 * 1024, var_type=int)
+        self._hashes = {}
+        self._lock = threading.Lock()
+        self._filling = None
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    def source_hash(self, source_path):
+        """SHA-256 of the original, cached until its size or mtime changes"""
+        stat = os.stat(source_path)
+        signature = (os.path.abspath(source_path), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            cached = self._hashes.get(signature[0])
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        digest = hashlib.sha256()
+        with open(source_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        value = digest.hexdigest()
+        with self._lock:
+            self._hashes[signature[0]] = (signature, value)
+        return value
+
+    def _variants(self, key):
+        folder = self.cache_dir / key
+        if not folder.is_dir():
+            return []
+        return sorted(folder.glob('*.pdf'), key=lambda p: p.name)
+
+    # ------------------------------------------------------------------
+    # Filling and eviction
+    # ------------------------------------------------------------------
+
+    def fill(self, sources):
+        """Top up the pool for every source path, then evict"""
+        keys = set()
+        for source in sources:
+            if not os.path.exists(source):
+                continue
+            key = self.source_hash(source)
+            keys.add(key)
+            folder = self.cache_dir / key
+            folder.mkdir(parents=True, exist_ok=True)
+
+            missing = self.pool_size - len(self._variants(key))
+            for _ in range(max(0, missing)):
+                name = f"{time.time_ns()}_{uuid.uuid4().hex[:8]}"
+                tmp_path = folder / f"{name}.tmp"
+                try:
+                    self.builder(source, str(tmp_path))
+                    os.replace(tmp_path, folder / f"{name}.pdf")
+                except Exception as e:
+                    logger.warning(f"Could not pre-generate resume variant: {e}")
+                    tmp_path.unlink(missing_ok=True)
+                    break
+        self.evict(keys)
+
+    def fill_async(self, sources):
+        """Fill the pool on a background thread (e.g. while the scheduler sleeps)"""
+        if not self.enabled:
+            return
+        if self._filling is not None and self._filling.is_alive():
+            return
+        self._filling = threading.Thread(
+            target=self.fill, args=(list(sources),), name="resume-pool", daemon=True
+        )
+        self._filling.start()
+
+    def evict(self, keep_keys):
+        """Drop stale originals, then the oldest variants beyond count/size limits"""
+        if not self.cache_dir.is_dir():
+            return
+        for folder in self.cache_dir.iterdir():
+            if folder.is_dir() and folder.name not in keep_keys:
+                shutil.rmtree(folder, ignore_errors=True)
+
+        variants = []
+        for key in keep_keys:
+            pooled = self._variants(key)
+            for stale in pooled[:-self.pool_size] if self.pool_size > 0 else pooled:
+                stale.unlink(missing_ok=True)
+            variants.extend(pooled[-self.pool_size:] if self.pool_size > 0 else [])
+
+        variants = [p for p in variants if p.exists()]
+        variants.sort(key=lambda p: p.name, reverse=True)
+        total = 0
+        for variant in variants:
+            total += variant.stat().st_size
+            if total > self.max_bytes:
+                variant.unlink(missing_ok=True)
+
+    # ------------------------------------------------------------------
+    # Taking
+    # ------------------------------------------------------------------
+
+    def take(self, source_path, dest_path):
+        """
+        Move a ready variant of source_path to dest_path
+
+        Returns dest_path, or None when no variant is ready. Safe across
+        processes: a variant another worker took first is simply skipped.
+        """
+        if not self.enabled or not os.path.exists(source_path):
+            return None
+        for variant in self._variants(self.source_hash(source_path)):
+            # Claim it with an atomic rename inside the cache first; the move
+            # to dest_path may have to copy across file systems
+            claimed = variant.with_suffix(f".{os.getpid()}.taken")
+            try:
+                os.replace(variant, claimed)
+            except FileNotFoundError:
+                continue
+            shutil.move(str(claimed), dest_path)
+            return dest_path
+        return None
+
+
+_pool = None
+
+
+def get_resume_pool(builder):
+    """Get or create the resume variant pool"""
+    global _pool
+    if _pool is None:
+        _pool = ResumeVariantPool(builder)
+    return _pool
@@ -0,0 +1,95 @@
+"""
+Run History Compaction
+Folds runs older than the raw-retention window into daily rollups, and
+daily rollups older than the daily window into weekly ones, so the run log
+and everything loaded from it stay bounded on long-lived deployments
+"""
+
+import logging
+from datetime import date, datetime, timedelta
+
+from config_loader import get_config
+from run_index import ALL_ACCOUNTS, add_to_rollup, merge_rollup, new_rollup
+
+logger = logging.getLogger(__name__)
+
+
+def _week_start(day):
+    """Monday of the week containing day"""
+    return day - timedelta(days=day.weekday())
+
+
+class HistoryCompactor:
+    """Retention and compaction for a RunStore, run from the scheduler"""
+
+    def __init__(self, store, config=None):
+        config = config or get_config()
+        self.store = store
+        self.raw_days = config.get('History', 'RAW_RETENTION_DAYS', 90, var_type=int)
+        self.daily_days = config.get('History', 'DAILY_RETENTION_DAYS', 365, var_type=int)
+
+    @staticmethod
+    def _fold(rollups, run):
+        """Add one run to the daily rollups (whole run and each account)"""
+        timestamp = run.get("timestamp") or ''
+        day = rollups["daily"].setdefault(timestamp[:10], {})
+        duration = run.get("duration_seconds")
+        add_to_rollup(day.setdefault(ALL_ACCOUNTS, new_rollup()),
+                      run.get("success"), duration, run.get("error"))
+
+        totals = rollups["totals"]
+        totals["total_runs"] += 1
+        totals["successful_runs" if run.get("success") else "failed_runs"] += 1
+
+        for result in run.get("accounts") or []:
+            add_to_rollup(day.setdefault(result["account"], new_rollup()),
+                          result.get("success"), result.get("duration_seconds", duration),
+                          result.get("error"))
+            stats = totals["accounts"].setdefault(result["account"], {
+                "total_runs": 0,
+                "successful_runs": 0,
+                "failed_runs": 0,
+            })
+            stats["total_runs"] += 1
+            stats["successful_runs" if result.get("success") else "failed_runs"] += 1
+
+    def _fold_weeks(self, rollups, today):
+        """Merge daily rollups older than the daily window into weekly ones"""
+        # Aligned to a Monday so a week is never split between the two
+        cutoff = _week_start(today - timedelta(days=self.daily_days)).isoformat()
+        old_days = [day for day in rollups["daily"] if day < cutoff]
+        for day in old_days:
+            week = _week_start(date.fromisoformat(day)).isoformat()
+            weekly = rollups["weekly"].setdefault(week, {})
+            for account, rollup in rollups["daily"].pop(day).items():
+                merge_rollup(weekly.setdefault(account, new_rollup()), rollup)
+        return len(old_days)
+
+    def compact(self, today=None):
+        """
+        One compaction pass
+
+        Cheap when there is nothing to do: the log is only rewritten when it
+        holds runs older than the raw window, which with a daily schedule is
+        about one day's worth of runs each time.
+
+        Returns:
+            (runs folded out of the log, days folded into weeks)
+        """
+        today = today or datetime.now().date()
+        cutoff = (today - timedelta(days=self.raw_days)).isoformat()
+
+        oldest = next(iter(self.store.iter_runs()), None)
+        removed = 0
+        if oldest is not None and (oldest.get("timestamp") or '') < cutoff:
+            removed = self.store.compact(cutoff, self._fold)
+
+        rollups = self.store.load_rollups()
+        weeks = self._fold_weeks(rollups, today)
+        if weeks:
+            self.store.save_rollups(rollups)
+
+        if removed or weeks:
+            logger.info(f"Compacted run history: {removed} run(s) folded into daily rollups, "
+                        f"{weeks} day(s) folded into weekly rollups")
+        return removed, weeks
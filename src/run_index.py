@@ -0,0 +1,414 @@
+"""
+Run History Index
+SQLite index over the append-only run log (see run_store) for time-range,
+last-N, status and account queries, plus daily rollups with duration
+histograms so aggregates never rescan the history
+"""
+
+import json
+import logging
+import math
+import re
+import sqlite3
+from pathlib import Path
+
+from config_loader import get_config
+
+logger = logging.getLogger(__name__)
+
+# Duration histogram buckets grow by 5%, so percentiles are within ~2.5%
+BUCKET_GROWTH = 1.05
+MIN_DURATION = 0.01
+
+# Rollup rows for the whole scheduler use this account name
+ALL_ACCOUNTS = ''
+
+MAX_REASON_LENGTH = 120
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value);
+CREATE TABLE IF NOT EXISTS runs (
+    offset INTEGER PRIMARY KEY,
+    run_number INTEGER,
+    timestamp TEXT,
+    success INTEGER,
+    duration REAL
+);
+CREATE INDEX IF NOT EXISTS runs_timestamp ON runs (timestamp);
+CREATE INDEX IF NOT EXISTS runs_status ON runs (success, timestamp);
+CREATE TABLE IF NOT EXISTS run_accounts (
+    offset INTEGER,
+    account TEXT,
+    success INTEGER,
+    timestamp TEXT
+);
+CREATE INDEX IF NOT EXISTS run_accounts_account ON run_accounts (account, timestamp);
+CREATE TABLE IF NOT EXISTS rollups (
+    day TEXT,
+    account TEXT,
+    runs INTEGER,
+    successes INTEGER,
+    duration_sum REAL,
+    duration_min REAL,
+    duration_max REAL,
+    PRIMARY KEY (day, account)
+);
+CREATE TABLE IF NOT EXISTS rollup_buckets (
+    day TEXT,
+    account TEXT,
+    bucket INTEGER,
+    runs INTEGER,
+    PRIMARY KEY (day, account, bucket)
+);
+CREATE TABLE IF NOT EXISTS failure_reasons (
+    day TEXT,
+    account TEXT,
+    reason TEXT,
+    runs INTEGER,
+    PRIMARY KEY (day, account, reason)
+);
+"""
+
+_TABLES = ("runs", "run_accounts", "rollups", "rollup_buckets", "failure_reasons")
+
+
+def duration_bucket(duration):
+    """Histogram bucket of a run duration in seconds"""
+    return math.floor(math.log(max(duration or 0.0, MIN_DURATION), BUCKET_GROWTH))
+
+
+def failure_reason(error):
+    """Group errors by their first line with numbers masked"""
+    if not error:
+        return "unknown"
+    first_line = str(error).strip().splitlines()[0] if str(error).strip() else "unknown"
+    return re.sub(r'\d+', '#', first_line)[:MAX_REASON_LENGTH]
+
+
+def new_rollup():
+    """Empty rollup: counters, duration histogram and failure reasons"""
+    return {
+        "runs": 0,
+        "successes": 0,
+        "duration_sum": 0.0,
+        "duration_min": None,
+        "duration_max": None,
+        "histogram": {},
+        "failures": {},
+    }
+
+
+def add_to_rollup(rollup, success, duration, error=None):
+    """Count one run in a rollup dict"""
+    duration = duration or 0.0
+    rollup["runs"] += 1
+    rollup["duration_sum"] += duration
+    rollup["duration_min"] = duration if rollup["duration_min"] is None \
+        else min(rollup["duration_min"], duration)
+    rollup["duration_max"] = duration if rollup["duration_max"] is None \
+        else max(rollup["duration_max"], duration)
+    bucket = str(duration_bucket(duration))
+    rollup["histogram"][bucket] = rollup["histogram"].get(bucket, 0) + 1
+    if success:
+        rollup["successes"] += 1
+    else:
+        reason = failure_reason(error)
+        rollup["failures"][reason] = rollup["failures"].get(reason, 0) + 1
+
+
+def merge_rollup(into, other):
+    """Add the counts of rollup other to rollup into"""
+    into["runs"] += other["runs"]
+    into["successes"] += other["successes"]
+    into["duration_sum"] += other["duration_sum"]
+    for key, pick in (("duration_min", min), ("duration_max", max)):
+        if other[key] is not None:
+            into[key] = other[key] if into[key] is None else pick(into[key], other[key])
+    for key in ("histogram", "failures"):
+        for name, runs in other[key].items():
+            into[key][name] = into[key].get(name, 0) + runs
+
+
+def _bucket_value(bucket):
+    """Representative duration of a bucket (its geometric midpoint)"""
+    return BUCKET_GROWTH ** (bucket + 0.5)
+
+
+class RunIndex:
+    """
+    Query layer over a RunStore's log
+
+    sync() indexes only the lines appended since the last sync, so opening
+    the index stays fast however long the history is. With read_only the
+    database file is copied into memory and synced there, never written.
+    """
+
+    def __init__(self, store, db_path=None, config=None, read_only=False):
+        config = config or get_config()
+        if db_path is None:
+            db_path = Path(__file__).parent.parent / config.get(
+                'Scheduling', 'RUN_INDEX', 'logs/run_index.db')
+
+        self.store = store
+        self.db_path = Path(db_path)
+        if read_only:
+            self.db = sqlite3.connect(':memory:')
+            if self.db_path.exists():
+                source = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True)
+                try:
+                    source.backup(self.db)
+                except sqlite3.Error as e:
+                    logger.warning(f"Could not read {self.db_path.name}, indexing from scratch: {e}")
+                finally:
+                    source.close()
+        else:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self.db = sqlite3.connect(str(self.db_path))
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(_SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    # ------------------------------------------------------------------
+    # Indexing
+    # ------------------------------------------------------------------
+
+    def sync(self):
+        """Index runs appended to the log since the last sync; returns how many"""
+        log_path = self.store.log_path
+        log_size = log_path.stat().st_size if log_path.exists() else 0
+        generation = self.store.summary.get("log_generation", 0)
+
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            offset = self._meta('log_size', 0)
+            if offset > log_size or self._meta('log_generation', 0) != generation:
+                # Compaction rewrote the log (or it was replaced): start over
+                # from the compacted rollups
+                for table in _TABLES:
+                    self.db.execute(f"DELETE FROM {table}")
+                self._load_compacted()
+                offset = 0
+            self._set_meta('log_generation', generation)
+            if offset == log_size:
+                return 0
+
+            added = 0
+            with open(log_path, 'rb') as f:
+                f.seek(offset)
+                while True:
+                    line = f.readline()
+                    if not line.endswith(b'\n'):
+                        break  # end of file, or a record still being written
+                    try:
+                        run = json.loads(line)
+                    except ValueError:
+                        offset += len(line)
+                        continue
+                    self._add(offset, run)
+                    offset += len(line)
+                    added += 1
+
+            self._set_meta('log_size', offset)
+        if added:
+            logger.debug(f"Indexed {added} new run(s)")
+        return added
+
+    def _meta(self, key, default):
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, key, value):
+        self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def _load_compacted(self):
+        """Load the daily and weekly rollups of runs no longer in the log"""
+        rollups = self.store.load_rollups()
+        for period in ("weekly", "daily"):
+            for start, accounts in rollups[period].items():
+                for account, rollup in accounts.items():
+                    self._merge(start, account, rollup)
+
+    def _add(self, offset, run):
+        timestamp = run.get("timestamp") or ''
+        success = 1 if run.get("success") else 0
+        duration = run.get("duration_seconds") or 0.0
+        self.db.execute(
+            "INSERT OR REPLACE INTO runs (offset, run_number, timestamp, success, duration) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (offset, run.get("run_number"), timestamp, success, duration)
+        )
+        day = timestamp[:10]
+        rollup = new_rollup()
+        add_to_rollup(rollup, success, duration, run.get("error"))
+        self._merge(day, ALL_ACCOUNTS, rollup)
+
+        for result in run.get("accounts") or []:
+            account_success = 1 if result.get("success") else 0
+            self.db.execute(
+                "INSERT INTO run_accounts (offset, account, success, timestamp) VALUES (?, ?, ?, ?)",
+                (offset, result["account"], account_success, timestamp)
+            )
+            rollup = new_rollup()
+            add_to_rollup(rollup, account_success, result.get("duration_seconds", duration),
+                          result.get("error"))
+            self._merge(day, result["account"], rollup)
+
+    def _merge(self, day, account, rollup):
+        """Add a rollup dict to the (day, account) rows"""
+        self.db.execute(
+            "INSERT INTO rollups (day, account, runs, successes, duration_sum, "
+            "duration_min, duration_max) VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (day, account) DO UPDATE SET runs = runs + excluded.runs, "
+            "successes = successes + excluded.successes, "
+            "duration_sum = duration_sum + excluded.duration_sum, "
+            "duration_min = MIN(duration_min, excluded.duration_min), "
+            "duration_max = MAX(duration_max, excluded.duration_max)",
+            (day, account, rollup["runs"], rollup["successes"], rollup["duration_sum"],
+             rollup["duration_min"], rollup["duration_max"])
+        )
+        self.db.executemany(
+            "INSERT INTO rollup_buckets (day, account, bucket, runs) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (day, account, bucket) DO UPDATE SET runs = runs + excluded.runs",
+            [(day, account, int(bucket), runs) for bucket, runs in rollup["histogram"].items()]
+        )
+        self.db.executemany(
+            "INSERT INTO failure_reasons (day, account, reason, runs) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (day, account, reason) DO UPDATE SET runs = runs + excluded.runs",
+            [(day, account, reason, runs) for reason, runs in rollup["failures"].items()]
+        )
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _read_runs(self, offsets):
+        """Full run records for the given log offsets, in that order"""
+        runs = []
+        with open(self.store.log_path, 'rb') as f:
+            for offset in offsets:
+                f.seek(offset)
+                runs.append(json.loads(f.readline()))
+        return runs
+
+    def query(self, since=None, until=None, success=None, account=None,
+              limit=None, newest_first=False):
+        """
+        Runs filtered by time range, status and account
+
+        Args:
+            since, until: ISO timestamps (or dates); since is inclusive,
+                until exclusive
+            success: True/False to filter by status, None for both
+            account: Only runs that included this account
+        """
+        # run_accounts carries the account's own status and the run's timestamp
+        if account is not None:
+            sql = "SELECT offset FROM run_accounts WHERE account = ?"
+            params = [account]
+        else:
+            sql = "SELECT offset FROM runs WHERE 1 = 1"
+            params = []
+        if since is not None:
+            sql += " AND timestamp >= ?"
+            params.append(since)
+        if until is not None:
+            sql += " AND timestamp < ?"
+            params.append(until)
+        if success is not None:
+            sql += " AND success = ?"
+            params.append(1 if success else 0)
+        sql += " ORDER BY timestamp DESC, offset DESC" if newest_first else " ORDER BY timestamp, offset"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        offsets = [row[0] for row in self.db.execute(sql, params)]
+        return self._read_runs(offsets)
+
+    def last(self, count=10, success=None, account=None):
+        """The last count matching runs, oldest first"""
+        runs = self.query(success=success, account=account, limit=count, newest_first=True)
+        runs.reverse()
+        return runs
+
+    @staticmethod
+    def _day_filter(since_day, until_day, account):
+        where = "account = ?"
+        params = [ALL_ACCOUNTS if account is None else account]
+        if since_day is not None:
+            where += " AND day >= ?"
+            params.append(since_day)
+        if until_day is not None:
+            where += " AND day <= ?"
+            params.append(until_day)
+        return where, params
+
+    def failure_reasons(self, since_day=None, until_day=None, account=None, limit=5):
+        """Most common failure reasons as [(reason, runs)]"""
+        where, params = self._day_filter(since_day, until_day, account)
+        return [tuple(row) for row in self.db.execute(
+            f"SELECT reason, SUM(runs) AS total FROM failure_reasons WHERE {where} "
+            f"GROUP BY reason ORDER BY total DESC LIMIT ?", params + [limit]
+        )]
+
+    def stats(self, since_day=None, until_day=None, account=None):
+        """
+        Aggregates from the daily rollups
+
+        Args:
+            since_day, until_day: 'YYYY-MM-DD' bounds, both inclusive (compacted
+                history older than the daily window is kept per week, keyed
+                by the Monday that starts it)
+            account: One account's runs instead of whole scheduler runs
+
+        Returns:
+            dict with count, successes, failures, success_rate (percent),
+            total_duration, mean, min, max, p50, p95 and p99 (seconds; None
+            without runs)
+        """
+        where, params = self._day_filter(since_day, until_day, account)
+        count, successes, total, shortest, longest = self.db.execute(
+            f"SELECT COALESCE(SUM(runs), 0), COALESCE(SUM(successes), 0), "
+            f"COALESCE(SUM(duration_sum), 0), MIN(duration_min), MAX(duration_max) "
+            f"FROM rollups WHERE {where}", params
+        ).fetchone()
+        histogram = self.db.execute(
+            f"SELECT bucket, SUM(runs) FROM rollup_buckets WHERE {where} "
+            f"GROUP BY bucket ORDER BY bucket", params
+        ).fetchall()
+
+        result = {
+            "count": count,
+            "successes": successes,
+            "failures": count - successes,
+            "success_rate": successes * 100 / count if count else 0.0,
+            "total_duration": total,
+            "mean": total / count if count else None,
+            "min": shortest,
+            "max": longest,
+        }
+        for name, fraction in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99)):
+            value = self._percentile(histogram, count, fraction)
+            # A bucket midpoint can fall just outside the observed range
+            result[name] = None if value is None else min(max(value, shortest), longest)
+        return result
+
+    @staticmethod
+    def _percentile(histogram, count, fraction):
+        if not count:
+            return None
+        rank = max(1, math.ceil(count * fraction))
+        seen = 0
+        for bucket, runs in histogram:
+            seen += runs
+            if seen >= rank:
+                return _bucket_value(bucket)
+        return _bucket_value(histogram[-1][0])
+
+    def accounts(self):
+        """Every account seen in the history"""
+        return [row[0] for row in self.db.execute(
+            "SELECT DISTINCT account FROM rollups WHERE account != ? ORDER BY account",
+            (ALL_ACCOUNTS,)
+        )]
@@ -0,0 +1,360 @@
+"""
+Run Store
+Append-only run history (JSON Lines) plus a small summary file holding the
+running counters, so recording a run costs the same however long the
+history gets. Migrates the old all-in-one progress.json on first use.
+Runs older than the retention window are folded into a rollups file by
+run_compaction.
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from config_loader import get_config
+
+logger = logging.getLogger(__name__)
+
+TAIL_BLOCK_BYTES = 8192
+
+
+def _empty_summary():
+    return {
+        "scheduler_started": datetime.now().isoformat(),
+        "total_runs": 0,
+        "successful_runs": 0,
+        "failed_runs": 0,
+        "last_run": None,
+        "last_run_status": None,
+        "accounts": {},
+        # Size of the run log covered by the counters above
+        "log_size": 0,
+        # Bumped whenever compaction rewrites the log, so indexes over
+        # byte offsets know to rebuild
+        "log_generation": 0,
+    }
+
+
+def _empty_rollups():
+    return {
+        # Runs up to this timestamp have been folded into the rollups
+        "compacted_through": None,
+        # Counters of every folded run, used when the summary is rebuilt
+        "totals": {"total_runs": 0, "successful_runs": 0, "failed_runs": 0, "accounts": {}},
+        # {period start: {account ('' for all): rollup}}
+        "daily": {},
+        "weekly": {},
+    }
+
+
+def _status(success):
+    return "SUCCESS" if success else "FAILED"
+
+
+class RunStore:
+    """
+    Run history in logs/runs.jsonl with counters in logs/run_summary.json
+
+    Each run is one appended line; the summary is rewritten atomically and
+    records how much of the log it covers, so a crash between the two is
+    repaired on the next start by replaying only the uncovered lines.
+
+    With read_only (for viewers running next to the scheduler) nothing is
+    written: no migration, no tail repair, and the summary is brought up to
+    date in memory only. append() and compact() are not available.
+    """
+
+    def __init__(self, log_path=None, summary_path=None, legacy_path=None, config=None,
+                 rollups_path=None, read_only=False):
+        config = config or get_config()
+        root = Path(__file__).parent.parent
+        if log_path is None:
+            log_path = root / config.get('Scheduling', 'RUN_LOG', 'logs/runs.jsonl')
+        if summary_path is None:
+            summary_path = root / config.get('Scheduling', 'RUN_SUMMARY', 'logs/run_summary.json')
+        if legacy_path is None:
+            legacy_path = root / config.get('Scheduling', 'PROGRESS_FILE', 'logs/progress.json')
+        if rollups_path is None:
+            rollups_path = root / config.get('Scheduling', 'RUN_ROLLUPS', 'logs/run_rollups.json')
+
+        self.log_path = Path(log_path)
+        self.summary_path = Path(summary_path)
+        self.legacy_path = Path(legacy_path)
+        self.rollups_path = Path(rollups_path)
+        self.read_only = read_only
+        self._lock = threading.Lock()
+
+        if not read_only:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            if not self.log_path.exists() and self.legacy_path.exists():
+                self._migrate()
+            self._drop_torn_tail()
+        self.summary = self._load_summary()
+
+    @property
+    def needs_migration(self):
+        """True while only the legacy progress.json exists"""
+        return not self.log_path.exists() and self.legacy_path.exists()
+
+    # ------------------------------------------------------------------
+    # Startup: migration and recovery
+    # ------------------------------------------------------------------
+
+    def _migrate(self):
+        """Convert the legacy progress.json into a run log and summary"""
+        try:
+            with open(self.legacy_path, 'r') as f:
+                legacy = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not migrate {self.legacy_path.name}: {e}")
+            return
+
+        tmp_path = self.log_path.with_suffix(f'{self.log_path.suffix}.{os.getpid()}.tmp')
+        with open(tmp_path, 'w') as f:
+            for run in legacy.get("runs", []):
+                f.write(json.dumps(run) + "\n")
+        os.replace(tmp_path, self.log_path)
+
+        summary = _empty_summary()
+        for key in ("scheduler_started", "total_runs", "successful_runs", "failed_runs",
+                    "last_run", "last_run_status", "accounts"):
+            if legacy.get(key) is not None:
+                summary[key] = legacy[key]
+        summary["log_size"] = self.log_path.stat().st_size
+        self._write_summary(summary)
+
+        self.legacy_path.replace(self.legacy_path.with_suffix('.json.migrated'))
+        logger.info(f"Migrated {len(legacy.get('runs', []))} runs from {self.legacy_path.name}")
+
+    def _drop_torn_tail(self):
+        """Cut off a partial last line left by a crash mid-append"""
+        try:
+            size = self.log_path.stat().st_size
+        except FileNotFoundError:
+            return
+        if size == 0:
+            return
+        with open(self.log_path, 'rb+') as f:
+            f.seek(size - 1)
+            if f.read(1) == b'\n':
+                return
+            end = size
+            while end > 0:
+                start = max(0, end - TAIL_BLOCK_BYTES)
+                f.seek(start)
+                cut = f.read(end - start).rfind(b'\n')
+                if cut >= 0:
+                    f.truncate(start + cut + 1)
+                    break
+                end = start
+            else:
+                f.truncate(0)
+        logger.warning(f"Dropped an incomplete record at the end of {self.log_path.name}")
+
+    def _load_summary(self):
+        try:
+            with open(self.summary_path, 'r') as f:
+                summary = json.load(f)
+        except (OSError, ValueError):
+            summary = None
+
+        log_size = self.log_path.stat().st_size if self.log_path.exists() else 0
+        skip_through = None
+        if summary is None or summary.get("log_size", 0) > log_size:
+            # Missing summary, or a log that was replaced: rebuild from the
+            # compacted totals plus every run still in the log
+            summary = _empty_summary()
+            rollups = self.load_rollups()
+            for key in ("total_runs", "successful_runs", "failed_runs", "accounts"):
+                summary[key] = rollups["totals"][key]
+            skip_through = rollups["compacted_through"]
+        summary.setdefault("log_generation", 0)
+        if summary["log_size"] < log_size:
+            self._replay(summary, summary["log_size"], skip_through)
+            if not self.read_only:
+                self._write_summary(summary)
+        return summary
+
+    def _replay(self, summary, offset, skip_through=None):
+        """Fold the log records after offset into summary"""
+        # Runs at or before skip_through are already counted in the rollup
+        # totals (compaction was interrupted before the log was rewritten)
+        with open(self.log_path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # a torn tail, or (read-only) a record still being written
+                offset += len(line)
+                try:
+                    run = json.loads(line)
+                except ValueError:
+                    continue
+                if skip_through and run.get("timestamp", '') <= skip_through:
+                    continue
+                self._count(summary, run)
+        summary["log_size"] = offset
+
+    # ------------------------------------------------------------------
+    # Counters
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _count(summary, run):
+        if summary["total_runs"] == 0 and run.get("timestamp"):
+            summary["scheduler_started"] = min(summary["scheduler_started"], run["timestamp"])
+        summary["total_runs"] += 1
+        summary["successful_runs" if run["success"] else "failed_runs"] += 1
+        summary["last_run"] = run.get("timestamp")
+        summary["last_run_status"] = _status(run["success"])
+
+        for result in run.get("accounts") or []:
+            stats = summary["accounts"].setdefault(result["account"], {
+                "total_runs": 0,
+                "successful_runs": 0,
+                "failed_runs": 0,
+                "last_run": None,
+                "last_run_status": None
+            })
+            stats["total_runs"] += 1
+            stats["successful_runs" if result["success"] else "failed_runs"] += 1
+            stats["last_run"] = run.get("timestamp")
+            stats["last_run_status"] = _status(result["success"])
+
+    def _write_summary(self, summary):
+        self._write_json(self.summary_path, summary)
+
+    @staticmethod
+    def _write_json(path, data):
+        tmp_path = path.with_suffix(f'{path.suffix}.{os.getpid()}.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def load_rollups(self):
+        """Rollups of compacted runs (empty until the first compaction)"""
+        try:
+            with open(self.rollups_path, 'r') as f:
+                rollups = json.load(f)
+        except (OSError, ValueError):
+            return _empty_rollups()
+        for key, value in _empty_rollups().items():
+            rollups.setdefault(key, value)
+        return rollups
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def append(self, run):
+        """Record one run: a single appended line plus the small summary"""
+        if self.read_only:
+            raise RuntimeError("RunStore opened read-only")
+        line = (json.dumps(run) + "\n").encode('utf-8')
+        with self._lock:
+            with open(self.log_path, 'ab') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+                log_size = f.tell()
+            self._count(self.summary, run)
+            self.summary["log_size"] = log_size
+            try:
+                self._write_summary(self.summary)
+            except OSError as e:
+                # The log is the source of truth; the summary catches up on restart
+                logger.error(f"Could not save run summary: {e}")
+
+    def compact(self, cutoff, fold):
+        """
+        Remove runs older than cutoff from the log, folding them first
+
+        Args:
+            cutoff: ISO timestamp; runs before it leave the log
+            fold: Callable(rollups, run) adding one run to the rollups dict
+
+        Order matters for crash safety: the rollups (with their
+        compacted_through watermark) are saved before the log is replaced,
+        and runs at or before the watermark are never folded twice.
+
+        Returns:
+            Number of runs removed from the log
+        """
+        if self.read_only:
+            raise RuntimeError("RunStore opened read-only")
+        if not self.log_path.exists():
+            return 0
+        with self._lock:
+            rollups = self.load_rollups()
+            watermark = rollups["compacted_through"]
+            removed = 0
+            tmp_path = self.log_path.with_suffix(f'{self.log_path.suffix}.{os.getpid()}.tmp')
+            with open(self.log_path, 'rb') as src, open(tmp_path, 'wb') as dst:
+                for line in src:
+                    try:
+                        run = json.loads(line)
+                    except ValueError:
+                        continue
+                    timestamp = run.get("timestamp") or ''
+                    if timestamp >= cutoff:
+                        dst.write(line)
+                        continue
+                    removed += 1
+                    if watermark is None or timestamp > watermark:
+                        fold(rollups, run)
+                        rollups["compacted_through"] = max(
+                            timestamp, rollups["compacted_through"] or timestamp)
+                dst.flush()
+                os.fsync(dst.fileno())
+                log_size = dst.tell()
+
+            if not removed:
+                os.remove(tmp_path)
+                return 0
+
+            self._write_json(self.rollups_path, rollups)
+            os.replace(tmp_path, self.log_path)
+            self.summary["log_size"] = log_size
+            self.summary["log_generation"] = self.summary.get("log_generation", 0) + 1
+            self._write_summary(self.summary)
+            return removed
+
+    def save_rollups(self, rollups):
+        """Save rollups changed outside compact() (e.g. daily folded into weekly)"""
+        if self.read_only:
+            raise RuntimeError("RunStore opened read-only")
+        with self._lock:
+            self._write_json(self.rollups_path, rollups)
+
+    def iter_runs(self):
+        """Every recorded run, oldest first"""
+        if not self.log_path.exists():
+            return
+        with open(self.log_path, 'rb') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+    def recent(self, count=10):
+        """The last count runs, oldest first, read from the end of the log"""
+        if count <= 0 or not self.log_path.exists():
+            return []
+        with open(self.log_path, 'rb') as f:
+            end = f.seek(0, os.SEEK_END)
+            data = b''
+            while end > 0 and data.count(b'\n') <= count:
+                start = max(0, end - TAIL_BLOCK_BYTES)
+                f.seek(start)
+                data = f.read(end - start) + data
+                end = start
+        runs = []
+        for line in data.splitlines()[-count:]:
+            try:
+                runs.append(json.loads(line))
+            except ValueError:
+                continue
+        return runs
@@ -0,0 +1,198 @@
+"""
+Run Trace
+Timing spans for the steps of a run (login, profile update, upload, each
+wait inside them), stored with the run record and exported as Chrome
+trace-event JSON for chrome://tracing or ui.perfetto.dev
+"""
+
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# Spans kept per run; a runaway loop of waits should not bloat the history
+MAX_SPANS = 1000
+
+_trace = contextvars.ContextVar('run_trace', default=None)
+
+
+class RunTrace:
+    """Spans recorded during one run, times relative to its start"""
+
+    def __init__(self):
+        self.started = time.time()
+        self.origin = time.perf_counter()
+        self.spans = []
+        self.dropped = 0
+
+    def add(self, name, start, end, args=None, error=None):
+        if len(self.spans) >= MAX_SPANS:
+            self.dropped += 1
+            return
+        entry = {
+            "name": name,
+            "start": round(start - self.origin, 6),
+            "end": round(end - self.origin, 6),
+            "thread": threading.current_thread().name,
+        }
+        if args:
+            entry["args"] = args
+        if error is not None:
+            entry["error"] = error
+        # list.append is atomic, so the resume-prep thread can add spans too
+        self.spans.append(entry)
+
+    def to_dict(self):
+        """The trace as stored in the run record"""
+        data = {"started": self.started, "spans": self.spans}
+        if self.dropped:
+            data["dropped"] = self.dropped
+        return data
+
+
+class _Span:
+    __slots__ = ('trace', 'name', 'args', 'start')
+
+    def __init__(self, trace, name, args):
+        self.trace = trace
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.trace.add(self.name, self.start, time.perf_counter(), self.args,
+                       exc_type.__name__ if exc_type else None)
+        return False
+
+
+class _NoSpan:
+    """Stand-in when no trace is active: nothing is timed or stored"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(name, **args):
+    """
+    Time the block as a span of the current run's trace
+
+    Costs one context variable lookup when tracing is off or the code runs
+    outside a run (e.g. the resume pool filling in the background).
+    """
+    trace = _trace.get()
+    if trace is None:
+        return _NO_SPAN
+    return _Span(trace, name, args)
+
+
+def traced(name=None):
+    """Decorator: run the function inside a span (named after it by default)"""
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            trace = _trace.get()
+            if trace is None:
+                return func(*args, **kwargs)
+            with _Span(trace, span_name, None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def run_trace(enabled=True):
+    """Record spans made inside the block; yields the RunTrace (None if disabled)"""
+    if not enabled:
+        yield None
+        return
+    trace = RunTrace()
+    token = _trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _trace.reset(token)
+
+
+# ----------------------------------------------------------------------
+# Chrome trace-event export
+# ----------------------------------------------------------------------
+
+def _trace_events(trace, pid, process_name):
+    """Complete ("X") events for one stored trace, one track per thread"""
+    events = [{"ph": "M", "name": "process_name", "pid": pid, "tid": 0,
+               "args": {"name": process_name}}]
+    origin_us = trace["started"] * 1e6
+    threads = {}
+    for entry in trace.get("spans", []):
+        thread = entry.get("thread", "main")
+        if thread not in threads:
+            threads[thread] = len(threads) + 1
+            events.append({"ph": "M", "name": "thread_name", "pid": pid,
+                           "tid": threads[thread], "args": {"name": thread}})
+        args = dict(entry.get("args") or {})
+        if entry.get("error"):
+            args["error"] = entry["error"]
+        events.append({
+            "ph": "X",
+            "name": entry["name"],
+            "cat": entry["name"].split(':', 1)[0],
+            "pid": pid,
+            "tid": threads[thread],
+            "ts": round(origin_us + entry["start"] * 1e6),
+            "dur": round((entry["end"] - entry["start"]) * 1e6),
+            "args": args,
+        })
+    return events
+
+
+def chrome_trace(run):
+    """
+    Chrome trace-event document for a run record
+
+    The scheduler's own spans are one process; in multi-account mode each
+    account's worker is another, so they line up on a shared timeline.
+    """
+    events = []
+    if run.get("trace"):
+        events += _trace_events(run["trace"], 1, f"Run #{run.get('run_number')}")
+    for pid, result in enumerate(run.get("accounts") or [], start=2):
+        if result.get("trace"):
+            events += _trace_events(result["trace"], pid, result["account"])
+    return {
+        "traceEvents": events,
+        "displayTimeUnit": "ms",
+        "otherData": {
+            "run_number": run.get("run_number"),
+            "timestamp": run.get("timestamp"),
+            "success": run.get("success"),
+        },
+    }
+
+
+def export_chrome_trace(run, path):
+    """Write a run record's spans as a trace file; returns the number of spans"""
+    document = chrome_trace(run)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f'{path.suffix}.{os.getpid()}.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(document, f)
+    os.replace(tmp_path, path)
+    return sum(1 for event in document["traceEvents"] if event["ph"] == "X")
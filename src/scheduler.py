@@ -8,7 +8,7 @@ Tracks progress and statistics for all runs
 import time
 import random
 import logging
-import json
+import threading
 from datetime import datetime
 from pathlib import Path
 import sys
@@ -16,10 +16,35 @@ import sys
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from config_loader import get_config
+from config_loader import changed_in, get_config, get_secrets
+from job_scheduler import Job, JobScheduler
+from log_setup import setup_logging
+from structured_log import run_context
+from run_trace import run_trace, span
+from webdriver_profiler import profile_commands
+from run_store import RunStore
+from task_schedule import TaskSchedule
 from telegram_notifier import get_notifier
 
 
+# Read once at startup; a reload only logs that these need a restart.
+# Locators, Session and ResumePool back on-disk state held by their
+# singletons, so they are not swapped under a running process.
+RESTART_SECTIONS = ('Accounts', 'Logging', 'Locators', 'Session', 'ResumePool')
+RESTART_KEYS = {
+    ('Browser', 'KEEP_WARM'),
+    ('Optimize', 'CACHE_DIR'),
+    ('Tasks', 'STATE_FILE'),
+    ('Telegram', 'API_BASE'),
+    ('Telegram', 'DIGEST_MODE'),
+    ('Scheduling', 'PROGRESS_FILE'),
+    ('Scheduling', 'RUN_LOG'),
+    ('Scheduling', 'RUN_SUMMARY'),
+    ('Scheduling', 'RUN_ROLLUPS'),
+    ('Scheduling', 'RUN_INDEX'),
+}
+
+
 class NaukriScheduler:
     """Manages scheduling for Naukri automation"""
     
@@ -28,66 +53,40 @@ class NaukriScheduler:
         self.logger = self._setup_logger()
         self.notifier = get_notifier()
         self.running = True
-        self.progress_file = None
-        self.progress_data = {}
-        self._load_progress()
+        self._progress_lock = threading.Lock()
+        self._index_lock = threading.Lock()
+        self.run_store = RunStore(config=self.config)
+        self._runs_started = self.run_store.summary["total_runs"]
+        self.jobs = None
+        self.multi_account = self.config.get('Accounts', 'MULTI_ACCOUNT', False, var_type=bool)
+        self.browser_pool = None if self.multi_account else self._setup_browser_pool()
+        self.task_schedule = TaskSchedule(config=self.config)
+        self._compaction = None
+        self._digest = None
     
     def _setup_logger(self):
-        """Setup logging"""
-        log_file = Path(__file__).parent.parent / self.config.get('Logging', 'LOG_FILE')
-        log_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        logger = logging.getLogger(__name__)
-        logger.setLevel(self.config.get('Logging', 'LOG_LEVEL'))
-        
-        handler = logging.FileHandler(log_file)
-        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
-        
-        # Also print to console
-        console_handler = logging.StreamHandler()
-        console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
-        
-        return logger
+        """Setup logging (shared queued pipeline, see log_setup)"""
+        setup_logging(self.config)
+        return logging.getLogger(__name__)
     
-    def _load_progress(self):
-        """Load progress tracking data from file"""
-        self.progress_file = Path(__file__).parent.parent / self.config.get('Scheduling', 'PROGRESS_FILE', 'logs/progress.json')
-        self.progress_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        if self.progress_file.exists():
-            try:
-                with open(self.progress_file, 'r') as f:
-                    self.progress_data = json.load(f)
-            except Exception as e:
-                self.logger.warning(f"Could not load progress file: {e}")
-                self.progress_data = self._init_progress()
-        else:
-            self.progress_data = self._init_progress()
-    
-    def _init_progress(self):
-        """Initialize progress data structure"""
-        return {
-            "scheduler_started": datetime.now().isoformat(),
-            "total_runs": 0,
-            "successful_runs": 0,
-            "failed_runs": 0,
-            "last_run": None,
-            "last_run_status": None,
-            "runs": []
-        }
-    
-    def _save_progress(self):
-        """Save progress tracking data to file"""
-        try:
-            with open(self.progress_file, 'w') as f:
-                json.dump(self.progress_data, f, indent=2)
-        except Exception as e:
-            self.logger.error(f"Could not save progress file: {e}")
+    def _setup_browser_pool(self):
+        """Create the warm browser pool when KEEP_WARM is enabled"""
+        if not self.config.get('Browser', 'KEEP_WARM', False, var_type=bool):
+            return None
+
+        from browser_pool import BrowserPool
+
+        def launch():
+            import naukri_main
+            # Read at launch, so a reloaded HEADLESS applies to new browsers
+            headless = self.config.get('Settings', 'HEADLESS', var_type=bool)
+            return naukri_main.LoadNaukri(headless, url=None)
+
+        self.logger.info("Warm browser pool enabled")
+        return BrowserPool(launch, self.config)
     
-    def _log_progress(self, run_number, success, duration_seconds, error_msg=None):
+    def _log_progress(self, run_number, success, duration_seconds, error_msg=None,
+                      account_results=None, trace=None, profile=None):
         """Log a run to progress tracking"""
         run_info = {
             "run_number": run_number,
@@ -96,28 +95,70 @@ class NaukriScheduler:
             "duration_seconds": duration_seconds,
             "error": error_msg
         }
+        if account_results:
+            run_info["accounts"] = account_results
+        if trace is not None:
+            run_info["trace"] = trace.to_dict()
+        if profile is not None and profile.total.calls:
+            run_info["webdriver"] = profile.totals()
+        
+        try:
+            self.run_store.append(run_info)
+        except Exception as e:
+            self.logger.error(f"Could not save run record: {e}")
+            return
+        self._sync_index()
+    
+    def _sync_index(self, query=None):
+        """
+        Bring logs/run_index.db up to date with the run log
+
+        Called after every append and compaction, so view_progress (which
+        opens the index read-only) only has to replay the newest lines.
+        query optionally runs against the synced index; its result is returned.
+        """
+        from run_index import RunIndex
         
-        self.progress_data["runs"].append(run_info)
-        self.progress_data["last_run"] = datetime.now().isoformat()
-        self.progress_data["last_run_status"] = "SUCCESS" if success else "FAILED"
-        self.progress_data["total_runs"] += 1
+        # sqlite connections stay on one thread; jobs run on a pool, so each
+        # sync opens its own and the lock keeps them from overlapping
+        with self._index_lock:
+            try:
+                index = RunIndex(self.run_store, config=self.config)
+                try:
+                    index.sync()
+                    return query(index) if query else None
+                finally:
+                    index.close()
+            except Exception as e:
+                self.logger.error(f"Could not update run index: {e}")
+                return None
+    
+    def _run_accounts(self, run_number, accounts, due_tasks, tracing=False):
+        """Run accounts in parallel with the tasks due for each"""
+        from multi_account import run_accounts
         
-        if success:
-            self.progress_data["successful_runs"] += 1
-        else:
-            self.progress_data["failed_runs"] += 1
+        max_parallel = self.config.get('Accounts', 'MAX_PARALLEL', 2, var_type=int)
+        self.logger.info(f"[Run #{run_number}] Running {len(accounts)} accounts, {max_parallel} at a time")
         
-        self._save_progress()
+        results = run_accounts(accounts, max_parallel, due_tasks, run_id=run_number, tracing=tracing)
+        for result in results:
+            status = "succeeded" if result["success"] else f"failed: {result['error']}"
+            self.logger.info(
+                f"[Run #{run_number}] {result['account']} {status} "
+                f"({result['duration_seconds']:.1f} seconds)"
+            )
+        return results
     
     def _print_progress_summary(self):
         """Print current progress summary to console and log"""
-        total = self.progress_data["total_runs"]
-        success = self.progress_data["successful_runs"]
-        failed = self.progress_data["failed_runs"]
+        summary = self.run_store.summary
+        total = summary["total_runs"]
+        success = summary["successful_runs"]
+        failed = summary["failed_runs"]
         success_rate = (success / total * 100) if total > 0 else 0
-        last_status = self.progress_data.get('last_run_status', 'PENDING')
+        last_status = summary.get('last_run_status', 'PENDING')
         
-        summary = f"""
+        summary_box = f"""
         ╔════════════════════════════════════════╗
         ║     SCHEDULER PROGRESS SUMMARY        ║
         ╠════════════════════════════════════════╣
@@ -129,40 +170,142 @@ class NaukriScheduler:
         ╚════════════════════════════════════════╝
         """
         
-        self.logger.info(summary)
-        print(summary)
+        self.logger.info(summary_box)
     
     def get_next_delay(self):
         """Calculate next delay in seconds"""
-        use_random = self.config.get('Scheduling', 'USE_RANDOM_TIMES', var_type=bool)
+        config = self.config
         
-        if use_random:
-            min_delay = self.config.get('Scheduling', 'RANDOM_DELAY_MIN', var_type=int)
-            max_delay = self.config.get('Scheduling', 'RANDOM_DELAY_MAX', var_type=int)
+        if config.get('Scheduling', 'USE_RANDOM_TIMES', var_type=bool):
+            min_delay = config.get('Scheduling', 'RANDOM_DELAY_MIN', var_type=int)
+            max_delay = config.get('Scheduling', 'RANDOM_DELAY_MAX', var_type=int)
             delay = random.randint(min_delay, max_delay)
             self.logger.info(f"Using random delay: {delay} seconds")
         else:
-            interval_hours = self.config.get('Scheduling', 'SCHEDULE_INTERVAL_HOURS', var_type=int)
+            interval_hours = config.get('Scheduling', 'SCHEDULE_INTERVAL_HOURS', var_type=float)
             delay = interval_hours * 3600
-            self.logger.info(f"Using fixed interval: {interval_hours} hours ({delay} seconds)")
+            self.logger.info(f"Using fixed interval: {interval_hours} hours ({delay:.0f} seconds)")
         
         return delay
     
-    def run_script(self):
-        """Run the main Naukri automation script"""
+    def _on_config_change(self, config, changed):
+        """Config subscriber: apply reloaded settings to the running scheduler"""
+        if changed_in(changed, 'Scheduling', ['USE_RANDOM_TIMES', 'RANDOM_DELAY_MIN',
+                                              'RANDOM_DELAY_MAX', 'SCHEDULE_INTERVAL_HOURS']):
+            # get_next_delay reads the new values; slots already queued stay
+            self.logger.info("New run timing applies from the next scheduled run")
+        if self._compaction and changed_in(changed, 'History', ['COMPACT_EVERY_HOURS']):
+            hours = config.get('History', 'COMPACT_EVERY_HOURS', 24, var_type=float)
+            if hours > 0:
+                self._compaction.interval = hours * 3600
+            else:
+                self.jobs.cancel(self._compaction)
+        if self._digest and changed_in(changed, 'Telegram', ['DIGEST_EVERY_HOURS']):
+            hours = config.get('Telegram', 'DIGEST_EVERY_HOURS', 24, var_type=float)
+            self._digest.interval = hours * 3600
+        
+        restart_keys = {(s.lower(), k.lower()) for s, k in RESTART_KEYS}
+        restart = [f"{s}.{k}" for s, k in sorted(changed)
+                   if s in RESTART_SECTIONS or (s.lower(), k.lower()) in restart_keys]
+        if restart:
+            self.logger.warning(f"Restart the scheduler to apply: {', '.join(restart)}")
+    
+    def _due_tasks(self, accounts):
+        """Map each account to its due tasks, leaving out accounts with none"""
+        due_tasks = {}
+        for account in accounts:
+            tasks = self.task_schedule.due_tasks(account)
+            if tasks:
+                due_tasks[account] = tasks
+        return due_tasks
+    
+    def _mark_tasks_done(self, task_results):
+        """Record the tasks that succeeded; {account: {task: succeeded}}"""
+        for account, results in task_results.items():
+            done = [task for task, succeeded in (results or {}).items() if succeeded]
+            if done:
+                self.task_schedule.mark_done(account, done)
+    
+    def run_script(self, accounts=None):
+        """Run the main Naukri automation script (for the given accounts in multi-account mode)"""
+        if self.multi_account:
+            if accounts is None:
+                from multi_account import load_accounts
+                accounts = load_accounts()
+            due_tasks = self._due_tasks([a["username"] for a in accounts])
+            accounts = [a for a in accounts if a["username"] in due_tasks]
+        else:
+            due_tasks = self._due_tasks([get_secrets().get('naukri.username')])
+        
+        if not due_tasks:
+            self.logger.info("No tasks due, skipping this session")
+            return None
+        
         start_time = time.time()
-        run_number = self.progress_data["total_runs"] + 1
+        with self._progress_lock:
+            self._runs_started += 1
+            run_number = self._runs_started
+        
+        # Every log record of this run carries its run number (see structured_log),
+        # its step timings go into the run record (see run_trace) and its
+        # WebDriver round trips into a report (see webdriver_profiler; in
+        # multi-account mode the workers profile their own sessions)
+        tracing = self.config.get('Trace', 'ENABLED', False, var_type=bool)
+        with run_context(run_number, account=", ".join(due_tasks), started=start_time), \
+                run_trace(tracing) as trace, \
+                profile_commands(run_number, config=self.config) as profile:
+            return self._execute_run(run_number, accounts, due_tasks, start_time, trace, profile)
+    
+    def _execute_run(self, run_number, accounts, due_tasks, start_time, trace=None, profile=None):
+        """Body of run_script, inside the run's log context"""
+        account_results = None
+        # Single-account runs are recorded under the account too, so history
+        # and the per-account index look the same in both modes
+        account = None if self.multi_account else (next(iter(due_tasks)) or "default")
         
         try:
             self.logger.info(f"[Run #{run_number}] Starting Naukri automation script...")
             
             # Import and run the main script
             from naukri_main import main
-            main()
+            if self.multi_account:
+                account_results = self._run_accounts(run_number, accounts, due_tasks, trace is not None)
+                self._mark_tasks_done({r["account"]: r.get("tasks") for r in account_results})
+                failed = [r for r in account_results if not r["success"]]
+                if failed:
+                    raise RuntimeError("Failed accounts: " + ", ".join(
+                        f"{r['account']} ({r['error']})" for r in failed
+                    ))
+            else:
+                [tasks] = due_tasks.values()
+                self.logger.info(f"[Run #{run_number}] Tasks due: {', '.join(tasks)}")
+                if self.browser_pool:
+                    with span("browser_pool.acquire"):
+                        driver = self.browser_pool.acquire()
+                    try:
+                        logged_in, task_results = main(driver=driver, tasks=tasks)
+                    finally:
+                        with span("browser_pool.release"):
+                            self.browser_pool.release(driver)
+                else:
+                    logged_in, task_results = main(tasks=tasks)
+                [username] = due_tasks
+                self._mark_tasks_done({username: task_results})
+                account_results = [{
+                    "account": account,
+                    "success": bool(logged_in),
+                    "duration_seconds": time.time() - start_time,
+                    "error": None if logged_in else "Login failed",
+                    "tasks": task_results,
+                }]
+                if not logged_in:
+                    # Same outcome as a failed account in multi-account mode
+                    raise RuntimeError(f"Failed accounts: {account} (Login failed)")
             
             duration = time.time() - start_time
             self.logger.info(f"[Run #{run_number}] Script completed successfully in {duration:.1f} seconds")
-            self._log_progress(run_number, True, duration)
+            self._log_progress(run_number, True, duration, account_results=account_results,
+                               trace=trace, profile=profile)
             
             # Send success notification
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -173,7 +316,11 @@ class NaukriScheduler:
             duration = time.time() - start_time
             error_msg = str(e)
             self.logger.error(f"[Run #{run_number}] Script failed after {duration:.1f} seconds: {error_msg}", exc_info=True)
-            self._log_progress(run_number, False, duration, error_msg)
+            if account is not None and account_results is None:
+                account_results = [{"account": account, "success": False,
+                                    "duration_seconds": duration, "error": error_msg}]
+            self._log_progress(run_number, False, duration, error_msg, account_results, trace,
+                               profile)
             
             # Send failure notification
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -181,6 +328,101 @@ class NaukriScheduler:
             
             return False
     
+    def _job_delay(self, job_name):
+        """Delay callable for a job: next configured delay, logged"""
+        def _delay():
+            delay = self.get_next_delay()
+            next_run_time = datetime.fromtimestamp(datetime.now().timestamp() + delay)
+            self.logger.info(f"{job_name}: next run scheduled for {next_run_time} ({delay / 60:.1f} minutes from now)")
+            return delay
+        return _delay
+    
+    def _run_job(self, accounts=None):
+        """Job action: one scheduled execution"""
+        self.run_script(accounts)
+        self._print_progress_summary()
+        self._refill_resume_pool()
+    
+    def _refill_resume_pool(self):
+        """Pre-generate resume variants in the background before the next run"""
+        if not self.config.get('ResumePool', 'ENABLED', False, var_type=bool):
+            return
+        try:
+            import naukri_main
+            if self.multi_account:
+                from multi_account import load_accounts
+                sources = {a["original_resume"] for a in load_accounts()}
+            else:
+                sources = {naukri_main.get_run_settings().original_resume}
+            naukri_main.getResumePool().fill_async(sources)
+        except Exception as e:
+            self.logger.warning(f"Could not refill resume pool: {e}")
+    
+    def _compact_history(self):
+        """Job action: fold old runs into rollups (see run_compaction)"""
+        from run_compaction import HistoryCompactor
+        HistoryCompactor(self.run_store, self.config).compact()
+        # A rewritten log bumps log_generation; the index rebuilds from rollups
+        self._sync_index()
+    
+    def _compaction_job(self):
+        """Daily compaction, first run a few minutes after startup"""
+        hours = self.config.get('History', 'COMPACT_EVERY_HOURS', 24, var_type=float)
+        if hours <= 0:
+            return None
+        return Job("History compaction", self._compact_history, interval=hours * 3600,
+                   task="compaction")
+    
+    def _send_digest(self):
+        """Job action: summary of the runs since the last digest (digest mode)"""
+        hours = self.config.get('Telegram', 'DIGEST_EVERY_HOURS', 24, var_type=float)
+        since = datetime.fromtimestamp(time.time() - hours * 3600).isoformat()
+        runs = self._sync_index(lambda index: index.query(since=since))
+        if runs is None:
+            return
+        self.notifier.send_digest(runs, hours, self.run_store.summary.get("scheduler_started"))
+    
+    def _digest_job(self):
+        """Periodic digest replacing per-run success notifications"""
+        if not self.notifier.digest_mode:
+            return None
+        hours = self.config.get('Telegram', 'DIGEST_EVERY_HOURS', 24, var_type=float)
+        return Job("Notification digest", self._send_digest, interval=hours * 3600, task="digest")
+    
+    def _subscribe_config(self):
+        """Hand reloaded config.ini changes to the running components"""
+        if not self.config.get('Scheduling', 'HOT_RELOAD', True, var_type=bool):
+            return
+        self.config.subscribe(self._on_config_change)
+        self.config.subscribe(self.notifier.apply_config)
+        self.config.subscribe(self.task_schedule.load)
+        if self.browser_pool:
+            self.config.subscribe(self.browser_pool.apply_config)
+    
+    def _check_config(self):
+        """Scheduler tick: one stat() of config.ini, a reload if it changed"""
+        if self.config.get('Scheduling', 'HOT_RELOAD', True, var_type=bool):
+            self.config.reload_if_changed()
+    
+    def _build_jobs(self):
+        """One job per account in multi-account mode, otherwise a single job"""
+        if not self.multi_account:
+            return [Job("Naukri run", self._run_job, delay=self._job_delay("Naukri run"), task="session")]
+        
+        from multi_account import load_accounts
+        
+        jobs = []
+        for account in load_accounts():
+            name = f"Naukri run [{account['username']}]"
+            jobs.append(Job(
+                name,
+                lambda account=account: self._run_job([account]),
+                delay=self._job_delay(name),
+                account=account['username'],
+                task="session"
+            ))
+        return jobs
+    
     def start(self):
         """Start the scheduler"""
         self.logger.info("=" * 80)
@@ -192,47 +434,46 @@ class NaukriScheduler:
         # Send startup notification
         self.notifier.send_startup_notification()
         
-        first_run = True
+        max_workers = self.config.get('Accounts', 'MAX_PARALLEL', 2, var_type=int) if self.multi_account else 1
+        self.jobs = JobScheduler(max_workers=max_workers, on_tick=self._check_config)
+        for job in self._build_jobs():
+            self.jobs.add(job)
+        self.logger.info(f"Running initial execution of {len(self.jobs)} job(s)...")
+        self._compaction = self._compaction_job()
+        if self._compaction:
+            # Delayed so it runs in the idle time after the first session
+            self.jobs.add(self._compaction, delay=self.config.get(
+                'History', 'COMPACT_DELAY_SECONDS', 600, var_type=int))
+        self._digest = self._digest_job()
+        if self._digest:
+            self.jobs.add(self._digest, delay=self._digest.interval)
+        self._subscribe_config()
+        self._refill_resume_pool()
+        # Index history recorded before this start (e.g. a first upgrade)
+        self._sync_index()
         
-        while self.running:
-            try:
-                if first_run:
-                    self.logger.info("Running initial execution...")
-                    self.run_script()
-                    self._print_progress_summary()
-                    first_run = False
-                
-                delay = self.get_next_delay()
-                next_run = datetime.now().timestamp() + delay
-                next_run_time = datetime.fromtimestamp(next_run)
-                
-                delay_minutes = delay / 60
-                self.logger.info(f"Next run scheduled for: {next_run_time} ({delay_minutes:.1f} minutes from now)")
-                self.logger.info(f"Waiting {delay} seconds ({delay_minutes:.1f} minutes)...")
-                
-                time.sleep(delay)
-                
-                self.logger.info("Running scheduled execution...")
-                self.run_script()
-                self._print_progress_summary()
-                
-            except KeyboardInterrupt:
-                self.logger.info("Scheduler interrupted by user")
-                self.logger.info("=" * 80)
-                self._print_progress_summary()
-                self.logger.info("=" * 80)
-                self.running = False
-                break
-            except Exception as e:
-                self.logger.error(f"Scheduler error: {e}", exc_info=True)
-                self.logger.info("Waiting 60 seconds before retry...")
-                time.sleep(60)
+        try:
+            self.jobs.run()
+        except KeyboardInterrupt:
+            self.logger.info("Scheduler interrupted by user")
+            self.logger.info("Waiting for running jobs to finish...")
+        finally:
+            self.running = False
+            self.jobs.stop(wait=True)
+            self.logger.info("=" * 80)
+            self._print_progress_summary()
+            self.logger.info("=" * 80)
+        
+        if self.browser_pool:
+            self.browser_pool.close()
+        
+        # Deliver notifications still queued
+        self.notifier.flush(timeout=30)
         
         self.logger.info("=" * 80)
         self.logger.info("Naukri Automation Scheduler Stopped")
         self.logger.info("=" * 80)
 
-
 def main():
     """Main scheduler entry point"""
     scheduler = NaukriScheduler()
@@ -0,0 +1,212 @@
+"""
+Session Store
+Saves authenticated Naukri cookies and local storage after a login and
+restores them into a fresh Chrome, so later runs can skip the login form
+"""
+
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+from selenium.common.exceptions import WebDriverException
+
+from config_loader import get_config
+from file_lock import locked
+
+logger = logging.getLogger(__name__)
+
+
+# Runs before any page script on every new document, so the site sees its
+# local storage already in place on the first load
+_LOCAL_STORAGE_JS = """
+(function () {
+    if (location.origin !== %(origin)s) return;
+    var items = %(items)s;
+    for (var key in items) {
+        try { localStorage.setItem(key, items[key]); } catch (e) {}
+    }
+})();
+"""
+
+
+def _to_cdp_cookie(cookie):
+    """Convert a Selenium cookie dict to a CDP Network.CookieParam"""
+    cdp_cookie = {
+        "name": cookie["name"],
+        "value": cookie["value"],
+        "domain": cookie.get("domain"),
+        "path": cookie.get("path", "/"),
+        "secure": cookie.get("secure", False),
+        "httpOnly": cookie.get("httpOnly", False),
+    }
+    if "expiry" in cookie:
+        cdp_cookie["expires"] = cookie["expiry"]
+    if cookie.get("sameSite") in ("Strict", "Lax", "None"):
+        cdp_cookie["sameSite"] = cookie["sameSite"]
+    return cdp_cookie
+
+
+class SessionStore:
+    """Persists one authenticated browser session per account"""
+
+    def __init__(self, session_path=None, max_age_hours=None):
+        config = get_config()
+        if session_path is None:
+            session_path = Path(__file__).parent.parent / config.get(
+                'Session', 'SESSION_FILE', '.secrets/session.json')
+        if max_age_hours is None:
+            max_age_hours = config.get('Session', 'MAX_AGE_HOURS', 24, var_type=float)
+
+        self.enabled = config.get('Session', 'REUSE_SESSION', False, var_type=bool)
+        self.validate_timeout = config.get('Session', 'VALIDATE_TIMEOUT', 15, var_type=float)
+        self.session_path = Path(session_path)
+        self.max_age_seconds = max_age_hours * 3600
+        self._restore_script_id = None
+
+    def _load(self):
+        try:
+            with open(self.session_path, 'r') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                return data
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def _write(self, data):
+        """Write the store atomically and keep it readable by the owner only"""
+        self.session_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.session_path.with_suffix(f'{self.session_path.suffix}.{os.getpid()}.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        try:
+            os.chmod(tmp_path, 0o600)
+        except OSError:
+            pass
+        os.replace(tmp_path, self.session_path)
+
+    def get(self, account):
+        """Return the saved session for account if it is still usable"""
+        session = self._load().get(account)
+        if not session:
+            return None
+
+        now = time.time()
+        if now - session.get("saved_at", 0) > self.max_age_seconds:
+            return None
+        cookies = [
+            cookie for cookie in session.get("cookies", [])
+            if cookie.get("expiry") is None or cookie["expiry"] > now
+        ]
+        if not cookies:
+            return None
+        session["cookies"] = cookies
+        return session
+
+    def has_session(self, account):
+        return self.get(account) is not None
+
+    def save(self, driver, account):
+        """Capture cookies and local storage from a logged-in driver"""
+        try:
+            cookies = driver.execute_cdp_cmd('Network.getAllCookies', {}).get('cookies', [])
+            cookies = [
+                {
+                    "name": cookie["name"],
+                    "value": cookie["value"],
+                    "domain": cookie.get("domain"),
+                    "path": cookie.get("path", "/"),
+                    "secure": cookie.get("secure", False),
+                    "httpOnly": cookie.get("httpOnly", False),
+                    "sameSite": cookie.get("sameSite"),
+                    # CDP reports session cookies with a negative expiry
+                    **({"expiry": int(cookie["expires"])}
+                       if cookie.get("expires", -1) > 0 else {}),
+                }
+                for cookie in cookies
+            ]
+        except WebDriverException:
+            cookies = driver.get_cookies()
+
+        try:
+            origin, local_storage = driver.execute_script(
+                "return [location.origin, Object.assign({}, window.localStorage)];"
+            )
+        except WebDriverException:
+            origin, local_storage = None, {}
+
+        # Workers of other accounts write the same file
+        with locked(self.session_path):
+            data = self._load()
+            data[account] = {
+                "saved_at": time.time(),
+                "origin": origin,
+                "cookies": cookies,
+                "local_storage": local_storage or {},
+            }
+            try:
+                self._write(data)
+            except OSError as e:
+                logger.warning(f"Could not save session: {e}")
+                return False
+        logger.info(f"Saved session with {len(cookies)} cookies for {account}")
+        return True
+
+    def restore(self, driver, account):
+        """
+        Install a saved session into a driver that has not navigated yet
+
+        Returns False when there is no usable session for the account.
+        """
+        session = self.get(account)
+        if session is None:
+            return False
+
+        driver.execute_cdp_cmd('Network.setCookies', {
+            'cookies': [_to_cdp_cookie(cookie) for cookie in session["cookies"]]
+        })
+        if session.get("origin") and session.get("local_storage"):
+            script = _LOCAL_STORAGE_JS % {
+                "origin": json.dumps(session["origin"]),
+                "items": json.dumps(session["local_storage"]),
+            }
+            result = driver.execute_cdp_cmd(
+                'Page.addScriptToEvaluateOnNewDocument', {'source': script})
+            self._restore_script_id = result.get('identifier')
+        return True
+
+    def finish_restore(self, driver, valid):
+        """Remove the restore script and drop the cookies of a dead session"""
+        try:
+            if self._restore_script_id is not None:
+                driver.execute_cdp_cmd('Page.removeScriptToEvaluateOnNewDocument',
+                                       {'identifier': self._restore_script_id})
+            if not valid:
+                driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        except WebDriverException as e:
+            logger.warning(f"Could not clean up restored session: {e}")
+        self._restore_script_id = None
+
+    def clear(self, account):
+        """Forget the saved session for account"""
+        # Workers of other accounts write the same file
+        with locked(self.session_path):
+            data = self._load()
+            if data.pop(account, None) is not None:
+                try:
+                    self._write(data)
+                except OSError as e:
+                    logger.warning(f"Could not clear session: {e}")
+
+
+_store = None
+
+
+def get_session_store():
+    """Get or create the session store"""
+    global _store
+    if _store is None:
+        _store = SessionStore()
+    return _store
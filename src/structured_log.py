@@ -0,0 +1,187 @@
+"""
+Structured Run Logs
+JSON log records tagged with run id, account, step and elapsed time, and
+the reader for the side index (<log file>.idx) that maps each run id to
+byte ranges of the log, so one run's records are read with a seek instead
+of a full scan
+"""
+
+import contextvars
+import gzip
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from run_trace import span
+
+
+_run_id = contextvars.ContextVar('run_id', default=None)
+_account = contextvars.ContextVar('account', default=None)
+_step = contextvars.ContextVar('step', default=None)
+_run_started = contextvars.ContextVar('run_started', default=None)
+
+RUN_END = 'end'
+
+
+# ----------------------------------------------------------------------
+# Context
+# ----------------------------------------------------------------------
+
+def current_run_id():
+    return _run_id.get()
+
+
+def current_step():
+    return _step.get()
+
+
+def current_account():
+    return _account.get()
+
+
+@contextmanager
+def run_context(run_id, account=None, started=None):
+    """Tag every record logged inside the block with run_id and account"""
+    run_id = str(run_id)
+    tokens = [
+        (_run_id, _run_id.set(run_id)),
+        (_account, _account.set(account)),
+        (_run_started, _run_started.set(started or time.time())),
+        (_step, _step.set(None)),
+    ]
+    try:
+        yield run_id
+    finally:
+        # Marker record: closes the run's byte range in the index; it is
+        # never written to the log itself
+        marker = logging.makeLogRecord({
+            'name': __name__, 'levelno': logging.INFO, 'levelname': 'INFO',
+            'msg': 'run end', 'run_event': RUN_END,
+        })
+        logging.getLogger().handle(marker)
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+@contextmanager
+def log_step(name):
+    """Tag records logged inside the block with a step name (and time it)"""
+    token = _step.set(name)
+    try:
+        with span(f"step:{name}"):
+            yield
+    finally:
+        _step.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """Copy the run context onto each record (in the thread that logged it)"""
+
+    def filter(self, record):
+        record.run_id = _run_id.get()
+        record.account = _account.get()
+        record.step = _step.get()
+        started = _run_started.get()
+        record.elapsed = round(time.time() - started, 3) if started else None
+        return True
+
+
+class NotRunEvent(logging.Filter):
+    """Drop run markers from handlers that print records"""
+
+    def filter(self, record):
+        return getattr(record, 'run_event', None) is None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line"""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "run_id": getattr(record, 'run_id', None),
+            "account": getattr(record, 'account', None),
+            "step": getattr(record, 'step', None),
+            "elapsed": getattr(record, 'elapsed', None),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+# ----------------------------------------------------------------------
+# Run index (written by log_setup.IndexedLogHandler)
+# ----------------------------------------------------------------------
+
+def read_index(index_path):
+    """(range entries, current segment number) from an index file"""
+    entries = []
+    segment = 0
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if "segment" in entry:
+                    segment = max(segment, entry["segment"])
+                else:
+                    entries.append(entry)
+                    segment = max(segment, entry["seg"])
+    except OSError:
+        pass
+    return entries, segment
+
+
+def _segment_path(log_path, segment, current):
+    if segment == current:
+        return log_path
+    rotated = f"{log_path}.{current - segment}"
+    return f"{rotated}.gz" if os.path.exists(f"{rotated}.gz") else rotated
+
+
+def read_run_logs(log_path, run_id):
+    """
+    Every record of one run, read by seeking to its indexed byte ranges
+
+    Returns a list of dicts (JSON records); lines that are not JSON are
+    returned as {"message": line}.
+    """
+    run_id = str(run_id)
+    entries, current = read_index(f"{log_path}.idx")
+
+    ranges = []
+    for entry in entries:
+        if entry["run"] != run_id:
+            continue
+        if "start" in entry:
+            ranges.append([entry["seg"], entry["start"], None])
+        elif ranges and ranges[-1][0] == entry["seg"] and ranges[-1][2] is None:
+            ranges[-1][2] = entry["end"]
+
+    records = []
+    for segment, start, end in ranges:
+        path = _segment_path(str(log_path), segment, current)
+        opener = gzip.open if path.endswith('.gz') else open
+        try:
+            with opener(path, 'rb') as f:
+                f.seek(start)
+                data = f.read(end - start) if end is not None else f.read()
+        except OSError:
+            continue
+        for line in data.splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                records.append({"message": line.decode('utf-8', 'replace')})
+                continue
+            if record.get("run_id") == run_id:
+                records.append(record)
+    return records
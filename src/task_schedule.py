@@ -0,0 +1,105 @@
+"""
+Per-Task Schedules
+Tracks when each task last ran for each account, so a session only runs the
+tasks that are due (e.g. profile update every run, resume upload once a day)
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+from config_loader import get_config
+
+logger = logging.getLogger(__name__)
+
+TASK_UPDATE_PROFILE = 'update_profile'
+TASK_UPLOAD_RESUME = 'upload_resume'
+
+# Task name -> (Settings flag that enables it, Tasks key with its interval)
+TASKS = {
+    TASK_UPDATE_PROFILE: ('UPDATE_PROFILE', 'UPDATE_PROFILE_EVERY_HOURS'),
+    TASK_UPLOAD_RESUME: ('UPLOAD_RESUME', 'UPLOAD_RESUME_EVERY_HOURS'),
+}
+
+
+def enabled_tasks(config=None):
+    """Tasks switched on in the [Settings] section"""
+    config = config or get_config()
+    return [
+        task for task, (flag, _) in TASKS.items()
+        if config.get('Settings', flag, True, var_type=bool)
+    ]
+
+
+class TaskSchedule:
+    """Last-run times per (account, task), persisted under logs/"""
+
+    def __init__(self, state_path=None, config=None):
+        config = config or get_config()
+        if state_path is None:
+            state_path = Path(__file__).parent.parent / config.get(
+                'Tasks', 'STATE_FILE', 'logs/task_state.json')
+
+        self.state_path = Path(state_path)
+        self.load(config)
+        self._lock = threading.Lock()
+        self.state = self._load()
+
+    def load(self, config, changed=None):
+        """Read the enabled tasks and their intervals; also a config subscriber"""
+        self.tasks = enabled_tasks(config)
+        # An interval of 0 means the task runs in every session
+        self.intervals = {
+            task: config.get('Tasks', key, 0, var_type=float) * 3600
+            for task, (_, key) in TASKS.items()
+        }
+
+    def _load(self):
+        try:
+            with open(self.state_path, 'r') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                return data
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def _save(self):
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.state_path.with_suffix(f'{self.state_path.suffix}.{os.getpid()}.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(self.state, f, indent=2)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            logger.warning(f"Could not save task state: {e}")
+
+    def seconds_until_due(self, account, task, now=None):
+        """Seconds until task is due for account (0 or less means due now)"""
+        now = time.time() if now is None else now
+        last_run = self.state.get(account, {}).get(task)
+        if last_run is None:
+            return 0.0
+        return last_run + self.intervals.get(task, 0) - now
+
+    def due_tasks(self, account, now=None):
+        """Enabled tasks that are due for account, in the order they run"""
+        with self._lock:
+            return [
+                task for task in self.tasks
+                if self.seconds_until_due(account, task, now) <= 0
+            ]
+
+    def mark_done(self, account, tasks, when=None):
+        """Record that tasks completed for account"""
+        if not tasks:
+            return
+        when = time.time() if when is None else when
+        with self._lock:
+            account_state = self.state.setdefault(account, {})
+            for task in tasks:
+                account_state[task] = when
+            self._save()
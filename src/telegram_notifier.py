@@ -1,21 +1,56 @@
 """
 Telegram Notification Module
 Sends status updates and results to Telegram via Bot API
+
+Messages are queued and sent by a background thread over a keep-alive
+session, so a slow Telegram API never delays a run. Failed sends are
+retried with exponential backoff (honoring Telegram's retry_after), and
+messages queued close together are sent as one.
 """
 
-import requests
+import atexit
 import logging
+import queue
+import random
+import threading
+import time
+from datetime import datetime
 from typing import Optional
-from config_loader import get_secrets
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config_loader import changed_in, get_config, get_secrets
 
 logger = logging.getLogger(__name__)
 
+# Telegram rejects longer messages
+MAX_MESSAGE_LENGTH = 4096
+
+_NOTHING = object()
+
 
 class TelegramNotifier:
     """Send notifications to Telegram"""
     
-    def __init__(self):
+    def __init__(self, config=None, api_base: Optional[str] = None):
         """Initialize Telegram notifier with credentials from secrets"""
+        config = config or get_config()
+        self.api_base = (api_base or config.get(
+            'Telegram', 'API_BASE', 'https://api.telegram.org')).rstrip('/')
+        self._read_settings(config)
+        
+        self._queue = queue.Queue()
+        # A message the worker took but could not merge; it goes first next time
+        self._carry = _NOTHING
+        self._worker = None
+        self._worker_lock = threading.Lock()
+        
+        # One keep-alive connection for every message
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=1))
+        self.session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=1))
+        
         try:
             secrets_manager = get_secrets()
             
@@ -26,46 +61,174 @@ class TelegramNotifier:
             if not self.enabled:
                 logger.warning("Telegram notifications disabled: Missing bot_token or chat_id in secrets.json")
             else:
-                self.api_url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
+                self.api_url = f"{self.api_base}/bot{self.bot_token}/sendMessage"
                 logger.info("Telegram notifications enabled")
                 
         except Exception as e:
             logger.error(f"Failed to initialize Telegram notifier: {e}")
             self.enabled = False
     
+    def _read_settings(self, config):
+        self.background = config.get('Telegram', 'BACKGROUND', True, var_type=bool)
+        self.timeout = config.get('Telegram', 'TIMEOUT', 10, var_type=float)
+        self.max_retries = config.get('Telegram', 'MAX_RETRIES', 5, var_type=int)
+        self.backoff_base = config.get('Telegram', 'BACKOFF_BASE_SECONDS', 1, var_type=float)
+        self.backoff_max = config.get('Telegram', 'BACKOFF_MAX_SECONDS', 60, var_type=float)
+        self.coalesce_seconds = config.get('Telegram', 'COALESCE_SECONDS', 2, var_type=float)
+        # Successes only go out in the periodic digest; failures stay immediate
+        self.digest_mode = config.get('Telegram', 'DIGEST_MODE', False, var_type=bool)
+    
+    def apply_config(self, config, changed):
+        """Config subscriber: pick up delivery settings (API_BASE needs a restart)"""
+        if changed_in(changed, 'Telegram'):
+            self._read_settings(config)
+    
     def send_message(self, message: str, parse_mode: str = "HTML") -> bool:
         """
-        Send a message to Telegram
+        Queue a message for Telegram
         
         Args:
             message: The message text to send
             parse_mode: HTML or Markdown formatting
             
+        Returns:
+            True if the message was queued (or sent, with BACKGROUND = False)
+        """
+        if not self.enabled:
+            return False
+        if not self.background:
+            return self.send_now(message, parse_mode)
+        
+        self._ensure_worker()
+        self._queue.put((message, parse_mode))
+        return True
+    
+    def send_now(self, message: str, parse_mode: str = "HTML") -> bool:
+        """
+        Send a message on the calling thread, retrying transient failures
+        
         Returns:
             True if successful, False otherwise
         """
         if not self.enabled:
             return False
         
+        payload = {
+            "chat_id": self.chat_id,
+            "text": message[:MAX_MESSAGE_LENGTH],
+            "parse_mode": parse_mode
+        }
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.session.post(self.api_url, json=payload, timeout=self.timeout)
+            except requests.exceptions.RequestException as e:
+                delay = self._backoff(attempt)
+                logger.warning(f"Failed to send Telegram message ({e}), retrying in {delay:.1f}s")
+            else:
+                if response.ok:
+                    logger.info("Telegram message sent successfully")
+                    return True
+                if response.status_code == 429:
+                    # Telegram says exactly how long to wait
+                    delay = self._retry_after(response) or self._backoff(attempt)
+                    logger.warning(f"Telegram rate limit hit, retrying in {delay:.1f}s")
+                elif response.status_code >= 500:
+                    delay = self._backoff(attempt)
+                    logger.warning(f"Telegram returned {response.status_code}, retrying in {delay:.1f}s")
+                else:
+                    logger.error(f"Failed to send Telegram message: {response.status_code} {response.text[:200]}")
+                    return False
+            if attempt < self.max_retries:
+                time.sleep(delay)
+        
+        logger.error(f"Failed to send Telegram message after {self.max_retries + 1} attempts")
+        return False
+    
+    def _backoff(self, attempt):
+        """Exponential backoff with jitter"""
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return delay * random.uniform(0.5, 1.0)
+    
+    @staticmethod
+    def _retry_after(response):
         try:
-            payload = {
-                "chat_id": self.chat_id,
-                "text": message,
-                "parse_mode": parse_mode
-            }
-            
-            response = requests.post(self.api_url, json=payload, timeout=10)
-            response.raise_for_status()
-            
-            logger.info("Telegram message sent successfully")
-            return True
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to send Telegram message: {e}")
-            return False
-        except Exception as e:
-            logger.error(f"Unexpected error sending Telegram message: {e}")
-            return False
+            return float(response.json()["parameters"]["retry_after"])
+        except (ValueError, KeyError, TypeError):
+            return None
+    
+    # ------------------------------------------------------------------
+    # Background worker
+    # ------------------------------------------------------------------
+    
+    def _ensure_worker(self):
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run_worker, name="telegram-notifier", daemon=True
+                )
+                self._worker.start()
+    
+    def _next_batch(self):
+        """Block for one message, then gather what arrives within the coalesce window"""
+        first, self._carry = self._carry, _NOTHING
+        if first is _NOTHING:
+            first = self._queue.get()
+        if first is None:
+            return None, 1
+        message, parse_mode = first
+        taken = 1
+        deadline = time.monotonic() + self.coalesce_seconds
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None or item[1] != parse_mode or \
+                    len(message) + len(item[0]) + 2 > MAX_MESSAGE_LENGTH:
+                # Held back (still unfinished in the queue) to start the next
+                # batch, so messages keep their order
+                self._carry = item
+                break
+            message = f"{message}\n\n{item[0]}"
+            taken += 1
+        return (message, parse_mode), taken
+    
+    def _run_worker(self):
+        while True:
+            batch, taken = self._next_batch()
+            try:
+                if batch is None:
+                    return
+                if taken > 1:
+                    logger.info(f"Sending {taken} queued Telegram messages as one")
+                self.send_now(*batch)
+            except Exception as e:
+                logger.error(f"Unexpected error sending Telegram message: {e}")
+            finally:
+                for _ in range(taken):
+                    self._queue.task_done()
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued message has been sent (or given up on)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            if self._worker is None or not self._worker.is_alive():
+                return False
+            time.sleep(0.05)
+        return True
+    
+    def close(self, timeout: Optional[float] = 30):
+        """Flush pending messages and stop the worker"""
+        self.flush(timeout)
+        if self._worker is not None and self._worker.is_alive():
+            self._queue.put(None)
+            self._worker.join(timeout=1)
+        self.session.close()
     
     def send_startup_notification(self) -> bool:
         """Send startup notification"""
@@ -80,7 +243,9 @@ class TelegramNotifier:
         return self.send_message(message)
     
     def send_success_notification(self, run_number: int, timestamp: str) -> bool:
-        """Send success notification after successful run"""
+        """Send success notification after successful run (folded into the digest in digest mode)"""
+        if self.digest_mode:
+            return True
         message = f"""
 <b>✅ Naukri Automation Successful</b>
 
@@ -118,25 +283,78 @@ Tasks Completed:
         return self.send_message(message)
     
     def send_summary_notification(self, total_runs: int, successful: int, 
-                                  failed: int, uptime_hours: str) -> bool:
-        """Send summary notification with statistics"""
+                                  failed: int, uptime_hours: str,
+                                  accounts: Optional[list] = None,
+                                  period: Optional[str] = None) -> bool:
+        """
+        Send summary notification with statistics
+        
+        Args:
+            accounts: Optional per-account rows (dicts with account,
+                total_runs, successful_runs and failed_runs)
+            period: Optional label of the window the statistics cover
+        """
         success_rate = (successful / total_runs * 100) if total_runs > 0 else 0
+        title = f"Naukri Automation Summary ({period})" if period else "Naukri Automation Summary"
+        
+        account_lines = ""
+        if accounts:
+            rows = "\n".join(
+                f"• {row['account']}: <b>{row['successful_runs']}</b>✅ <b>{row['failed_runs']}</b>❌"
+                for row in accounts
+            )
+            account_lines = f"\n<b>Accounts:</b>\n{rows}\n"
         
         message = f"""
-<b>📊 Naukri Automation Summary</b>
+<b>📊 {title}</b>
 
 <b>Statistics:</b>
 • Total Runs: <b>{total_runs}</b>
 • Successful: <b>{successful}</b> ✅
 • Failed: <b>{failed}</b> ❌
 • Success Rate: <b>{success_rate:.1f}%</b>
-
+{account_lines}
 <b>Uptime:</b> {uptime_hours}
 
 📝 Full logs available in the project directory
         """
         return self.send_message(message)
     
+    def send_digest(self, runs: list, period_hours: float, started: Optional[str] = None) -> bool:
+        """
+        Send one summary of the given run records (from the run store)
+        
+        Args:
+            runs: Run dicts as recorded by the scheduler
+            period_hours: Length of the window the runs cover
+            started: ISO time the scheduler started, for the uptime line
+        """
+        if not runs:
+            return False
+        successful = sum(1 for run in runs if run["success"])
+        
+        accounts = {}
+        for run in runs:
+            for result in run.get("accounts") or []:
+                row = accounts.setdefault(result["account"], {
+                    "account": result["account"],
+                    "total_runs": 0,
+                    "successful_runs": 0,
+                    "failed_runs": 0,
+                })
+                row["total_runs"] += 1
+                row["successful_runs" if result["success"] else "failed_runs"] += 1
+        
+        uptime = "unknown"
+        if started:
+            hours = (datetime.now() - datetime.fromisoformat(started)).total_seconds() / 3600
+            uptime = f"{hours:.1f} hours"
+        return self.send_summary_notification(
+            len(runs), successful, len(runs) - successful, uptime,
+            accounts=sorted(accounts.values(), key=lambda row: row["account"]),
+            period=f"last {period_hours:g} hours"
+        )
+    
     def send_critical_alert(self, alert_message: str) -> bool:
         """Send critical alert for important issues"""
         message = f"""
@@ -151,6 +369,16 @@ Please review logs and take action immediately.
         return self.send_message(message)
 
 
+_notifier = None
+_notifier_lock = threading.Lock()
+
+
 def get_notifier() -> TelegramNotifier:
     """Get singleton instance of TelegramNotifier"""
-    return TelegramNotifier()
+    global _notifier
+    with _notifier_lock:
+        if _notifier is None:
+            _notifier = TelegramNotifier()
+            # Deliver whatever is still queued when the process exits
+            atexit.register(_notifier.close)
+        return _notifier
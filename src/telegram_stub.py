@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Local Telegram Bot API Stand-in
+Minimal HTTP server answering sendMessage like api.telegram.org, for trying
+the notifier without a real bot. Point [Telegram] API_BASE at it.
+
+Scripted failures (e.g. a 429 with retry_after, or a 500) are queued with
+fail_next(), and every accepted message is kept in .messages.
+"""
+
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class TelegramStub:
+    """sendMessage stand-in running on a background thread"""
+
+    def __init__(self, host='127.0.0.1', port=0):
+        self.messages = []
+        self.requests = 0
+        self._failures = []
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._thread = None
+
+    @property
+    def api_base(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def fail_next(self, status=500, retry_after=None, times=1):
+        """Answer the next `times` requests with an error"""
+        with self._lock:
+            self._failures.extend([(status, retry_after)] * times)
+
+    def _respond(self, payload):
+        with self._lock:
+            self.requests += 1
+            if self._failures:
+                status, retry_after = self._failures.pop(0)
+                body = {"ok": False, "error_code": status, "description": "stub failure"}
+                if retry_after is not None:
+                    body["parameters"] = {"retry_after": retry_after}
+                return status, body
+            self.messages.append(payload)
+            return 200, {"ok": True, "result": {"message_id": len(self.messages), "text": payload.get("text")}}
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                try:
+                    payload = json.loads(self.rfile.read(length) or b'{}')
+                except ValueError:
+                    payload = {}
+                if not self.path.endswith('/sendMessage'):
+                    status, body = 404, {"ok": False, "error_code": 404, "description": "Not Found"}
+                else:
+                    status, body = stub._respond(payload)
+                data = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    """Serve on the given port (default 8081) and print each message"""
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8081
+    stub = TelegramStub(port=port)
+    print(f"Telegram stand-in listening on {stub.api_base} (set [Telegram] API_BASE to this)")
+    seen = 0
+    with stub:
+        try:
+            while True:
+                threading.Event().wait(0.5)
+                for message in stub.messages[seen:]:
+                    print("-" * 60)
+                    print(message.get("text", "").strip())
+                seen = len(stub.messages)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
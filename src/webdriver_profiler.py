@@ -0,0 +1,208 @@
+"""
+WebDriver Command Profiler
+Counts every round trip to chromedriver during a run and times it, by
+WebDriver call (find_element, get_attribute, click, ...), by the function
+that made it and by run step, then writes a per-run report of the top
+consumers
+"""
+
+import contextvars
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from config_loader import get_config
+from structured_log import current_step
+
+logger = logging.getLogger(__name__)
+
+_profile = contextvars.ContextVar('webdriver_profile', default=None)
+
+_SELENIUM_DIR = f"{os.sep}selenium{os.sep}"
+_THIS_FILE = os.path.normcase(__file__)
+
+
+class CommandStats:
+    """Call count and latency of one kind of round trip"""
+
+    __slots__ = ('calls', 'seconds', 'max_seconds')
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+
+    def add(self, seconds):
+        self.calls += 1
+        self.seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+
+
+class CommandProfile:
+    """WebDriver round trips of one run"""
+
+    def __init__(self, run_id=None, account=None):
+        self.run_id = run_id
+        self.account = account
+        self.total = CommandStats()
+        self.by_command = {}
+        self.by_step = {}
+        # (caller, command): where the round trips come from
+        self.by_site = {}
+        self._lock = threading.Lock()
+
+    def record(self, command, caller, step, seconds):
+        with self._lock:
+            self.total.add(seconds)
+            for table, key in ((self.by_command, command),
+                               (self.by_step, step or '-'),
+                               (self.by_site, (caller, command))):
+                stats = table.get(key)
+                if stats is None:
+                    stats = table[key] = CommandStats()
+                stats.add(seconds)
+
+    def totals(self):
+        """Summary kept in the run record"""
+        return {"commands": self.total.calls, "seconds": round(self.total.seconds, 3)}
+
+    @staticmethod
+    def _rows(table, top=None):
+        ranked = sorted(table.items(), key=lambda item: item[1].seconds, reverse=True)
+        rows = []
+        for key, stats in ranked[:top]:
+            key = list(key) if isinstance(key, tuple) else [key]
+            rows.append(key + [
+                stats.calls,
+                f"{stats.seconds:.2f}",
+                f"{stats.seconds / stats.calls * 1000:.1f}",
+                f"{stats.max_seconds * 1000:.1f}",
+            ])
+        return rows
+
+    def report(self, top=15):
+        """Plain-text report: top consumers, then totals by command and step"""
+        from tabulate import tabulate
+
+        timing = ["Calls", "Total s", "Mean ms", "Max ms"]
+        title = f"WebDriver round trips for run {self.run_id}"
+        if self.account:
+            title += f" ({self.account})"
+        return "\n\n".join([
+            f"{title}: {self.total.calls} commands, {self.total.seconds:.2f} s",
+            "TOP ROUND-TRIP CONSUMERS\n" + tabulate(
+                self._rows(self.by_site, top), headers=["Caller", "Command"] + timing),
+            "BY COMMAND\n" + tabulate(self._rows(self.by_command), headers=["Command"] + timing),
+            "BY STEP\n" + tabulate(self._rows(self.by_step), headers=["Step"] + timing),
+        ]) + "\n"
+
+
+def _call_site(frame):
+    """
+    (WebDriver call, calling function) for a round trip
+
+    Walks out of selenium's own frames: the outermost one is the API the
+    code called (e.g. get_attribute, which runs a script underneath), and
+    the frame after it is the caller.
+    """
+    command = None
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if _SELENIUM_DIR in filename:
+            command = frame.f_code.co_name
+        elif os.path.normcase(filename) != _THIS_FILE:
+            module = frame.f_globals.get('__name__', '?')
+            # co_qualname (3.11+) names methods and closures fully
+            name = getattr(frame.f_code, 'co_qualname', frame.f_code.co_name)
+            return command, f"{module}.{name}"
+        frame = frame.f_back
+    return command, '?'
+
+
+def instrument(driver):
+    """
+    Route the driver's commands through the profiler
+
+    Every WebDriver and WebElement call goes through driver.execute, so one
+    wrapper sees them all. Outside profile_commands() the wrapper only
+    costs a context variable lookup. Safe to call more than once.
+    """
+    if getattr(driver, '_command_profiler', False):
+        return driver
+    execute = driver.execute
+
+    def profiled_execute(driver_command, params=None):
+        profile = _profile.get()
+        if profile is None:
+            return execute(driver_command, params)
+        started = time.perf_counter()
+        try:
+            return execute(driver_command, params)
+        finally:
+            elapsed = time.perf_counter() - started
+            command, caller = _call_site(sys._getframe(1))
+            profile.record(command or driver_command, caller, current_step(), elapsed)
+
+    driver.execute = profiled_execute
+    driver._command_profiler = True
+    return driver
+
+
+def _prune_reports(report_dir, keep):
+    reports = sorted(report_dir.glob('run-*.txt'), key=lambda p: p.stat().st_mtime)
+    for path in reports[:-keep] if keep > 0 else []:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def _write_report(profile, config):
+    report_dir = Path(__file__).parent.parent / config.get('Trace', 'PROFILE_DIR', 'logs/webdriver')
+    report_dir.mkdir(parents=True, exist_ok=True)
+    name = f"run-{profile.run_id}"
+    if profile.account:
+        name += f"-{profile.account}"
+    # Account names are usernames or e-mail addresses
+    name = "".join(c if c.isalnum() or c in '-_.' else '_' for c in name)
+    path = report_dir / f"{name}.txt"
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(profile.report(config.get('Trace', 'PROFILE_TOP', 15, var_type=int)))
+    _prune_reports(report_dir, config.get('Trace', 'KEEP_PROFILES', 50, var_type=int))
+    return path
+
+
+@contextmanager
+def profile_commands(run_id, account=None, config=None):
+    """
+    Profile the WebDriver commands made inside the block
+
+    Yields the CommandProfile (None when [Trace] PROFILE_WEBDRIVER is off).
+    On exit the report is written to PROFILE_DIR and summarised in the log.
+    """
+    config = config or get_config()
+    if not config.get('Trace', 'PROFILE_WEBDRIVER', False, var_type=bool):
+        yield None
+        return
+    profile = CommandProfile(run_id, account)
+    token = _profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _profile.reset(token)
+        if profile.total.calls:
+            try:
+                path = _write_report(profile, config)
+            except OSError as e:
+                logger.warning(f"Could not write WebDriver profile: {e}")
+            else:
+                (caller, command), stats = max(profile.by_site.items(),
+                                               key=lambda item: item[1].seconds)
+                logger.info(f"WebDriver: {profile.total.calls} round trips in "
+                            f"{profile.total.seconds:.1f}s, most from {caller} "
+                            f"({command} x{stats.calls}, {stats.seconds:.1f}s); report: {path}")
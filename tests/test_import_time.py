@@ -0,0 +1,34 @@
+"""
+Cold-start regression test: the entry points stay within the import budget
+of import_time_report and don't import heavy packages eagerly
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from import_time_report import BUDGETS, imported, measure, subtree, total_ms
+
+RUNS = 3
+
+
+@pytest.mark.parametrize("module", list(BUDGETS))
+def test_import_stays_within_budget(module):
+    samples = [measure(module) for _ in range(RUNS)]
+    # Best of the runs: a busy machine only ever makes imports slower
+    best = min(total_ms(entries, module) for entries in samples)
+
+    assert best <= BUDGETS[module]["budget_ms"], \
+        f"import {module} took {best:.1f} ms (budget {BUDGETS[module]['budget_ms']} ms)"
+
+
+@pytest.mark.parametrize("module", list(BUDGETS))
+def test_import_skips_heavy_packages(module):
+    entries = subtree(measure(module), module)
+    assert entries, f"import {module} did not show up in -X importtime output"
+
+    eager = [package for package in BUDGETS[module]["forbidden"] if imported(entries, package)]
+    assert not eager, f"import {module} imports {', '.join(eager)}"
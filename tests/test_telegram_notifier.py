@@ -0,0 +1,163 @@
+"""
+Tests for the Telegram notifier: background batching, and retries against
+the local Bot API stand-in (telegram_stub)
+"""
+
+import sys
+import time
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import telegram_notifier
+from telegram_stub import TelegramStub
+
+
+class StubConfig:
+    """Config with only the Telegram delivery settings the tests need"""
+
+    def __init__(self, **values):
+        self.values = values
+
+    def get(self, section, key, default=None, var_type=str):
+        return self.values.get(key, default)
+
+
+def make_notifier(api_base='http://stub', **settings):
+    settings.setdefault('COALESCE_SECONDS', 0.2)
+    secrets = mock.Mock()
+    secrets.get.side_effect = {'telegram.bot_token': 'token', 'telegram.chat_id': '1'}.get
+    with mock.patch.object(telegram_notifier, 'get_secrets', return_value=secrets):
+        return telegram_notifier.TelegramNotifier(StubConfig(**settings), api_base=api_base)
+
+
+def record_sends(notifier):
+    sent = []
+    notifier.send_now = lambda message, parse_mode="HTML": sent.append((message, parse_mode)) or True
+    return sent
+
+
+@pytest.fixture
+def stub():
+    with TelegramStub() as stub:
+        yield stub
+
+
+@pytest.fixture
+def sleeps():
+    """Waits taken between retries (recorded, then slept for at most 10 ms)"""
+    recorded = []
+    real_sleep = time.sleep
+
+    def _sleep(seconds):
+        recorded.append(seconds)
+        real_sleep(min(seconds, 0.01))
+
+    with mock.patch.object(telegram_notifier.time, 'sleep', _sleep):
+        yield recorded
+
+
+def test_unmergeable_message_keeps_its_place():
+    notifier = make_notifier()
+    sent = record_sends(notifier)
+    notifier.send_message("A")
+    notifier.send_message("B", parse_mode="Markdown")
+    notifier.send_message("C")
+    notifier.send_message("D")
+    assert notifier.flush(timeout=5)
+    notifier.close()
+
+    assert sent == [("A", "HTML"), ("B", "Markdown"), ("C\n\nD", "HTML")]
+
+
+def test_message_too_long_to_merge_keeps_its_place():
+    notifier = make_notifier()
+    sent = record_sends(notifier)
+    long_message = "x" * (telegram_notifier.MAX_MESSAGE_LENGTH - 1)
+    notifier.send_message("A")
+    notifier.send_message(long_message)
+    notifier.send_message("C")
+    assert notifier.flush(timeout=5)
+    notifier.close()
+
+    assert [message for message, _ in sent] == ["A", long_message, "C"]
+
+
+def test_rate_limit_waits_for_retry_after(stub, sleeps):
+    notifier = make_notifier(stub.api_base, BACKOFF_BASE_SECONDS=0.01)
+    stub.fail_next(429, retry_after=7)
+
+    assert notifier.send_now("hello")
+    notifier.close()
+
+    assert stub.requests == 2
+    assert sleeps == [7.0]
+    assert [m["text"] for m in stub.messages] == ["hello"]
+
+
+def test_server_errors_back_off_exponentially(stub, sleeps):
+    notifier = make_notifier(stub.api_base, BACKOFF_BASE_SECONDS=1, BACKOFF_MAX_SECONDS=3)
+    stub.fail_next(500, times=3)
+
+    assert notifier.send_now("hello")
+    notifier.close()
+
+    assert stub.requests == 4
+    # base * 2**attempt, capped at the max, with jitter between 50% and 100%
+    for delay, cap in zip(sleeps, [1, 2, 3]):
+        assert cap / 2 <= delay <= cap
+    assert len(sleeps) == 3
+
+
+def test_gives_up_after_max_retries(stub, sleeps):
+    notifier = make_notifier(stub.api_base, MAX_RETRIES=2, BACKOFF_BASE_SECONDS=0.01)
+    stub.fail_next(500, times=5)
+
+    assert not notifier.send_now("hello")
+    notifier.close()
+
+    assert stub.requests == 3
+    assert len(sleeps) == 2
+    assert stub.messages == []
+
+
+def test_client_error_is_not_retried(stub, sleeps):
+    notifier = make_notifier(stub.api_base)
+    stub.fail_next(400)
+
+    assert not notifier.send_now("hello")
+    notifier.close()
+
+    assert stub.requests == 1
+    assert sleeps == []
+
+
+def test_every_send_goes_through_the_pooled_session(stub):
+    notifier = make_notifier(stub.api_base, COALESCE_SECONDS=0)
+    adapter = notifier.session.get_adapter(stub.api_base)
+    assert adapter._pool_maxsize == 1
+    with mock.patch.object(notifier.session, 'post', wraps=notifier.session.post) as post:
+        for text in ("one", "two", "three"):
+            assert notifier.send_now(text)
+    notifier.close()
+
+    assert post.call_count == stub.requests == 3
+
+
+def test_worker_keeps_order_through_retries(stub):
+    notifier = make_notifier(stub.api_base, BACKOFF_BASE_SECONDS=0.01, COALESCE_SECONDS=0.2)
+    stub.fail_next(429, retry_after=0.05)
+    stub.fail_next(500)
+    notifier.send_message("A")
+    notifier.send_message("B", parse_mode="Markdown")
+    notifier.send_message("C")
+    assert notifier.flush(timeout=10)
+    notifier.close()
+
+    assert [(m["text"], m["parse_mode"]) for m in stub.messages] == [
+        ("A", "HTML"), ("B", "Markdown"), ("C", "HTML")
+    ]
+    assert stub.requests == 5
@@ -66,7 +66,7 @@ def test_python_packages():
     """Test if required packages are installed"""
     print("\n✓ Checking Python packages...")
     
-    packages = ['selenium', 'pypdf', 'reportlab']
+    packages = ['selenium', 'pypdf', 'requests']
     missing = []
     
     for package in packages:
@@ -4,27 +4,39 @@ Progress Dashboard for Naukri Automation Scheduler
 View statistics and historical data about scheduler runs
 """
 
-import json
+import argparse
 import sys
 from pathlib import Path
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from tabulate import tabulate
 
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from config_loader import get_config
+from run_index import RunIndex
+from run_store import RunStore
+from run_trace import export_chrome_trace
+from structured_log import read_run_logs
+
 
 def load_progress():
-    """Load progress data from file"""
-    progress_file = Path(__file__).parent / "logs" / "progress.json"
+    """Open the run store read-only (the scheduler may be writing it)"""
+    store = RunStore(read_only=True)
     
-    if not progress_file.exists():
+    if store.needs_migration:
+        print(f"❌ Found an old {store.legacy_path.name}. Start the scheduler once to migrate it.")
+        sys.exit(1)
+    if store.summary["total_runs"] == 0 and not store.log_path.exists():
         print("❌ No progress data found. Start the scheduler first!")
         sys.exit(1)
     
-    with open(progress_file, 'r') as f:
-        return json.load(f)
+    return store
 
 
-def print_summary(data):
+def print_summary(store):
     """Print summary statistics"""
+    data = store.summary
     total = data["total_runs"]
     success = data["successful_runs"]
     failed = data["failed_runs"]
@@ -43,9 +55,14 @@ def print_summary(data):
     print("=" * 60 + "\n")
 
 
-def print_recent_runs(data, count=10):
+def print_recent_runs(index, count=10, since=None, until=None, account=None, failed_only=False):
     """Print recent run history"""
-    runs = data["runs"][-count:]
+    success = False if failed_only else None
+    if since or until:
+        runs = index.query(since=since, until=until, success=success, account=account,
+                           limit=count, newest_first=True)[::-1]
+    else:
+        runs = index.last(count, success=success, account=account)
     
     if not runs:
         print("No run history yet.\n")
@@ -69,44 +86,135 @@ def print_recent_runs(data, count=10):
     print()
 
 
-def print_statistics(data):
-    """Print detailed statistics"""
-    runs = data["runs"]
+def print_statistics(index, since=None, until=None, account=None):
+    """Print detailed statistics (from the daily rollups, no history scan)"""
+    stats = index.stats(since_day=since, until_day=until, account=account)
     
-    if not runs:
+    if not stats["count"]:
         print("No run data available.\n")
         return
     
-    # Calculate duration statistics
-    durations = [r["duration_seconds"] for r in runs]
-    avg_duration = sum(durations) / len(durations)
-    min_duration = min(durations)
-    max_duration = max(durations)
+    total_duration = stats["total_duration"]
     
     print("\nDETAILED STATISTICS".center(60))
     print("-" * 60)
-    print(f"Average Run Duration: {avg_duration:.1f} seconds")
-    print(f"Minimum Duration:     {min_duration:.1f} seconds")
-    print(f"Maximum Duration:     {max_duration:.1f} seconds")
-    print(f"Total Run Time:       {sum(durations):.1f} seconds ({sum(durations)/3600:.2f} hours)")
+    print(f"Runs:                 {stats['count']} ({stats['success_rate']:.1f}% successful)")
+    print(f"Average Run Duration: {stats['mean']:.1f} seconds")
+    print(f"Median (p50):         {stats['p50']:.1f} seconds")
+    print(f"p95 / p99:            {stats['p95']:.1f} / {stats['p99']:.1f} seconds")
+    print(f"Minimum Duration:     {stats['min']:.1f} seconds")
+    print(f"Maximum Duration:     {stats['max']:.1f} seconds")
+    print(f"Total Run Time:       {total_duration:.1f} seconds ({total_duration/3600:.2f} hours)")
     print("-" * 60 + "\n")
 
 
+def print_account_statistics(index, since=None, until=None):
+    """Print one row of statistics per account (multi-account mode)"""
+    accounts = index.accounts()
+    if not accounts:
+        return
+    
+    table_data = []
+    for account in accounts:
+        stats = index.stats(since_day=since, until_day=until, account=account)
+        if not stats["count"]:
+            continue
+        table_data.append([
+            account, stats["count"], f"{stats['success_rate']:.1f}%",
+            f"{stats['mean']:.1f}s", f"{stats['p95']:.1f}s"
+        ])
+    
+    print("ACCOUNTS".center(60))
+    print(tabulate(table_data, headers=["Account", "Runs", "Success", "Mean", "p95"], tablefmt="grid"))
+    print()
+
+
+def print_run_logs(run_id):
+    """Print one run's log records (found through the log's run index)"""
+    log_file = Path(__file__).parent / get_config().get('Logging', 'LOG_FILE', 'logs/naukri.log')
+    records = read_run_logs(log_file, run_id)
+    
+    if not records:
+        print(f"No log records found for run {run_id}.\n")
+        return
+    
+    print(f"LOGS FOR RUN {run_id}".center(60))
+    print("-" * 60)
+    for record in records:
+        elapsed = f"+{record['elapsed']:.1f}s" if record.get("elapsed") is not None else ""
+        tags = " ".join(str(tag) for tag in (record.get("account"), record.get("step")) if tag)
+        print(f"{record.get('time', '')} {elapsed:>9} {record.get('level', ''):7} "
+              f"[{tags}] {record.get('message', '')}")
+    print()
+
+
+def export_run_trace(run_number, out_path=None):
+    """Write one run's step spans as a Chrome trace-event file"""
+    store = load_progress()
+    run = None
+    for candidate in store.iter_runs():
+        if str(candidate.get("run_number")) == str(run_number):
+            run = candidate
+    
+    if run is None:
+        print(f"❌ Run {run_number} not found in the run history.\n")
+        sys.exit(1)
+    if not run.get("trace") and not any(r.get("trace") for r in run.get("accounts") or []):
+        print(f"❌ Run {run_number} has no trace (enable [Trace] ENABLED in config.ini).\n")
+        sys.exit(1)
+    
+    if out_path is None:
+        trace_dir = get_config().get('Trace', 'EXPORT_DIR', 'logs/traces')
+        out_path = Path(__file__).parent / trace_dir / f"run-{run_number}.json"
+    spans = export_chrome_trace(run, out_path)
+    print(f"✓ Wrote {spans} spans to {out_path}")
+    print("💡 Open it in chrome://tracing or https://ui.perfetto.dev\n")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Naukri scheduler progress dashboard")
+    parser.add_argument("--last", type=int, default=15, help="Number of recent runs to show")
+    parser.add_argument("--since", help="Only runs on or after this date (YYYY-MM-DD)")
+    parser.add_argument("--until", help="Only runs on or before this date (YYYY-MM-DD)")
+    parser.add_argument("--account", help="Only runs of this account")
+    parser.add_argument("--failed", action="store_true", help="Only list failed runs")
+    parser.add_argument("--run", help="Show the log records of this run number and exit")
+    parser.add_argument("--trace", help="Export this run number's step timings as a Chrome trace and exit")
+    parser.add_argument("--out", help="Trace file to write (default: [Trace] EXPORT_DIR/run-N.json)")
+    return parser.parse_args()
+
+
 def main():
     """Main entry point"""
-    data = load_progress()
+    args = parse_args()
+    if args.run:
+        print_run_logs(args.run)
+        return
+    if args.trace:
+        export_run_trace(args.trace, args.out)
+        return
+    
+    store = load_progress()
+    index = RunIndex(store, read_only=True)
+    index.sync()
+    # --until is an inclusive day; run timestamps compare against the next one
+    until_timestamp = None
+    if args.until:
+        until_timestamp = (date.fromisoformat(args.until) + timedelta(days=1)).isoformat()
     
     print("\n")
     print("╔" + "=" * 58 + "╗")
     print("║" + "NAUKRI AUTOMATION - SCHEDULER DASHBOARD".center(58) + "║")
     print("╚" + "=" * 58 + "╝")
     
-    print_summary(data)
-    print_recent_runs(data, count=15)
-    print_statistics(data)
+    print_summary(store)
+    print_recent_runs(index, args.last, args.since, until_timestamp, args.account, args.failed)
+    print_statistics(index, args.since, args.until, args.account)
+    if args.account is None:
+        print_account_statistics(index, args.since, args.until)
     
     print("💡 Tip: Check logs/naukri.log for detailed execution logs")
-    print("💡 Tip: Check logs/progress.json for complete run history\n")
+    print("💡 Tip: Check logs/runs.jsonl for complete run history\n")
 
 
 if __name__ == "__main__":